@@ -0,0 +1,44 @@
+import argparse
+import sys
+from src.fraud.AccountWindow import STATE_TTL_US
+from src.fraud.BlacklistIndex import BlacklistIndex
+from src.fraud.TransactionReplay import TransactionReplay, read_rows, row_writer
+
+
+def file_format(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a CSV or JSONL transaction file through the fraud rules.")
+    parser.add_argument("input", help="Transaction file (.csv with header, or .jsonl).")
+    parser.add_argument("-o", "--output", help="Results file (.csv or .jsonl); defaults to JSONL on stdout.")
+    parser.add_argument("-b", "--blacklist", help="File with one blacklisted location per line.")
+    parser.add_argument("--memory-budget", type=int, default=None,
+                        help="Approximate bytes of account state kept in memory; the rest spills to disk.")
+    parser.add_argument("--max-lateness", type=float, default=STATE_TTL_US / 1e6,
+                        help="Seconds a transaction may lag the latest one read before it is rejected.")
+    args = parser.parse_args()
+
+    blacklist = BlacklistIndex.from_file(args.blacklist) if args.blacklist else BlacklistIndex()
+    replay = TransactionReplay(blacklist, args.memory_budget, int(args.max_lateness * 1e6))
+
+    with open(args.input, newline="", encoding="utf-8") as source:
+        output = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+        try:
+            write = row_writer(output, file_format(args.output or ""))
+            stats = replay.run(read_rows(source, file_format(args.input)), write)
+        finally:
+            replay.close()
+            if output is not sys.stdout:
+                output.close()
+
+    latency = stats["latency"]
+    print(
+        f"{stats['processed']} transactions ({stats['errors']} errors) in {stats['elapsed']:.2f}s"
+        f" - {stats['throughput']:.0f} tx/s"
+        f" - latency p50={latency['p50'] * 1e6:.1f}us p90={latency['p90'] * 1e6:.1f}us"
+        f" p99={latency['p99'] * 1e6:.1f}us max={latency['max'] * 1e6:.1f}us"
+        f" - accounts resident={stats['state']['resident']} pruned={stats['state']['pruned']}",
+        file=sys.stderr,
+    )
@@ -0,0 +1,17 @@
+from datetime import datetime, timedelta, timezone
+
+# Datetimes sem fuso são interpretados como UTC
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_us(timestamp: datetime) -> int:
+    """Converte um datetime em microssegundos desde a época Unix."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - EPOCH) // MICROSECOND
+
+
+def from_epoch_us(epoch_us: int) -> datetime:
+    """Converte microssegundos desde a época Unix em um datetime sem fuso (UTC)."""
+    return EPOCH + timedelta(microseconds=epoch_us)
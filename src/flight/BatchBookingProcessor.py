@@ -0,0 +1,122 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.flight.BookingBatchResult import BookingBatchResult
+from src.flight.FlightBookingSystem import FlightBookingSystem
+
+
+class BatchBookingProcessor:
+    """
+    Processa lotes de reservas agrupando as linhas por voo.
+
+    Cada voo é tratado por uma tarefa do pool de threads: os assentos são
+    reservados no SeatInventory na ordem de entrada das linhas daquele voo, e
+    os preços das reservas confirmadas são calculados de uma vez com
+    quote_grid. Como a ordem dentro de cada voo é fixa, o resultado de um lote
+    é sempre o mesmo para o mesmo estado inicial do inventário.
+    """
+    def __init__(self, system: FlightBookingSystem | None = None, workers: int | None = None):
+        self.system = system if system is not None else FlightBookingSystem()
+        self.workers = workers
+
+    def process(
+        self,
+        flight_ids: np.ndarray,
+        passengers: np.ndarray,
+        booking_times: np.ndarray,
+        current_prices: np.ndarray,
+        previous_sales: np.ndarray,
+        departure_times: np.ndarray,
+        reward_points_available: np.ndarray,
+    ) -> BookingBatchResult:
+        """
+        Reserva e precifica um lote em colunas.
+
+        Todas as colunas são validadas antes de qualquer reserva. Linhas de
+        voos que não estão no inventário não são confirmadas e têm
+        seats_remaining igual a -1, assim como reservation_ids nas linhas não
+        confirmadas. Se o lote falhar mesmo assim, os assentos
+        já reservados por ele são devolvidos antes de a exceção ser propagada.
+        """
+        started = time.perf_counter()
+        flight_ids = np.asarray(flight_ids)
+        passengers = np.asarray(passengers)
+        size = len(flight_ids)
+        if flight_ids.ndim != 1 or passengers.shape != (size,):
+            raise ValueError("flight_ids e passengers devem ser colunas do mesmo tamanho")
+        if passengers.dtype.kind not in "iu":
+            raise TypeError("passengers deve ser uma coluna de inteiros")
+        if size and passengers.min() < 0:
+            raise ValueError("passengers não pode ser negativo")
+        passengers = passengers.astype(np.int64)
+        # As demais colunas podem ser escalares, repetidos para todas as linhas
+        booking_times = self._column(booking_times, "datetime64[us]", size)
+        departure_times = self._column(departure_times, "datetime64[us]", size)
+        current_prices = self._column(current_prices, np.float64, size)
+        previous_sales = self._column(previous_sales, np.int64, size, integer=True)
+        reward_points_available = self._column(reward_points_available, np.int64, size, integer=True)
+
+        confirmation = np.zeros(size, dtype=bool)
+        total_price = np.zeros(size, dtype=np.float64)
+        points_used = np.zeros(size, dtype=bool)
+        seats_remaining = np.full(size, -1, dtype=np.int64)
+        reservation_ids = np.full(size, -1, dtype=np.int64)
+
+        # Agrupa por voo preservando a ordem de entrada dentro de cada grupo
+        unique_flights, flight_codes = np.unique(flight_ids, return_inverse=True)
+        order = np.argsort(flight_codes, kind="stable")
+        bounds = np.searchsorted(flight_codes[order], np.arange(len(unique_flights) + 1))
+        inventory = self.system.inventory
+
+        def book(flight_id, rows: np.ndarray) -> None:
+            # Cada tarefa escreve apenas nas linhas do seu voo
+            if flight_id not in inventory:
+                return
+            for position, requested in zip(rows.tolist(), passengers[rows].tolist()):
+                reservation_id, seats_remaining[position] = inventory.reserve(flight_id, requested)
+                if reservation_id is not None:
+                    reservation_ids[position] = reservation_id
+            rows = rows[reservation_ids[rows] >= 0]
+            if not len(rows):
+                return
+            quotes = self.system.quote_grid(
+                passengers[rows], booking_times[rows], passengers[rows], current_prices[rows],
+                previous_sales[rows], False, departure_times[rows], reward_points_available[rows],
+            )
+            confirmation[rows] = quotes.confirmation
+            total_price[rows] = quotes.total_price
+            points_used[rows] = quotes.points_used
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            tasks = [
+                pool.submit(book, flight_id, order[bounds[code]:bounds[code + 1]])
+                for code, flight_id in enumerate(unique_flights.tolist())
+            ]
+            errors = [task.exception() for task in tasks]
+        error = next((error for error in errors if error is not None), None)
+        if error is not None:
+            # Desfaz o lote inteiro: nenhuma reserva fica sem resultado correspondente
+            for reservation_id in reservation_ids[reservation_ids >= 0].tolist():
+                inventory.cancel(reservation_id)
+            raise error
+
+        elapsed = time.perf_counter() - started
+        stats = {
+            "requests": size,
+            "flights": len(unique_flights),
+            "confirmed": int(confirmation.sum()),
+            "elapsed": elapsed,
+            "throughput": size / elapsed if elapsed > 0 else 0.0,
+        }
+        return BookingBatchResult(flight_ids, confirmation, total_price, points_used, seats_remaining,
+                                  reservation_ids, stats)
+
+    @staticmethod
+    def _column(values, dtype, size: int, integer: bool = False) -> np.ndarray:
+        """Converte uma coluna (ou escalar) e a estende para size linhas."""
+        values = np.asarray(values)
+        if integer and values.dtype.kind not in "iu":
+            raise TypeError("Colunas de vendas e pontos devem ser inteiras")
+        if values.ndim > 1 or (values.ndim == 1 and len(values) != size):
+            raise ValueError("Todas as colunas devem ter o mesmo tamanho")
+        return np.broadcast_to(values.astype(dtype), size)
@@ -0,0 +1,45 @@
+import numpy as np
+from src.flight.BookingResult import BookingResult
+
+
+class BookingBatchResult:
+    """Armazena, em colunas, os resultados de um lote de reservas e as estatísticas do lote."""
+    def __init__(
+        self,
+        flight_ids: np.ndarray,
+        confirmation: np.ndarray,
+        total_price: np.ndarray,
+        points_used: np.ndarray,
+        seats_remaining: np.ndarray,
+        reservation_ids: np.ndarray,
+        stats: dict,
+    ):
+        self.flight_ids = flight_ids
+        self.confirmation = confirmation
+        self.total_price = total_price
+        self.points_used = points_used
+        self.seats_remaining = seats_remaining
+        # -1 nas linhas sem reserva
+        self.reservation_ids = reservation_ids
+        self.stats = stats
+
+    def __len__(self) -> int:
+        return len(self.total_price)
+
+    def __getitem__(self, index: int) -> BookingResult:
+        """Retorna o resultado de uma única reserva no formato do modo escalar."""
+        return BookingResult(
+            bool(self.confirmation[index]),
+            float(self.total_price[index]),
+            0.0,
+            bool(self.points_used[index]),
+            self.flight_ids[index].item(),
+            int(self.seats_remaining[index]),
+            int(self.reservation_ids[index]) if self.reservation_ids[index] >= 0 else None,
+        )
+
+    def __repr__(self) -> str:
+        """Retorna uma representação legível do objeto."""
+        return (f"BookingBatchResult(size={len(self)}, "
+                f"confirmed={int(self.confirmation.sum())}, "
+                f"total_price={float(self.total_price.sum()):.2f})")
@@ -0,0 +1,40 @@
+import numpy as np
+from src.flight.BookingResult import BookingResult
+
+
+class BookingGridResult:
+    """Armazena, em arrays, os resultados de uma grade de cotações de reserva."""
+    def __init__(
+        self,
+        confirmation: np.ndarray,
+        total_price: np.ndarray,
+        refund_amount: np.ndarray,
+        points_used: np.ndarray,
+    ):
+        self.confirmation = confirmation
+        self.total_price = total_price
+        self.refund_amount = refund_amount
+        self.points_used = points_used
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self.total_price.shape
+
+    def __len__(self) -> int:
+        return self.total_price.size
+
+    def __getitem__(self, index) -> BookingResult:
+        """Retorna o resultado de um ponto da grade no formato do modo escalar."""
+        return BookingResult(
+            bool(self.confirmation[index]),
+            float(self.total_price[index]),
+            float(self.refund_amount[index]),
+            bool(self.points_used[index]),
+        )
+
+    def __repr__(self) -> str:
+        """Retorna uma representação legível do objeto."""
+        return (f"BookingGridResult(shape={self.shape}, "
+                f"confirmed={int(self.confirmation.sum())}, "
+                f"total_price={float(self.total_price.sum()):.2f}, "
+                f"refund_amount={float(self.refund_amount.sum()):.2f})")
@@ -0,0 +1,433 @@
+import os
+import queue
+import struct
+import threading
+import zlib
+from collections.abc import Hashable, Iterator
+from concurrent.futures import Future
+from datetime import datetime
+from os import PathLike
+from typing import NamedTuple
+from src.common.Epoch import to_epoch_us
+from src.flight.BookingResult import BookingResult
+
+# Layout do log (little-endian): cada evento é um quadro com u4 de tamanho e
+# u4 de CRC32 do payload, seguido do payload: sequência (u8), reserva de
+# origem (u8), tipo (u1), pontos usados (u1), passageiros (u4), preço total
+# (f8), reembolso (f8), instante do evento e partida em µs (i8) e o voo
+# (u2 de tamanho + bytes UTF-8).
+FRAME = struct.Struct("<II")
+PAYLOAD = struct.Struct("<QQBBIddqqH")
+# Snapshot: magic, offset do log coberto, última sequência, número de reservas
+# ativas, os quadros dessas reservas e um CRC32 de tudo o que vem antes
+SNAPSHOT_MAGIC = b"BKSNAP01"
+SNAPSHOT_HEADER = struct.Struct("<8sQQQ")
+_CRC = struct.Struct("<I")
+# Maior payload possível: campos fixos mais um voo de até 65535 bytes
+MAX_PAYLOAD = PAYLOAD.size + 0xFFFF
+
+BOOKING, CANCELLATION = 1, 2
+LOG_FILE = "ledger.log"
+SNAPSHOT_FILE = "ledger.snapshot"
+
+
+class BookingEvent(NamedTuple):
+    """Um evento do livro-razão; booking_id é a sequência da reserva de origem."""
+    sequence: int
+    booking_id: int
+    kind: int
+    flight_id: str
+    passengers: int
+    total_price: float
+    refund_amount: float
+    points_used: bool
+    event_us: int
+    departure_us: int
+
+
+def encode_event(event: BookingEvent) -> bytes:
+    flight = event.flight_id.encode("utf-8")
+    payload = PAYLOAD.pack(
+        event.sequence, event.booking_id, event.kind, event.points_used, event.passengers,
+        event.total_price, event.refund_amount, event.event_us, event.departure_us, len(flight),
+    ) + flight
+    return FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_events(buffer, offset: int = 0) -> Iterator[tuple[BookingEvent, int]]:
+    """
+    Decodifica quadros a partir de offset, retornando cada evento e o offset
+    seguinte. Para no primeiro quadro incompleto ou com CRC inválido.
+    """
+    end = len(buffer)
+    while offset + FRAME.size <= end:
+        length, crc = FRAME.unpack_from(buffer, offset)
+        start = offset + FRAME.size
+        if length < PAYLOAD.size or start + length > end:
+            return
+        payload = bytes(buffer[start:start + length])
+        if zlib.crc32(payload) != crc:
+            return
+        fields = PAYLOAD.unpack_from(payload)
+        flight = payload[PAYLOAD.size:PAYLOAD.size + fields[-1]]
+        if len(flight) != fields[-1] or PAYLOAD.size + fields[-1] != length:
+            return
+        sequence, booking_id, kind, points_used, passengers, total, refund, event_us, departure_us, _ = fields
+        offset = start + length
+        yield BookingEvent(sequence, booking_id, kind, flight.decode("utf-8"), passengers,
+                           total, refund, bool(points_used), event_us, departure_us), offset
+
+
+def _frame_is_invalid(buffer) -> bool:
+    """Indica se o quadro no início do buffer, que decode_events rejeitou, está corrompido (e não só incompleto)."""
+    if len(buffer) < FRAME.size:
+        return False
+    length, _ = FRAME.unpack_from(buffer)
+    return length < PAYLOAD.size or length > MAX_PAYLOAD or len(buffer) >= FRAME.size + length
+
+
+def scan_events(file, offset: int, stop: int | None = None,
+                block_size: int = 1 << 20) -> Iterator[tuple[BookingEvent, int]]:
+    """
+    Lê os eventos de um arquivo de log a partir de offset, em blocos de
+    block_size bytes, retornando cada evento e o offset seguinte. Para em
+    stop, no fim do arquivo ou no primeiro quadro corrompido.
+    """
+    file.seek(offset)
+    pending = b""
+    while True:
+        size = block_size if stop is None else min(block_size, stop - offset - len(pending))
+        block = file.read(size) if size > 0 else b""
+        pending += block
+        consumed = 0
+        for event, consumed in decode_events(pending):
+            yield event, offset + consumed
+        # Um quadro incompleto no fim do bloco continua no próximo
+        pending = pending[consumed:]
+        offset += consumed
+        if not block or _frame_is_invalid(pending):
+            return
+
+
+def _is_torn_tail(file, offset: int, size: int, block_size: int = 1 << 20) -> bool:
+    """
+    Indica se o trecho inválido do log a partir de offset é só o final de uma
+    gravação interrompida: um quadro incompleto, um quadro corrompido sem
+    espaço para outro evento depois dele, ou bytes zerados até o fim.
+    """
+    remaining = size - offset
+    minimal = FRAME.size + PAYLOAD.size
+    if remaining < FRAME.size:
+        return True
+    file.seek(offset)
+    length, _ = FRAME.unpack(file.read(FRAME.size))
+    if PAYLOAD.size <= length <= MAX_PAYLOAD:
+        if remaining - FRAME.size - length < minimal:
+            return True
+    elif remaining < minimal:
+        return True
+    file.seek(offset)
+    while block := file.read(block_size):
+        if block.count(0) != len(block):
+            return False
+    return True
+
+
+class BookingLedger:
+    """
+    Livro-razão append-only de reservas e cancelamentos, com CRC por evento.
+
+    As gravações são feitas por uma thread dedicada em group commit: os eventos
+    enfileirados enquanto o fsync anterior acontece são gravados e sincronizados
+    juntos. append retorna um Future resolvido com a sequência do evento quando
+    ele está durável. A cada snapshot_every eventos as reservas ativas são
+    gravadas num snapshot (substituído atomicamente), e a recuperação lê o
+    snapshot e só a cauda do log posterior a ele, em blocos. Um final de log
+    corrompido (gravação interrompida) é truncado na abertura; um quadro
+    corrompido seguido de outros eventos gera RuntimeError e o arquivo não é
+    alterado, pois os eventos depois dele já eram duráveis. O log em si
+    nunca é compactado: ele é o histórico completo percorrido por events().
+    """
+    def __init__(self, directory: str | PathLike, max_batch: int = 4096, snapshot_every: int = 100_000):
+        self.directory = directory
+        self.max_batch = max_batch
+        self.snapshot_every = snapshot_every
+        self.log_path = os.path.join(directory, LOG_FILE)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.batches = 0
+        self.recovered_events = 0
+        self.truncated_bytes = 0
+        self.snapshot_sequence = 0
+        self.snapshot_failures = 0
+        self._active: dict[int, BookingEvent] = {}
+        self._since_snapshot = 0
+        os.makedirs(directory, exist_ok=True)
+        self._offset, self._sequence = self._recover()
+        self._durable_sequence = self._sequence
+        self._log = open(self.log_path, "ab")
+        self._pending: queue.SimpleQueue = queue.SimpleQueue()
+        self._append_lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="booking-ledger", daemon=True)
+        self._writer.start()
+
+    def _recover(self) -> tuple[int, int]:
+        offset, sequence = self._load_snapshot()
+        if not os.path.exists(self.log_path):
+            open(self.log_path, "wb").close()
+        with open(self.log_path, "r+b") as log:
+            size = os.fstat(log.fileno()).st_size
+            if offset > size:
+                # Snapshot mais novo que o log: não é confiável, reprocessa tudo
+                self._active.clear()
+                offset, sequence = 0, 0
+            for event, offset in scan_events(log, offset):
+                self._apply(event)
+                sequence = event.sequence
+                self.recovered_events += 1
+            if offset < size:
+                if not _is_torn_tail(log, offset, size):
+                    raise RuntimeError(
+                        f"Livro-razão corrompido no offset {offset} de {self.log_path}, com eventos "
+                        f"depois dele; o arquivo não foi alterado"
+                    )
+                self.truncated_bytes = size - offset
+                log.truncate(offset)
+                os.fsync(log.fileno())
+        return offset, sequence
+
+    def _load_snapshot(self) -> tuple[int, int]:
+        try:
+            with open(self.snapshot_path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return 0, 0
+        if len(data) < SNAPSHOT_HEADER.size + _CRC.size:
+            return 0, 0
+        (crc,) = _CRC.unpack_from(data, len(data) - _CRC.size)
+        body = data[:-_CRC.size]
+        magic, offset, sequence, count = SNAPSHOT_HEADER.unpack_from(body)
+        if magic != SNAPSHOT_MAGIC or zlib.crc32(body) != crc:
+            return 0, 0
+        events = [event for event, _ in decode_events(body, SNAPSHOT_HEADER.size)]
+        if len(events) != count:
+            return 0, 0
+        self._active = {event.booking_id: event for event in events}
+        self.snapshot_sequence = sequence
+        return offset, sequence
+
+    def _apply(self, event: BookingEvent) -> None:
+        if event.kind == BOOKING:
+            self._active[event.booking_id] = event
+        else:
+            self._active.pop(event.booking_id, None)
+
+    def append(
+        self,
+        kind: int,
+        flight_id: Hashable,
+        passengers: int,
+        total_price: float,
+        refund_amount: float,
+        points_used: bool,
+        event_time: datetime,
+        departure_time: datetime,
+        booking_id: int | None = None,
+    ) -> Future:
+        """
+        Enfileira um evento. Reservas usam a própria sequência como booking_id;
+        cancelamentos devem informar a reserva de origem. O evento é validado e
+        codificado aqui: valores que não cabem no formato do log geram
+        ValueError para quem chamou, sem afetar a thread de gravação.
+        """
+        if kind not in (BOOKING, CANCELLATION):
+            raise ValueError(f"Tipo de evento desconhecido: {kind}")
+        if kind == CANCELLATION and booking_id is None:
+            raise ValueError("Cancelamentos devem informar booking_id")
+        fields = (str(flight_id), passengers, float(total_price), float(refund_amount),
+                  bool(points_used), to_epoch_us(event_time), to_epoch_us(departure_time))
+        future = Future()
+        with self._append_lock:
+            if self._closed:
+                raise ValueError("O livro-razão está fechado")
+            sequence = self._sequence + 1
+            event = BookingEvent(sequence, sequence if kind == BOOKING else booking_id, kind, *fields)
+            try:
+                frame = encode_event(event)
+            except (struct.error, TypeError) as error:
+                raise ValueError(f"Evento fora do formato do livro-razão: {error}") from None
+            self._sequence = sequence
+            self._pending.put((event, frame, future))
+        return future
+
+    def record(
+        self,
+        result: BookingResult,
+        passengers: int,
+        event_time: datetime,
+        departure_time: datetime,
+        flight_id: Hashable | None = None,
+        booking_id: int | None = None,
+    ) -> Future | None:
+        """
+        Registra o resultado de uma operação de FlightBookingSystem.
+
+        Reservas confirmadas viram eventos de reserva; com booking_id o
+        resultado é tratado como o cancelamento daquela reserva. Reservas
+        recusadas não são registradas e retornam None.
+        """
+        flight_id = flight_id if flight_id is not None else result.flight_id
+        if flight_id is None:
+            raise ValueError("O voo deve ser informado ou estar no BookingResult")
+        if booking_id is not None:
+            return self.append(CANCELLATION, flight_id, passengers, 0.0, result.refund_amount,
+                               False, event_time, departure_time, booking_id)
+        if not result.confirmation:
+            return None
+        return self.append(BOOKING, flight_id, passengers, result.total_price, 0.0,
+                           result.points_used, event_time, departure_time)
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self._pending.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            if stop:
+                batch.pop()
+            if batch:
+                self._commit(batch)
+            if stop:
+                return
+
+    def _commit(self, batch: list[tuple[BookingEvent | None, bytes | None, Future]]) -> None:
+        # Itens sem evento são marcadores de flush, resolvidos junto com o lote
+        events = [event for event, _, _ in batch if event is not None]
+        try:
+            with self._io_lock:
+                data = b"".join(frame for _, frame, _ in batch if frame is not None)
+                if data:
+                    self._write_durably(data)
+                for event in events:
+                    self._apply(event)
+                if events:
+                    self._durable_sequence = events[-1].sequence
+                    self.batches += 1
+                self._since_snapshot += len(events)
+        except Exception as error:
+            # Nenhum Future fica pendente: a falha chega a quem espera pelo lote
+            for _, _, future in batch:
+                future.set_exception(error)
+            return
+        for event, _, future in batch:
+            future.set_result(event.sequence if event is not None else self._durable_sequence)
+        if self._since_snapshot >= self.snapshot_every:
+            try:
+                self.snapshot()
+            except Exception:
+                # Os eventos já estão duráveis; o próximo lote tenta de novo
+                self.snapshot_failures += 1
+
+    def _write_durably(self, data: bytes) -> None:
+        try:
+            self._log.write(data)
+            self._log.flush()
+            os.fsync(self._log.fileno())
+        except OSError:
+            # Descarta a gravação parcial para que os próximos lotes não fiquem
+            # depois de um quadro inválido, o que os perderia na recuperação
+            self._log.truncate(self._offset)
+            raise
+        self._offset += len(data)
+
+    def _write_snapshot(self) -> None:
+        # Chamado com _io_lock: o estado corresponde exatamente ao log até _offset
+        body = bytearray(SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, self._offset, self._durable_sequence, len(self._active)))
+        for event in self._active.values():
+            body += encode_event(event)
+        temporary = self.snapshot_path + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(body)
+            file.write(_CRC.pack(zlib.crc32(body)))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.snapshot_path)
+        if hasattr(os, "O_DIRECTORY"):
+            directory = os.open(self.directory, os.O_DIRECTORY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+        self.snapshot_sequence = self._durable_sequence
+        self._since_snapshot = 0
+
+    def snapshot(self) -> None:
+        """Grava um snapshot das reservas ativas já duráveis."""
+        with self._io_lock:
+            self._write_snapshot()
+
+    def flush(self) -> None:
+        """Aguarda até que todos os eventos já enfileirados estejam duráveis."""
+        marker = Future()
+        with self._append_lock:
+            if self._closed:
+                return
+            self._pending.put((None, None, marker))
+        marker.result()
+
+    def bookings(self, flight_id: Hashable | None = None) -> list[BookingEvent]:
+        """Reservas ativas (duráveis e não canceladas), opcionalmente de um único voo."""
+        with self._io_lock:
+            events = list(self._active.values())
+        if flight_id is None:
+            return events
+        flight_id = str(flight_id)
+        return [event for event in events if event.flight_id == flight_id]
+
+    def events(self, block_size: int = 1 << 20) -> Iterator[BookingEvent]:
+        """
+        Percorre todos os eventos duráveis do log, na ordem de gravação, lendo
+        o arquivo em blocos de block_size bytes.
+        """
+        with open(self.log_path, "rb") as log:
+            for event, _ in scan_events(log, 0, self._offset, block_size):
+                yield event
+
+    def stats(self) -> dict:
+        """Retorna os contadores do livro-razão."""
+        return {
+            "sequence": self._durable_sequence,
+            "active_bookings": len(self._active),
+            "batches": self.batches,
+            "log_bytes": self._offset,
+            "snapshot_sequence": self.snapshot_sequence,
+            "snapshot_failures": self.snapshot_failures,
+            "recovered_events": self.recovered_events,
+            "truncated_bytes": self.truncated_bytes,
+        }
+
+    def close(self) -> None:
+        """Grava os eventos pendentes e encerra a thread de gravação."""
+        with self._append_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._pending.put(None)
+        self._writer.join()
+        self._log.close()
+
+    def __enter__(self) -> "BookingLedger":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        """Retorna uma representação legível do objeto."""
+        return (f"BookingLedger(sequence={self._durable_sequence}, "
+                f"active_bookings={len(self._active)})")
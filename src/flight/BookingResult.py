@@ -2,15 +2,25 @@ class BookingResult:
     """
     Uma classe para armazenar o resultado de uma operação de reserva de voo.
     """
-    def __init__(self, confirmation, total_price, refund_amount, points_used):
+    def __init__(self, confirmation, total_price, refund_amount, points_used,
+                 flight_id=None, seats_remaining=None, reservation_id=None):
         self.confirmation = confirmation
         self.total_price = total_price
         self.refund_amount = refund_amount
         self.points_used = points_used
+        # Preenchidos apenas quando a operação passa por um SeatInventory
+        self.flight_id = flight_id
+        self.seats_remaining = seats_remaining
+        self.reservation_id = reservation_id
 
     def __repr__(self):
         """Retorna uma representação legível do objeto."""
+        inventory = ""
+        if self.flight_id is not None:
+            inventory = (f", flight_id={self.flight_id!r}, "
+                         f"seats_remaining={self.seats_remaining}, "
+                         f"reservation_id={self.reservation_id}")
         return (f"BookingResult(confirmation={self.confirmation}, "
                 f"total_price={self.total_price:.2f}, "
                 f"refund_amount={self.refund_amount:.2f}, "
-                f"points_used={self.points_used})")
\ No newline at end of file
+                f"points_used={self.points_used}{inventory})")
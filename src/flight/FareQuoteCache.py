@@ -0,0 +1,156 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from datetime import datetime
+
+# Faixas de antecedência em que book_flight produz o mesmo preço e reembolso
+LAST_MINUTE, PARTIAL_REFUND, FULL_REFUND = 0, 1, 2
+
+
+class FareQuoteCache:
+    """
+    Cache de cotações de book_flight com despejo LRU e expiração por TTL.
+
+    A antecedência entra na chave apenas como faixa (<24h, 24h a 48h, >=48h),
+    alinhada às fronteiras da taxa de última hora e do reembolso integral, de
+    modo que um valor em cache nunca atravessa uma dessas fronteiras. Quando o
+    preço ou o índice de vendas de um voo muda, as entradas do voo são descartadas.
+    """
+    def __init__(self, max_entries: int = 100_000, ttl: float = 30.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[tuple, tuple[float, tuple]] = OrderedDict()
+        self._fares: dict[Hashable, tuple[float, int]] = {}
+        self._keys_by_flight: dict[Hashable, set[tuple]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def time_bucket(booking_time: datetime, departure_time: datetime) -> int:
+        """Faixa de antecedência, calculada com a mesma aritmética de book_flight."""
+        hours_to_departure = (departure_time - booking_time).total_seconds() / 3600
+        if hours_to_departure < 24:
+            return LAST_MINUTE
+        if hours_to_departure < 48:
+            return PARTIAL_REFUND
+        return FULL_REFUND
+
+    @classmethod
+    def key(
+        cls,
+        flight_id: Hashable,
+        passengers: int,
+        booking_time: datetime,
+        current_price: float,
+        previous_sales: int,
+        is_cancellation: bool,
+        departure_time: datetime,
+        reward_points_available: int,
+    ) -> tuple:
+        """Chave de uma cotação; o voo vem primeiro para permitir a invalidação por voo."""
+        return (
+            flight_id,
+            current_price,
+            previous_sales,
+            passengers,
+            reward_points_available,
+            is_cancellation,
+            cls.time_bucket(booking_time, departure_time),
+        )
+
+    def observe_fare(self, flight_id: Hashable, current_price: float, previous_sales: int) -> bool:
+        """
+        Registra o preço e o índice de vendas atuais do voo. Se mudaram desde a
+        última observação, descarta as cotações do voo e retorna True.
+        """
+        fare = (current_price, previous_sales)
+        with self._lock:
+            previous = self._fares.get(flight_id)
+            self._fares[flight_id] = fare
+            if previous is None or previous == fare:
+                return False
+            self._invalidate(flight_id)
+            return True
+
+    def invalidate_flight(self, flight_id: Hashable) -> int:
+        """Descarta todas as cotações do voo e retorna quantas foram removidas."""
+        with self._lock:
+            self._fares.pop(flight_id, None)
+            return self._invalidate(flight_id)
+
+    def _invalidate(self, flight_id: Hashable) -> int:
+        keys = self._keys_by_flight.pop(flight_id, ())
+        for key in keys:
+            del self._entries[key]
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def _forget(self, key: tuple) -> None:
+        keys = self._keys_by_flight.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_flight[key[0]]
+
+    def get(self, key: tuple) -> tuple | None:
+        """Retorna a cotação em cache, se existir e não tiver expirado."""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, quote = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._forget(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return quote
+
+    def put(self, key: tuple, quote: tuple) -> None:
+        """Armazena a cotação, despejando a menos usada se o cache estiver cheio."""
+        expires_at = self.clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires_at, quote)
+            self._entries.move_to_end(key)
+            self._keys_by_flight.setdefault(key[0], set()).add(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._forget(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._fares.clear()
+            self._keys_by_flight.clear()
+
+    def stats(self) -> dict:
+        """Retorna os contadores do cache."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        """Retorna uma representação legível do objeto."""
+        return (f"FareQuoteCache(size={len(self._entries)}, "
+                f"hits={self.hits}, misses={self.misses})")
@@ -0,0 +1,231 @@
+import argparse
+import asyncio
+import csv
+import json
+from contextlib import suppress
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from src.flight.BookingResult import BookingResult
+from src.flight.FareQuoteCache import FareQuoteCache
+from src.flight.FlightBookingSystem import FlightBookingSystem
+from src.flight.SeatInventory import SeatInventory
+from src.metrics.LatencyRecorder import LatencyRecorder
+
+OPERATIONS = ("quote", "book", "cancel")
+
+
+def parse_request(payload: dict) -> tuple:
+    """
+    Extrai os argumentos comuns de uma requisição de cotação, reserva ou
+    cancelamento. Cancelamentos informam, no lugar dos passageiros, o
+    reservation_id devolvido pela reserva.
+    """
+    flight_id = payload["flight_id"]
+    if not isinstance(flight_id, str):
+        raise TypeError(f"flight_id deve ser texto, não {type(flight_id).__name__}")
+    if payload.get("op") == "cancel":
+        seats_or_reservation = payload["reservation_id"]
+        if not isinstance(seats_or_reservation, int) or isinstance(seats_or_reservation, bool):
+            raise TypeError("reservation_id deve ser o inteiro devolvido pela reserva")
+    else:
+        seats_or_reservation = int(payload["passengers"])
+    return (
+        flight_id,
+        seats_or_reservation,
+        datetime.fromisoformat(payload["booking_time"]),
+        float(payload["current_price"]),
+        int(payload["previous_sales"]),
+        datetime.fromisoformat(payload["departure_time"]),
+        int(payload.get("reward_points", 0)),
+    )
+
+
+def booking_result_to_dict(result: BookingResult) -> dict:
+    return {
+        "confirmation": result.confirmation,
+        "total_price": result.total_price,
+        "refund_amount": result.refund_amount,
+        "points_used": result.points_used,
+        "flight_id": result.flight_id,
+        "seats_remaining": result.seats_remaining,
+        "reservation_id": result.reservation_id,
+    }
+
+
+class FlightBookingServer:
+    """
+    Serviço TCP assíncrono de cotações e reservas em linhas JSON.
+
+    Cada linha tem um campo op ("quote", "book", "cancel" ou "metrics"). Uma
+    reserva confirmada responde com um reservation_id, e só ele permite
+    cancelá-la. O cálculo roda num pool de threads para não bloquear o laço
+    de eventos.
+    Cotações idênticas em andamento (mesma chave do FareQuoteCache e mesmo
+    resultado da verificação de assentos) compartilham um único cálculo.
+    Acima de max_in_flight operações simultâneas as novas requisições recebem
+    {"error": "busy"} imediatamente, e cada conexão tem no máximo max_pipeline
+    respostas pendentes; depois disso a leitura da conexão é pausada.
+    """
+    def __init__(
+        self,
+        system: FlightBookingSystem | None = None,
+        max_in_flight: int = 1024,
+        max_pipeline: int = 64,
+        workers: int | None = None,
+    ):
+        self.system = system if system is not None else FlightBookingSystem()
+        self.max_in_flight = max_in_flight
+        self.max_pipeline = max_pipeline
+        self.workers = workers
+        self.latency = {operation: LatencyRecorder() for operation in OPERATIONS}
+        self.coalesced = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._quotes: dict[tuple, asyncio.Future] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8766) -> asyncio.Server:
+        """Cria o pool de threads e inicia o servidor TCP."""
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        return await asyncio.start_server(self._handle_client, host, port)
+
+    async def stop(self) -> None:
+        """Encerra o pool de threads, aguardando os cálculos em andamento."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def metrics(self) -> dict:
+        """Retorna a latência por operação (em segundos) e os contadores de carga."""
+        return {
+            "latency": {operation: recorder.snapshot() for operation, recorder in self.latency.items()},
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+        }
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # Fila limitada: com max_pipeline respostas pendentes a leitura espera
+        replies: asyncio.Queue = asyncio.Queue(self.max_pipeline)
+        requests = asyncio.create_task(self._read_requests(reader, replies))
+        responder = asyncio.create_task(self._write_replies(replies, writer))
+        try:
+            # Se um dos lados falha (cliente abortou), o outro não pode ficar esperando a fila
+            await asyncio.wait((requests, responder), return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in (requests, responder):
+                task.cancel()
+            await asyncio.gather(requests, responder, return_exceptions=True)
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _read_requests(self, reader: asyncio.StreamReader, replies: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while line := await reader.readline():
+            if not line.strip():
+                continue
+            reply = loop.create_future()
+            try:
+                payload = json.loads(line)
+                operation = payload.get("op")
+                if operation == "metrics":
+                    reply.set_result(self.metrics())
+                elif operation not in OPERATIONS:
+                    raise ValueError(f"operação desconhecida: {operation}")
+                elif self.in_flight >= self.max_in_flight:
+                    self.rejected += 1
+                    reply.set_result({"id": payload.get("id"), "error": "busy"})
+                else:
+                    arguments = parse_request(payload)
+                    # A vaga é ocupada na admissão, antes de a tarefa começar a rodar
+                    self.in_flight += 1
+                    self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                    reply = asyncio.ensure_future(
+                        self._dispatch(operation, payload, arguments, loop.time()))
+            except (ValueError, KeyError, TypeError, AttributeError) as error:
+                if not reply.done():
+                    reply.set_result({"error": f"requisição inválida: {error}"})
+            await replies.put(reply)
+        await replies.put(None)
+
+    async def _write_replies(self, replies: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        while (reply := await replies.get()) is not None:
+            writer.write(json.dumps(await reply).encode("utf-8") + b"\n")
+            await writer.drain()
+
+    async def _dispatch(self, operation: str, payload: dict, arguments: tuple, received: float) -> dict:
+        loop = asyncio.get_running_loop()
+        try:
+            if operation == "quote":
+                result = await self._quote(loop, payload, arguments)
+            elif operation == "book":
+                result = await loop.run_in_executor(self._executor, self.system.reserve_flight, *arguments)
+            else:
+                result = await loop.run_in_executor(self._executor, self.system.cancel_reservation, *arguments)
+            response = booking_result_to_dict(result)
+        except Exception as error:
+            # Toda requisição admitida recebe resposta, qualquer que seja a falha
+            response = {"error": str(error)}
+        finally:
+            self.in_flight -= 1
+        response["id"] = payload.get("id")
+        self.latency[operation].record(loop.time() - received)
+        return response
+
+    async def _quote(self, loop: asyncio.AbstractEventLoop, payload: dict, arguments: tuple) -> BookingResult:
+        flight_id, passengers, booking_time, current_price, previous_sales, departure_time, points = arguments
+        is_cancellation = bool(payload.get("is_cancellation", False))
+        available_seats = payload.get("available_seats")
+        if available_seats is None:
+            available_seats = self.system.inventory.remaining(flight_id)
+        else:
+            available_seats = int(available_seats)
+        key = FareQuoteCache.key(flight_id, passengers, booking_time, current_price, previous_sales,
+                                 is_cancellation, departure_time, points) + (passengers <= available_seats,)
+        shared = self._quotes.get(key)
+        if shared is not None:
+            self.coalesced += 1
+            return await asyncio.shield(shared)
+        shared = loop.run_in_executor(
+            self._executor, self.system.quote_flight, flight_id, passengers, booking_time,
+            available_seats, current_price, previous_sales, is_cancellation, departure_time, points,
+        )
+        self._quotes[key] = shared
+        try:
+            return await asyncio.shield(shared)
+        finally:
+            if self._quotes.get(key) is shared:
+                del self._quotes[key]
+
+
+def load_inventory(path: str) -> SeatInventory:
+    """Lê um CSV com as colunas flight_id e capacity."""
+    inventory = SeatInventory()
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            inventory.add_flight(row["flight_id"], int(row["capacity"]))
+    return inventory
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    inventory = load_inventory(args.flights) if args.flights else SeatInventory()
+    system = FlightBookingSystem(inventory, FareQuoteCache(ttl=args.quote_ttl))
+    service = FlightBookingServer(system, args.max_in_flight, args.max_pipeline, args.workers)
+    server = await service.start(args.host, args.port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Flight quote and booking service (JSON lines over TCP).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--flights", help="CSV file with flight_id and capacity columns.")
+    parser.add_argument("--max-in-flight", type=int, default=1024)
+    parser.add_argument("--max-pipeline", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--quote-ttl", type=float, default=30.0)
+    asyncio.run(_serve(parser.parse_args()))
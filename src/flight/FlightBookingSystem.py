@@ -1,10 +1,23 @@
+from collections.abc import Hashable
 from datetime import datetime
+import numpy as np
+from src.flight.BookingGridResult import BookingGridResult
 from src.flight.BookingResult import BookingResult
+from src.flight.FareQuoteCache import FareQuoteCache
+from src.flight.SeatInventory import SeatInventory
 
 class FlightBookingSystem:
     """
     Um sistema para gerenciar a reserva e o cancelamento de voos.
     """
+    def __init__(
+                    self,
+                    inventory: SeatInventory | None = None,
+                    quote_cache: FareQuoteCache | None = None
+                ):
+        self.inventory = inventory if inventory is not None else SeatInventory()
+        self.quote_cache = quote_cache
+
     def book_flight(
                     self, 
                     passengers: int, 
@@ -63,4 +76,154 @@ class FlightBookingSystem:
             
         confirmation = True
 
-        return BookingResult(confirmation, final_price, refund_amount, points_used)
\ No newline at end of file
+        return BookingResult(confirmation, final_price, refund_amount, points_used)
+
+    def quote_flight(
+                    self,
+                    flight_id: Hashable,
+                    passengers: int,
+                    booking_time: datetime,
+                    available_seats: int,
+                    current_price: float,
+                    previous_sales: int,
+                    is_cancellation: bool,
+                    departure_time: datetime,
+                    reward_points_available: int
+                ) -> BookingResult:
+        """
+        Mesmo resultado de book_flight, reaproveitando cotações do quote_cache.
+
+        A verificação de assentos é feita fora do cache, a cada chamada. Uma
+        mudança de preço ou de índice de vendas do voo invalida suas cotações.
+        """
+        cache = self.quote_cache
+        if cache is None or passengers > available_seats:
+            return self.book_flight(passengers, booking_time, available_seats, current_price,
+                                    previous_sales, is_cancellation, departure_time,
+                                    reward_points_available)
+        cache.observe_fare(flight_id, current_price, previous_sales)
+        key = cache.key(flight_id, passengers, booking_time, current_price, previous_sales,
+                        is_cancellation, departure_time, reward_points_available)
+        quote = cache.get(key)
+        if quote is None:
+            result = self.book_flight(passengers, booking_time, passengers, current_price,
+                                      previous_sales, is_cancellation, departure_time,
+                                      reward_points_available)
+            quote = (result.confirmation, result.total_price, result.refund_amount, result.points_used)
+            cache.put(key, quote)
+        return BookingResult(*quote)
+
+    def reserve_flight(
+                    self,
+                    flight_id: Hashable,
+                    passengers: int,
+                    booking_time: datetime,
+                    current_price: float,
+                    previous_sales: int,
+                    departure_time: datetime,
+                    reward_points_available: int
+                ) -> BookingResult:
+        """
+        Reserva assentos no SeatInventory e, se houver disponibilidade, calcula o preço.
+
+        A reserva é atômica: duas chamadas concorrentes nunca confirmam o mesmo
+        assento. O preço segue exatamente as regras de book_flight, e o
+        reservation_id do resultado é o que cancel_reservation exige.
+        """
+        reservation_id, seats_remaining = self.inventory.reserve(flight_id, passengers)
+        if reservation_id is None:
+            return BookingResult(False, 0.0, 0.0, False, flight_id, seats_remaining)
+        result = self.book_flight(passengers, booking_time, passengers, current_price,
+                                  previous_sales, False, departure_time, reward_points_available)
+        result.flight_id = flight_id
+        result.seats_remaining = seats_remaining
+        result.reservation_id = reservation_id
+        return result
+
+    def cancel_reservation(
+                    self,
+                    flight_id: Hashable,
+                    reservation_id: int,
+                    booking_time: datetime,
+                    current_price: float,
+                    previous_sales: int,
+                    departure_time: datetime,
+                    reward_points_available: int
+                ) -> BookingResult:
+        """
+        Cancela uma reserva ativa feita por reserve_flight, devolvendo os
+        assentos ao SeatInventory e calculando o reembolso pelas regras de
+        book_flight. Uma reserva desconhecida, já cancelada ou de outro voo
+        gera KeyError e nenhum assento é devolvido.
+        """
+        _, passengers, seats_remaining = self.inventory.cancel(reservation_id, flight_id)
+        result = self.book_flight(passengers, booking_time, passengers, current_price,
+                                  previous_sales, True, departure_time, reward_points_available)
+        result.flight_id = flight_id
+        result.seats_remaining = seats_remaining
+        result.reservation_id = reservation_id
+        return result
+
+    def quote_grid(
+                    self,
+                    passengers,
+                    booking_time,
+                    available_seats,
+                    current_price,
+                    previous_sales,
+                    is_cancellation,
+                    departure_time,
+                    reward_points_available,
+                ) -> BookingGridResult:
+        """
+        Versão vetorizada de book_flight para grades de cenários.
+
+        Aceita escalares ou arrays NumPy (datas como datetime64 ou datetime sem
+        fuso) e faz broadcast entre eles. As operações seguem a mesma ordem do
+        modo escalar, de modo que cada ponto da grade é idêntico ao retorno de
+        book_flight com os mesmos argumentos.
+        """
+        (passengers, booking_time, available_seats, current_price, previous_sales,
+         is_cancellation, departure_time, reward_points_available) = np.broadcast_arrays(
+            np.asarray(passengers, dtype=np.int64),
+            np.asarray(booking_time, dtype="datetime64[us]"),
+            np.asarray(available_seats, dtype=np.int64),
+            np.asarray(current_price, dtype=np.float64),
+            np.asarray(previous_sales, dtype=np.int64),
+            np.asarray(is_cancellation, dtype=bool),
+            np.asarray(departure_time, dtype="datetime64[us]"),
+            np.asarray(reward_points_available, dtype=np.int64),
+        )
+
+        # Preço dinâmico com base no índice de vendas e demanda
+        price_factor = (previous_sales / 100.0) * 0.8
+        final_price = current_price * price_factor * passengers
+
+        # Taxa de última hora; timedelta.total_seconds() também divide os microssegundos por 10**6
+        time_difference = (departure_time - booking_time).astype(np.int64)
+        hours_to_departure = time_difference / 1e6 / 3600
+        final_price = np.where(hours_to_departure < 24, final_price + 100, final_price)
+
+        # Desconto para reservas em grupo
+        final_price = np.where(passengers > 4, final_price * 0.95, final_price)
+
+        # Resgate de pontos de recompensa
+        points_used = reward_points_available > 0
+        final_price = np.where(points_used, final_price - reward_points_available * 0.01, final_price)
+
+        # Garante que o preço não seja negativo
+        final_price = np.where(final_price < 0, 0.0, final_price)
+
+        # Cancelamentos devolvem o preço integral com 48h ou mais de antecedência
+        refund_amount = np.where(hours_to_departure >= 48, final_price, final_price * 0.5)
+
+        # Sem assentos suficientes nada é cobrado nem devolvido
+        seats_ok = passengers <= available_seats
+        confirmed = seats_ok & ~is_cancellation
+        refunded = seats_ok & is_cancellation
+        return BookingGridResult(
+            confirmed,
+            np.where(confirmed, final_price, 0.0),
+            np.where(refunded, refund_amount, 0.0),
+            confirmed & points_used,
+        )
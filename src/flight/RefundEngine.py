@@ -0,0 +1,124 @@
+import time
+from collections.abc import Hashable, Iterable, Iterator
+from concurrent.futures import Future
+from datetime import datetime
+from itertools import islice
+from typing import Callable
+import numpy as np
+from src.common.Epoch import from_epoch_us, to_epoch_us
+from src.flight.BookingLedger import CANCELLATION, BookingEvent, BookingLedger
+
+REFUND_FIELDS = ("booking_id", "flight_id", "passengers", "total_price", "refund_amount", "full_refund")
+
+
+class RefundEngine:
+    """
+    Calcula os reembolsos de todas as reservas de um voo cancelado.
+
+    Aplica a regra do ramo de cancelamento de book_flight (reembolso integral
+    com 48h ou mais até a partida, metade caso contrário) sobre o preço já
+    pago de cada reserva, sem recalculá-lo. As reservas são lidas e
+    processadas em blocos de chunk_size com NumPy, e cada registro de
+    reembolso é gravado assim que calculado, de modo que a memória depende
+    apenas do tamanho do bloco.
+    """
+    def __init__(self, chunk_size: int = 8192):
+        if chunk_size < 1:
+            raise ValueError("chunk_size deve ser positivo")
+        self.chunk_size = chunk_size
+
+    def refunds(
+        self,
+        bookings: Iterable[BookingEvent],
+        cancelled_at: datetime,
+    ) -> Iterator[tuple[list[BookingEvent], np.ndarray, np.ndarray]]:
+        """Gera, bloco a bloco, as reservas com os reembolsos e a indicação de reembolso integral."""
+        cancelled_us = to_epoch_us(cancelled_at)
+        bookings = iter(bookings)
+        while chunk := list(islice(bookings, self.chunk_size)):
+            size = len(chunk)
+            total_price = np.fromiter((booking.total_price for booking in chunk), np.float64, size)
+            departure_us = np.fromiter((booking.departure_us for booking in chunk), np.int64, size)
+            # Mesma aritmética de timedelta.total_seconds() usada em book_flight
+            hours_to_departure = (departure_us - cancelled_us) / 1e6 / 3600
+            full_refund = hours_to_departure >= 48
+            yield chunk, np.where(full_refund, total_price, total_price * 0.5), full_refund
+
+    def run(
+        self,
+        bookings: Iterable[BookingEvent],
+        cancelled_at: datetime,
+        write: Callable[[dict], None],
+        ledger: BookingLedger | None = None,
+    ) -> dict:
+        """
+        Calcula e grava o reembolso de cada reserva e retorna as estatísticas.
+        Com um ledger, cada reembolso também é registrado como cancelamento, e
+        um RuntimeError é lançado ao final se algum deles não ficou durável.
+        """
+        started = time.perf_counter()
+        processed = full_refunds = persisted = 0
+        refunded_total = 0.0
+        failures: list[BaseException] = []
+        previous: list[Future] = []
+        for chunk, refund_amount, full_refund in self.refunds(bookings, cancelled_at):
+            current = []
+            for booking, refund, full in zip(chunk, refund_amount.tolist(), full_refund.tolist()):
+                if ledger is not None:
+                    current.append(ledger.append(
+                        CANCELLATION, booking.flight_id, booking.passengers, 0.0, refund,
+                        False, cancelled_at, from_epoch_us(booking.departure_us), booking.booking_id,
+                    ))
+                write({
+                    "booking_id": booking.booking_id,
+                    "flight_id": booking.flight_id,
+                    "passengers": booking.passengers,
+                    "total_price": booking.total_price,
+                    "refund_amount": refund,
+                    "full_refund": full,
+                })
+            processed += len(chunk)
+            full_refunds += int(full_refund.sum())
+            refunded_total += float(refund_amount.sum())
+            # Confere o bloco anterior enquanto o atual é gravado em group commit
+            persisted += self._settle(previous, failures)
+            previous = current
+        persisted += self._settle(previous, failures)
+        if failures:
+            raise RuntimeError(
+                f"{len(failures)} de {processed} cancelamentos não foram gravados no livro-razão"
+            ) from failures[0]
+        elapsed = time.perf_counter() - started
+        return {
+            "bookings": processed,
+            "persisted": persisted,
+            "full_refunds": full_refunds,
+            "partial_refunds": processed - full_refunds,
+            "refunded_total": refunded_total,
+            "elapsed": elapsed,
+            "throughput": processed / elapsed if elapsed > 0 else 0.0,
+        }
+
+    @staticmethod
+    def _settle(futures: list[Future], failures: list[BaseException]) -> int:
+        """Aguarda os Futures de um bloco, acumulando as falhas, e retorna quantos foram gravados."""
+        persisted = 0
+        for future in futures:
+            if (error := future.exception()) is None:
+                persisted += 1
+            else:
+                failures.append(error)
+        return persisted
+
+    def cancel_flight(
+        self,
+        ledger: BookingLedger,
+        flight_id: Hashable,
+        cancelled_at: datetime,
+        write: Callable[[dict], None] = lambda refund: None,
+    ) -> dict:
+        """
+        Reembolsa todas as reservas ativas do voo no livro-razão, registrando
+        cada reembolso como um evento de cancelamento (em group commit).
+        """
+        return self.run(ledger.bookings(flight_id), cancelled_at, write, ledger)
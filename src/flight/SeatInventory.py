@@ -0,0 +1,108 @@
+import itertools
+import threading
+from collections.abc import Hashable
+
+
+class SeatInventory:
+    """
+    Assentos disponíveis por voo, com reservas atômicas.
+
+    Os voos são distribuídos entre `stripes` travas pelo hash do identificador,
+    de modo que reservas em voos diferentes raramente disputam a mesma trava e
+    nenhuma operação depende de uma trava global. Cada verificação e decremento
+    acontece sob a trava do voo, portanto a capacidade nunca é excedida.
+    Cada reserva recebe um identificador, e assentos só voltam ao voo pelo
+    cancelamento de uma reserva ativa.
+    """
+    def __init__(self, stripes: int = 64):
+        if stripes < 1:
+            raise ValueError("stripes deve ser positivo")
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._remaining: dict[Hashable, int] = {}
+        self._capacity: dict[Hashable, int] = {}
+        self._reservations: dict[int, tuple[Hashable, int]] = {}
+        self._reservation_ids = itertools.count(1)
+
+    def _lock_for(self, flight_id: Hashable) -> threading.Lock:
+        return self._locks[hash(flight_id) % len(self._locks)]
+
+    def add_flight(self, flight_id: Hashable, capacity: int) -> None:
+        """Registra um voo com a capacidade informada, ou redefine a de um voo existente."""
+        if capacity < 0:
+            raise ValueError("A capacidade não pode ser negativa")
+        with self._lock_for(flight_id):
+            sold = self._capacity.get(flight_id, 0) - self._remaining.get(flight_id, 0)
+            if sold > capacity:
+                raise ValueError(f"O voo {flight_id!r} já tem {sold} assentos vendidos")
+            self._capacity[flight_id] = capacity
+            self._remaining[flight_id] = capacity - sold
+
+    def remaining(self, flight_id: Hashable) -> int:
+        """Assentos ainda disponíveis no voo."""
+        try:
+            return self._remaining[flight_id]
+        except KeyError:
+            raise KeyError(f"Voo desconhecido: {flight_id!r}") from None
+
+    def capacity(self, flight_id: Hashable) -> int:
+        """Capacidade total registrada para o voo."""
+        try:
+            return self._capacity[flight_id]
+        except KeyError:
+            raise KeyError(f"Voo desconhecido: {flight_id!r}") from None
+
+    def reserve(self, flight_id: Hashable, seats: int) -> tuple[int | None, int]:
+        """
+        Reserva `seats` assentos se houver disponibilidade.
+
+        Retorna (identificador da reserva, assentos restantes); sem
+        disponibilidade o identificador é None e nada é alterado.
+        """
+        if seats < 0:
+            raise ValueError("A quantidade de assentos não pode ser negativa")
+        with self._lock_for(flight_id):
+            remaining = self.remaining(flight_id)
+            if seats > remaining:
+                return None, remaining
+            remaining -= seats
+            self._remaining[flight_id] = remaining
+            reservation_id = next(self._reservation_ids)
+            self._reservations[reservation_id] = (flight_id, seats)
+            return reservation_id, remaining
+
+    def reservation(self, reservation_id: int) -> tuple[Hashable, int]:
+        """Voo e assentos de uma reserva ativa."""
+        try:
+            return self._reservations[reservation_id]
+        except KeyError:
+            raise KeyError(f"Reserva desconhecida ou já cancelada: {reservation_id!r}") from None
+
+    def cancel(self, reservation_id: int, flight_id: Hashable | None = None) -> tuple[Hashable, int, int]:
+        """
+        Cancela uma reserva ativa e devolve seus assentos ao voo.
+
+        Com flight_id, a reserva precisa ser desse voo. Retorna (voo, assentos
+        devolvidos, assentos disponíveis); uma reserva desconhecida, já
+        cancelada ou de outro voo gera KeyError sem alterar nada.
+        """
+        reserved_flight, seats = self.reservation(reservation_id)
+        if flight_id is not None and flight_id != reserved_flight:
+            raise KeyError(f"A reserva {reservation_id!r} não é do voo {flight_id!r}")
+        with self._lock_for(reserved_flight):
+            # Reservas são criadas e removidas sob a trava do voo: só um cancelamento vence
+            if self._reservations.pop(reservation_id, None) is None:
+                raise KeyError(f"Reserva desconhecida ou já cancelada: {reservation_id!r}")
+            remaining = self._remaining[reserved_flight] + seats
+            self._remaining[reserved_flight] = remaining
+            return reserved_flight, seats, remaining
+
+    def __contains__(self, flight_id: Hashable) -> bool:
+        return flight_id in self._remaining
+
+    def __len__(self) -> int:
+        return len(self._remaining)
+
+    def __repr__(self) -> str:
+        """Retorna uma representação legível do objeto."""
+        return (f"SeatInventory(flights={len(self)}, reservations={len(self._reservations)}, "
+                f"stripes={len(self._locks)})")
@@ -0,0 +1,178 @@
+import os
+import pickle
+import sqlite3
+import tempfile
+from collections import OrderedDict
+from collections.abc import Hashable
+from os import PathLike
+from src.fraud.AccountWindow import STATE_TTL_US, AccountWindow
+
+
+class AccountStateManager:
+    """
+    Guarda as janelas das contas dentro de um orçamento de memória.
+
+    As contas residentes ficam em ordem LRU. Quando a estimativa de memória
+    passa de memory_budget, as menos usadas saem da memória e são gravadas em
+    um SQLite local, de onde voltam na próxima transação da conta. Sem
+    orçamento, nada é despejado.
+
+    A ordem cronológica só é garantida dentro de cada conta, então o instante
+    da conta que acabou de chegar não diz nada sobre as outras. Contas só são
+    descartadas contra a marca d'água global informada a prune(): quem chama
+    garante que nenhuma transação futura é anterior a ela. Depois disso, o
+    despejo também descarta, em vez de gravar, as contas inativas em relação
+    à marca d'água.
+    """
+    def __init__(self, memory_budget: int | None = None, spill_path: str | PathLike | None = None):
+        self.memory_budget = memory_budget
+        self.memory_used = 0
+        self.evictions = 0
+        self.spills = 0
+        self.reloads = 0
+        self.pruned = 0
+        self.watermark_us: int | None = None
+        self._resident: OrderedDict[Hashable, AccountWindow] = OrderedDict()
+        self._sizes: dict[Hashable, int] = {}
+        self._spill_path = spill_path
+        self._owns_spill_file = spill_path is None
+        self._db: sqlite3.Connection | None = None
+        self._spilled = 0
+
+    def _store(self) -> sqlite3.Connection:
+        if self._db is None:
+            if self._spill_path is None:
+                handle, self._spill_path = tempfile.mkstemp(prefix="account-state-", suffix=".sqlite")
+                os.close(handle)
+            # O arquivo é só uma extensão da memória: durabilidade não é necessária
+            self._db = sqlite3.connect(self._spill_path, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode = OFF")
+            self._db.execute("PRAGMA synchronous = OFF")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS accounts ("
+                "account BLOB PRIMARY KEY, last_epoch_us INTEGER, durable INTEGER, state BLOB)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS accounts_last ON accounts (last_epoch_us)"
+            )
+            self._spilled = self._db.execute("SELECT COUNT(*) FROM accounts").fetchone()[0]
+        return self._db
+
+    def get(self, account_id: Hashable, create: bool = True) -> AccountWindow | None:
+        """Retorna a janela da conta, trazendo-a do disco se tiver sido despejada."""
+        window = self._resident.get(account_id)
+        if window is not None:
+            self._resident.move_to_end(account_id)
+            return window
+        window = self._reload(account_id) if self._spilled else None
+        if window is None:
+            if not create:
+                return None
+            window = AccountWindow()
+        self._resident[account_id] = window
+        self._sizes[account_id] = 0
+        return window
+
+    def update(self, account_id: Hashable, window: AccountWindow) -> None:
+        """Atualiza a estimativa de memória da conta e aplica o orçamento."""
+        size = window.estimated_size()
+        self.memory_used += size - self._sizes.get(account_id, 0)
+        self._sizes[account_id] = size
+        if self.memory_budget is not None and self.memory_used > self.memory_budget:
+            self._enforce_budget()
+
+    def _enforce_budget(self) -> None:
+        # A conta mais recente (a que acabou de ser usada) nunca é despejada
+        while self.memory_used > self.memory_budget and len(self._resident) > 1:
+            account_id, window = self._resident.popitem(last=False)
+            self.memory_used -= self._sizes.pop(account_id)
+            self.evictions += 1
+            if self.watermark_us is not None and window.is_idle(self.watermark_us):
+                self.pruned += 1
+            else:
+                self._spill(account_id, window)
+
+    def _spill(self, account_id: Hashable, window: AccountWindow) -> None:
+        self._store().execute(
+            "INSERT OR REPLACE INTO accounts VALUES (?, ?, ?, ?)",
+            (
+                pickle.dumps(account_id),
+                window.last_transaction.epoch_us,
+                bool(window.rule_state),
+                pickle.dumps(window),
+            ),
+        )
+        self._spilled += 1
+        self.spills += 1
+
+    def _reload(self, account_id: Hashable) -> AccountWindow | None:
+        db = self._store()
+        key = pickle.dumps(account_id)
+        row = db.execute("SELECT state FROM accounts WHERE account = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        db.execute("DELETE FROM accounts WHERE account = ?", (key,))
+        self._spilled -= 1
+        self.reloads += 1
+        return pickle.loads(row[0])
+
+    def prune(self, now_us: int) -> int:
+        """
+        Descarta, da memória e do disco, as contas inativas há mais que a maior
+        janela em relação a now_us, uma marca d'água global: nenhuma transação
+        de nenhuma conta processada depois pode ser anterior a ela.
+        """
+        if self.watermark_us is not None and now_us < self.watermark_us:
+            raise ValueError("A marca d'água de prune não pode voltar no tempo")
+        self.watermark_us = now_us
+        idle = [account_id for account_id, window in self._resident.items() if window.is_idle(now_us)]
+        for account_id in idle:
+            del self._resident[account_id]
+            self.memory_used -= self._sizes.pop(account_id)
+        removed = len(idle)
+        if self._spilled:
+            cursor = self._store().execute(
+                "DELETE FROM accounts WHERE durable = 0 AND last_epoch_us < ?",
+                (now_us - STATE_TTL_US,),
+            )
+            self._spilled -= cursor.rowcount
+            removed += cursor.rowcount
+        self.pruned += removed
+        return removed
+
+    def discard(self, account_id: Hashable) -> None:
+        """Remove todo o estado da conta."""
+        if self._resident.pop(account_id, None) is not None:
+            self.memory_used -= self._sizes.pop(account_id)
+        elif self._spilled:
+            cursor = self._store().execute(
+                "DELETE FROM accounts WHERE account = ?", (pickle.dumps(account_id),)
+            )
+            self._spilled -= cursor.rowcount
+
+    def stats(self) -> dict:
+        """Contadores de memória, despejo, gravação em disco e recarga."""
+        return {
+            "resident": len(self._resident),
+            "spilled": self._spilled,
+            "memory_used": self.memory_used,
+            "memory_budget": self.memory_budget,
+            "evictions": self.evictions,
+            "spills": self.spills,
+            "reloads": self.reloads,
+            "pruned": self.pruned,
+            "watermark_us": self.watermark_us,
+        }
+
+    def close(self) -> None:
+        """Fecha o armazenamento em disco, removendo-o se foi criado aqui."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+            if self._owns_spill_file:
+                os.remove(self._spill_path)
+                self._spill_path = None
+            self._spilled = 0
+
+    def __len__(self) -> int:
+        return len(self._resident) + self._spilled
@@ -0,0 +1,66 @@
+from collections import deque
+from src.fraud.FraudRule import LOCATION_CHANGE_WINDOW_US, VELOCITY_WINDOW_US
+from src.fraud.Transaction import Transaction
+
+# Depois da maior janela das regras sem atividade, o estado não influencia mais nada
+STATE_TTL_US = max(VELOCITY_WINDOW_US, LOCATION_CHANGE_WINDOW_US)
+
+# Estimativa de memória: objeto, deque vazio e última transação; e cada instante
+BASE_SIZE = 1024
+TIMESTAMP_SIZE = 40
+
+
+class AccountWindow:
+    """
+    Estado incremental de uma conta: instantes recentes (em microssegundos
+    desde a época), a última transação e o estado das regras com estado
+    (rule_state, criado só quando alguma regra o utiliza).
+    """
+    def __init__(self):
+        self.timestamps: deque[int] = deque()
+        self.last_transaction: Transaction | None = None
+        self.rule_state: dict[str, object] | None = None
+
+    def count_recent(self, now_us: int) -> int:
+        """
+        Descarta os instantes que saíram da janela de 60 minutos e retorna
+        quantos permanecem. Custo amortizado O(1) por transação.
+        """
+        cutoff = now_us - VELOCITY_WINDOW_US
+        timestamps = self.timestamps
+        while timestamps and timestamps[0] < cutoff:
+            timestamps.popleft()
+        return len(timestamps)
+
+    def push(self, transaction: Transaction) -> None:
+        """Registra a transação como parte do histórico da conta."""
+        last = self.last_transaction
+        if last is not None and transaction.epoch_us < last.epoch_us:
+            raise ValueError(
+                "Transações de uma conta devem chegar em ordem cronológica"
+            )
+        self.timestamps.append(transaction.epoch_us)
+        self.last_transaction = transaction
+
+    def is_idle(self, now_us: int) -> bool:
+        """
+        Indica se a conta está inativa há mais que a maior janela das regras e
+        não guarda estado de longo prazo de nenhuma regra.
+        """
+        if self.rule_state:
+            return False
+        last = self.last_transaction
+        return last is None or now_us - last.epoch_us > STATE_TTL_US
+
+    def estimated_size(self) -> int:
+        """Estimativa, em bytes, da memória ocupada pela janela."""
+        size = BASE_SIZE + TIMESTAMP_SIZE * len(self.timestamps)
+        if self.rule_state:
+            for state in self.rule_state.values():
+                size += state.estimated_size()
+        return size
+
+    def __repr__(self) -> str:
+        """Retorna uma representação legível do objeto."""
+        return (f"AccountWindow(recent={len(self.timestamps)}, "
+                f"last_transaction={self.last_transaction})")
@@ -0,0 +1,76 @@
+import itertools
+from collections.abc import Iterable
+from os import PathLike
+from src.fraud.LocationTable import LOCATIONS
+
+# Versões únicas no processo: dois índices nunca compartilham uma versão
+_VERSIONS = itertools.count()
+
+
+class BlacklistIndex:
+    """
+    Índice de localizações bloqueadas com consulta por hash.
+
+    As entradas são normalizadas (espaços e maiúsculas/minúsculas) na
+    construção, e recargas trocam o conjunto inteiro de uma só vez, de modo que
+    verificações concorrentes enxergam sempre a lista antiga ou a nova.
+    Consultas por id de localização (LOCATIONS) são memorizadas junto com o
+    conjunto, então cada id é normalizado no máximo uma vez por carga.
+    """
+    def __init__(self, locations: Iterable[str] = ()):
+        self._state: tuple[frozenset[str], dict[int, bool]] = (self._compile(locations), {})
+        # Renovada a cada recarga; identifica o conteúdo em caches de resultado
+        self.version = next(_VERSIONS)
+
+    @staticmethod
+    def normalize(location: str) -> str:
+        """Remove espaços excedentes e ignora maiúsculas/minúsculas."""
+        return " ".join(location.split()).casefold()
+
+    @classmethod
+    def _compile(cls, locations: Iterable[str]) -> frozenset[str]:
+        entries = (cls.normalize(location) for location in locations)
+        return frozenset(entry for entry in entries if entry)
+
+    @staticmethod
+    def _read_file(path: str | PathLike, encoding: str) -> list[str]:
+        """Lê uma localização por linha, ignorando linhas vazias e comentários (#)."""
+        with open(path, encoding=encoding) as file:
+            return [line for line in file if not line.lstrip().startswith("#")]
+
+    @classmethod
+    def from_file(cls, path: str | PathLike, encoding: str = "utf-8") -> "BlacklistIndex":
+        """Constrói o índice a partir de um arquivo com uma localização por linha."""
+        return cls(cls._read_file(path, encoding))
+
+    def reload(self, locations: Iterable[str]) -> None:
+        """Substitui atomicamente o conteúdo do índice."""
+        # O novo estado é montado por completo antes da troca da referência
+        self._state = (self._compile(locations), {})
+        self.version = next(_VERSIONS)
+
+    def reload_from_file(self, path: str | PathLike, encoding: str = "utf-8") -> None:
+        """Recarrega o índice a partir de um arquivo."""
+        self.reload(self._read_file(path, encoding))
+
+    def __contains__(self, location: object) -> bool:
+        if not isinstance(location, str):
+            return False
+        return self.normalize(location) in self._state[0]
+
+    def contains_id(self, location_id: int) -> bool:
+        """Verifica uma localização já internada em LOCATIONS."""
+        entries, blocked_ids = self._state
+        blocked = blocked_ids.get(location_id)
+        if blocked is None:
+            blocked = blocked_ids[location_id] = (
+                self.normalize(LOCATIONS.name(location_id)) in entries
+            )
+        return blocked
+
+    def __len__(self) -> int:
+        return len(self._state[0])
+
+    def __repr__(self) -> str:
+        """Retorna uma representação legível do objeto."""
+        return f"BlacklistIndex(entries={len(self)})"
@@ -0,0 +1,99 @@
+import math
+import mmap
+import struct
+from collections.abc import Iterable
+from hashlib import blake2b
+from os import PathLike
+
+# Cabeçalho: magic, bits (m), funções de hash (k), capacidade, taxa configurada, inserções
+MAGIC = b"BLOOM001"
+HEADER = struct.Struct("<8sQIQdQ4x")
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom para consultas de pertinência compactas.
+
+    Nunca produz falsos negativos; a taxa de falsos positivos é configurada na
+    criação e dimensiona o número de bits e de funções de hash. Pode ser salvo
+    em arquivo e reaberto via mmap, compartilhando as páginas entre processos.
+    """
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate deve estar entre 0 e 1")
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.size = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+        self._mmap: mmap.mmap | None = None
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        return ((first + i * second) % size for i in range(self.hash_count))
+
+    def add(self, key: str) -> None:
+        if self._mmap is not None:
+            raise ValueError("Um BloomFilter carregado de arquivo é somente leitura")
+        bits = self._bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        bits = self._bits
+        for position in self._positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def expected_false_positive_rate(self) -> float:
+        """Taxa de falsos positivos estimada para o número atual de inserções."""
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+    def save(self, path: str | PathLike) -> None:
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(
+                MAGIC, self.size, self.hash_count, self.capacity,
+                self.false_positive_rate, self.count,
+            ))
+            file.write(self._bits)
+
+    @classmethod
+    def load(cls, path: str | PathLike) -> "BloomFilter":
+        """Abre um filtro salvo via mmap, sem copiar os bits para a memória do processo."""
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, size, hash_count, capacity, rate, count = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} não é um filtro de Bloom válido")
+        bloom = cls.__new__(cls)
+        bloom.capacity = capacity
+        bloom.false_positive_rate = rate
+        bloom.size = size
+        bloom.hash_count = hash_count
+        bloom.count = count
+        bloom._mmap = mapped
+        bloom._bits = memoryview(mapped)[HEADER.size:]
+        return bloom
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._bits.release()
+            self._mmap.close()
+
+    def __repr__(self) -> str:
+        """Retorna uma representação legível do objeto."""
+        return (f"BloomFilter(bits={self.size}, hashes={self.hash_count}, "
+                f"count={self.count}, false_positive_rate={self.false_positive_rate})")
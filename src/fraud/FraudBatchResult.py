@@ -0,0 +1,43 @@
+import numpy as np
+from src.fraud.FraudCheckResult import FraudCheckResult
+
+
+class FraudBatchResult:
+    """Armazena, em colunas, os resultados de uma verificação de fraude em lote."""
+    def __init__(
+        self,
+        is_fraudulent: np.ndarray,
+        is_blocked: np.ndarray,
+        verification_required: np.ndarray,
+        risk_score: np.ndarray,
+        errors: dict[int, Exception] | None = None,
+    ):
+        self.is_fraudulent = is_fraudulent
+        self.is_blocked = is_blocked
+        self.verification_required = verification_required
+        self.risk_score = risk_score
+        # Posição -> exceção das transações que não puderam ser avaliadas
+        self.errors = errors if errors is not None else {}
+
+    def __len__(self) -> int:
+        return len(self.risk_score)
+
+    def __getitem__(self, index: int) -> FraudCheckResult:
+        """
+        Retorna o resultado de uma única transação no formato do modo escalar;
+        para uma transação que falhou, lança a exceção dela.
+        """
+        if index in self.errors:
+            raise self.errors[index]
+        return FraudCheckResult(
+            bool(self.is_fraudulent[index]),
+            bool(self.is_blocked[index]),
+            bool(self.verification_required[index]),
+            int(self.risk_score[index]),
+        )
+
+    def __repr__(self) -> str:
+        """Retorna uma representação legível do objeto."""
+        return (f"FraudBatchResult(size={len(self)}, "
+                f"fraudulent={int(self.is_fraudulent.sum())}, "
+                f"blocked={int(self.is_blocked.sum())}, errors={len(self.errors)})")
@@ -0,0 +1,112 @@
+from collections.abc import Hashable, Iterable
+from src.fraud.AccountStateManager import AccountStateManager
+from src.fraud.BlacklistIndex import BlacklistIndex
+from src.fraud.FraudCheckResult import FraudCheckResult
+from src.fraud.FraudDetectionSystem import FraudDetectionSystem
+from src.fraud.Transaction import Transaction
+
+
+class FraudDetectionStream:
+    """
+    Modo com estado do FraudDetectionSystem: mantém uma janela deslizante por
+    conta e avalia cada transação em O(1) amortizado, sem reenviar o histórico.
+    As janelas ficam em um AccountStateManager, que pode limitar a memória.
+    """
+    def __init__(
+        self,
+        blacklisted_locations: BlacklistIndex | list[str],
+        system: FraudDetectionSystem | None = None,
+        state: AccountStateManager | None = None,
+    ):
+        self.blacklisted_locations = blacklisted_locations
+        self.system = system if system is not None else FraudDetectionSystem()
+        self.state = state if state is not None else AccountStateManager()
+
+    def process(self, account_id: Hashable, transaction: Transaction) -> FraudCheckResult:
+        """
+        Avalia a transação da conta com as mesmas regras de check_for_fraud e a
+        incorpora ao histórico. As transações de cada conta devem chegar em
+        ordem cronológica.
+        """
+        window = self.state.get(account_id)
+        last_transaction = window.last_transaction
+        if last_transaction is not None and transaction.epoch_us < last_transaction.epoch_us:
+            raise ValueError(
+                "Transações de uma conta devem chegar em ordem cronológica"
+            )
+
+        result = self.system._apply_rules(
+            transaction,
+            window.count_recent(transaction.epoch_us),
+            last_transaction,
+            self.blacklisted_locations,
+            window,
+        )
+        window.push(transaction)
+        self.system.rule_engine.observe(window, transaction)
+        self.state.update(account_id, window)
+        return result
+
+    def process_batch(
+        self, events: Iterable[tuple[Hashable, Transaction]]
+    ) -> list[FraudCheckResult | Exception]:
+        """
+        Avalia um lote de pares (conta, transação) com o mesmo resultado de
+        chamar process para cada um, na ordem do lote.
+
+        As transações são agrupadas por conta: a janela é obtida e a memória é
+        contabilizada uma única vez por conta do lote, e não por transação.
+        Uma transação com erro não interrompe as demais; no lugar do seu
+        resultado fica a exceção.
+        """
+        by_account: dict[Hashable, list[int]] = {}
+        events = list(events)
+        for position, (account_id, _) in enumerate(events):
+            by_account.setdefault(account_id, []).append(position)
+
+        results: list[FraudCheckResult | Exception | None] = [None] * len(events)
+        apply_rules = self.system._apply_rules
+        engine = self.system.rule_engine
+        blacklist = self.blacklisted_locations
+        for account_id, positions in by_account.items():
+            window = self.state.get(account_id)
+            for position in positions:
+                transaction = events[position][1]
+                try:
+                    last_transaction = window.last_transaction
+                    if last_transaction is not None and transaction.epoch_us < last_transaction.epoch_us:
+                        raise ValueError(
+                            "Transações de uma conta devem chegar em ordem cronológica"
+                        )
+                    results[position] = apply_rules(
+                        transaction,
+                        window.count_recent(transaction.epoch_us),
+                        last_transaction,
+                        blacklist,
+                        window,
+                    )
+                    window.push(transaction)
+                    engine.observe(window, transaction)
+                except Exception as error:
+                    results[position] = error
+            if window.last_transaction is not None:
+                self.state.update(account_id, window)
+        return results
+
+    def seed(self, account_id: Hashable, transactions: Iterable[Transaction]) -> None:
+        """Carrega o histórico (em ordem cronológica) de uma conta sem avaliá-lo."""
+        window = self.state.get(account_id)
+        engine = self.system.rule_engine
+        for transaction in transactions:
+            window.push(transaction)
+            engine.observe(window, transaction)
+        if window.last_transaction is not None:
+            window.count_recent(window.last_transaction.epoch_us)
+            self.state.update(account_id, window)
+
+    def forget(self, account_id: Hashable) -> None:
+        """Remove o estado mantido para a conta."""
+        self.state.discard(account_id)
+
+    def __len__(self) -> int:
+        return len(self.state)
@@ -1,61 +1,248 @@
+from bisect import bisect_left
+from collections.abc import Callable, Hashable, Sequence
+import numpy as np
 from src.fraud.Transaction import Transaction
+from src.fraud.BlacklistIndex import BlacklistIndex
+from src.fraud.FraudBatchResult import FraudBatchResult
 from src.fraud.FraudCheckResult import FraudCheckResult
+from src.fraud.FraudRule import (
+    VELOCITY_LIMIT,
+    VELOCITY_WINDOW_US,
+    FraudContext,
+)
+from src.fraud.FraudResultCache import FraudResultCache
+from src.fraud.MappedTransactionHistory import MappedTransactionHistory
+from src.fraud.RuleEngine import RuleEngine
+from src.fraud.TransactionLog import TransactionLog
+
+# Unidades aceitas para timestamps numéricos (divisões por segundo)
+EPOCH_UNITS = {"s": 1, "ms": 1_000, "us": 1_000_000}
 
 
 class FraudDetectionSystem:
     """Um sistema para detectar transações potencialmente fraudulentas."""
 
+    def __init__(
+        self,
+        rule_engine: RuleEngine | None = None,
+        result_cache: FraudResultCache | None = None,
+    ):
+        self.rule_engine = rule_engine if rule_engine is not None else RuleEngine()
+        self.result_cache = result_cache
+
     def check_for_fraud(
         self,
         current_transaction: Transaction,
-        previous_transactions: list[Transaction],
-        blacklisted_locations: list[str],
+        previous_transactions: list[Transaction] | TransactionLog | MappedTransactionHistory,
+        blacklisted_locations: BlacklistIndex | list[str],
+        assume_sorted: bool = False,
+        idempotency_key: Hashable | None = None,
+        history_version: Hashable | None = None,
     ) -> FraudCheckResult:
         """
         Verifica a transação atual contra um conjunto de regras para identificar fraudes.
+
+        Com assume_sorted=True o chamador garante que previous_transactions está
+        ordenado por timestamp, e a contagem da última hora usa busca binária.
+        Um BlacklistIndex (ou um TieredDenyList, para listas muito grandes) pode
+        substituir a lista de bloqueio para que a consulta não dependa do
+        tamanho da lista. Um TransactionLog ou um
+        MappedTransactionHistory é consultado diretamente, sem materializar
+        objetos Transaction.
+
+        Com um result_cache configurado, o resultado é reaproveitado entre
+        novas tentativas: pela idempotency_key fornecida pelo chamador ou, na
+        falta dela, pela impressão digital da transação junto com
+        history_version e a versão do BlacklistIndex. Sem chave, sem versão do
+        histórico ou com uma lista de bloqueio sem versão (lista comum,
+        TieredDenyList) a verificação não usa o cache.
+        """
+        cache = self.result_cache
+        cache_key = None
+        if cache is not None:
+            if idempotency_key is not None:
+                cache_key = ("idempotency", idempotency_key)
+            elif history_version is not None:
+                cache_key = cache.fingerprint(
+                    current_transaction, history_version, blacklisted_locations
+                )
+            if cache_key is not None:
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    return cached
+
+        # A contagem da última hora só é feita se alguma regra precisar dela
+        last_transaction = previous_transactions[-1] if previous_transactions else None
+
+        result = self._apply_rules(
+            current_transaction,
+            lambda context: self._count_recent(
+                context, current_transaction, previous_transactions, assume_sorted
+            ),
+            last_transaction,
+            blacklisted_locations,
+        )
+        if cache_key is not None:
+            cache.put(cache_key, result)
+        return result
+
+    def check_for_fraud_batch(
+        self,
+        amounts: np.ndarray,
+        timestamps: np.ndarray,
+        account_ids: np.ndarray,
+        locations: np.ndarray,
+        blacklisted_locations: BlacklistIndex | Sequence,
+        timestamp_unit: str = "s",
+    ) -> FraudBatchResult:
+        """
+        Aplica as regras de check_for_fraud a um lote de transações em colunas.
+
+        O histórico de cada linha são as linhas anteriores da mesma conta, como
+        se cada transação fosse verificada na ordem de entrada e depois anexada
+        ao histórico da conta. Dentro de uma conta, os timestamps (inteiros em
+        época, na unidade timestamp_unit) devem ser não decrescentes. O lote
+        aplica as quatro regras padrão, mesmo que o RuleEngine tenha outras.
         """
-        is_fraudulent = False
-        is_blocked = False
-        verification_required = False
-        risk_score = 0
+        amounts = np.asarray(amounts, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        account_ids = np.asarray(account_ids)
+        locations = np.asarray(locations)
+        size = len(amounts)
+        if not (len(timestamps) == len(account_ids) == len(locations) == size):
+            raise ValueError("Todas as colunas devem ter o mesmo tamanho")
+        if timestamp_unit not in EPOCH_UNITS:
+            raise ValueError(f"Unidade de timestamp desconhecida: {timestamp_unit}")
+        per_second = EPOCH_UNITS[timestamp_unit]
+
+        # Agrupa por conta preservando a ordem de entrada dentro de cada grupo
+        _, account_codes = np.unique(account_ids, return_inverse=True)
+        unique_locations, location_codes = np.unique(locations, return_inverse=True)
+        order = np.argsort(account_codes, kind="stable")
+        account_sorted = account_codes[order].astype(np.int64)
+        time_sorted = timestamps[order]
+        location_sorted = location_codes[order]
+
+        same_account = np.zeros(size, dtype=bool)
+        same_account[1:] = account_sorted[1:] == account_sorted[:-1]
+        elapsed = np.zeros(size, dtype=np.int64)
+        elapsed[1:] = time_sorted[1:] - time_sorted[:-1]
+        if np.any(same_account & (elapsed < 0)):
+            raise ValueError("Timestamps de cada conta devem estar em ordem cronológica")
+
+        # 2. Transações da última hora: busca binária sobre a chave (conta, tempo).
+        # O tempo é substituído pelo seu posto para a chave composta não transbordar.
+        cutoffs = time_sorted - 60 * 60 * per_second
+        _, ranks = np.unique(np.concatenate((time_sorted, cutoffs)), return_inverse=True)
+        stride = 2 * size + 1
+        keys = account_sorted * stride + ranks[:size]
+        first_recent = np.searchsorted(keys, account_sorted * stride + ranks[size:], side="left")
+        recent_sorted = np.arange(size) - first_recent
 
-        # 1. Verifica o valor da transação
-        if current_transaction.amount > 10000:
-            is_fraudulent = True
-            verification_required = True
-            risk_score += 50
+        # 3. Mudança de localização em relação à transação anterior da conta
+        location_sorted_change = np.zeros(size, dtype=bool)
+        location_sorted_change[1:] = location_sorted[1:] != location_sorted[:-1]
+        location_sorted_change &= same_account & (elapsed < 30 * 60 * per_second)
+
+        recent_transaction_count = np.empty(size, dtype=np.int64)
+        recent_transaction_count[order] = recent_sorted
+        location_change = np.empty(size, dtype=bool)
+        location_change[order] = location_sorted_change
+
+        # 4. A lista de bloqueio é consultada uma vez por localização distinta
+        blacklisted_codes = np.fromiter(
+            (location in blacklisted_locations for location in unique_locations.tolist()),
+            dtype=bool,
+            count=len(unique_locations),
+        )
+        blacklisted = blacklisted_codes[location_codes]
+
+        high_amount = amounts > 10000
+        excessive = recent_transaction_count > VELOCITY_LIMIT
+        is_fraudulent = high_amount | location_change
+        risk_score = (
+            50 * high_amount.astype(np.int64)
+            + 30 * excessive.astype(np.int64)
+            + 20 * location_change.astype(np.int64)
+        )
+        risk_score[blacklisted] = 100
 
-        # 2. Verifica por transações excessivas na última hora
+        return FraudBatchResult(
+            is_fraudulent, excessive | blacklisted, is_fraudulent.copy(), risk_score
+        )
+
+    def _count_recent(
+        self,
+        context: FraudContext,
+        current_transaction: Transaction,
+        previous_transactions: list[Transaction] | TransactionLog | MappedTransactionHistory,
+        assume_sorted: bool,
+    ) -> int:
+        """
+        Conta as transações da última hora conforme o tipo de histórico e
+        registra no contexto quantos elementos foram examinados.
+        """
+        if isinstance(previous_transactions, (TransactionLog, MappedTransactionHistory)):
+            if getattr(previous_transactions, "is_sorted", True):
+                context.history_scanned += len(previous_transactions).bit_length()
+            else:
+                context.history_scanned += len(previous_transactions)
+            return previous_transactions.count_since(
+                current_transaction.epoch_us - VELOCITY_WINDOW_US
+            )
+        if assume_sorted:
+            context.history_scanned += min(len(previous_transactions), VELOCITY_LIMIT + 1)
+            return self._count_recent_sorted(current_transaction, previous_transactions)
+
+        context.history_scanned += len(previous_transactions)
+        cutoff = current_transaction.epoch_us - VELOCITY_WINDOW_US
         recent_transaction_count = 0
         for transaction in previous_transactions:
-            time_difference = current_transaction.timestamp - transaction.timestamp
-            time_diff_minutes = time_difference.total_seconds() / 60
-            if time_diff_minutes <= 60:
+            if transaction.epoch_us >= cutoff:
                 recent_transaction_count += 1
+        return recent_transaction_count
 
-        if recent_transaction_count > 10:
-            is_blocked = True
-            risk_score += 30
-
-        # 3. Verifica mudança de localização em um curto período de tempo
-        if previous_transactions:
-            last_transaction = previous_transactions[-1]
-            time_since_last = current_transaction.timestamp - last_transaction.timestamp
-            minutes_since_last = time_since_last.total_seconds() / 60
-
-            if (
-                minutes_since_last < 30
-                and last_transaction.location != current_transaction.location
-            ):
-                is_fraudulent = True
-                verification_required = True
-                risk_score += 20
-
-        # 4. Verifica se a localização está na lista de bloqueio (blacklist)
-        if current_transaction.location in blacklisted_locations:
-            is_blocked = True
-            risk_score = 100
-
-        return FraudCheckResult(
-            is_fraudulent, is_blocked, verification_required, risk_score
+    def _count_recent_sorted(
+        self,
+        current_transaction: Transaction,
+        previous_transactions: list[Transaction],
+    ) -> int:
+        """
+        Conta as transações da última hora em um histórico ordenado.
+
+        A regra só distingue "até 10" de "mais de 10", então basta examinar as
+        últimas VELOCITY_LIMIT + 1 transações: a contagem retornada é limitada
+        a esse valor e custa O(log VELOCITY_LIMIT), independente do histórico.
+        """
+        start = max(0, len(previous_transactions) - (VELOCITY_LIMIT + 1))
+        tail = previous_transactions[start:]
+
+        # Validação barata: apenas o trecho examinado precisa estar ordenado
+        for earlier, later in zip(tail, tail[1:]):
+            if later.epoch_us < earlier.epoch_us:
+                raise ValueError("previous_transactions não está ordenado por timestamp")
+
+        cutoff = current_transaction.epoch_us - VELOCITY_WINDOW_US
+        return len(tail) - bisect_left(tail, cutoff, key=lambda t: t.epoch_us)
+
+    def _apply_rules(
+        self,
+        current_transaction: Transaction,
+        recent_transaction_count: int | Callable[[FraudContext], int],
+        last_transaction: Transaction | None,
+        blacklisted_locations: BlacklistIndex | list[str],
+        account_state=None,
+    ) -> FraudCheckResult:
+        """
+        Aplica as regras a partir dos dados já extraídos do histórico, para que
+        os modos sem estado e com estado compartilhem a mesma lógica.
+        """
+        return self.rule_engine.evaluate(
+            FraudContext(
+                current_transaction,
+                recent_transaction_count,
+                last_transaction,
+                blacklisted_locations,
+                account_state,
+            )
         )
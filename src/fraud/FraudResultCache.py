@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Container, Hashable
+from src.fraud.FraudCheckResult import FraudCheckResult
+from src.fraud.Transaction import Transaction
+
+
+class FraudResultCache:
+    """
+    Cache de resultados de verificação com despejo LRU e expiração por TTL.
+
+    Permite que novas tentativas da mesma transação (mesma chave de
+    idempotência, ou mesma impressão digital e versão do histórico) reutilizem
+    o resultado já calculado em vez de reavaliar as regras.
+    """
+    def __init__(self, max_entries: int = 100_000, ttl: float = 60.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: OrderedDict[Hashable, tuple[float, FraudCheckResult]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(
+        transaction: Transaction,
+        history_version: Hashable,
+        blacklisted_locations: Container[str],
+    ) -> tuple | None:
+        """
+        Chave estável de uma verificação, incluindo a versão da lista de
+        bloqueio. Listas sem version (listas comuns, TieredDenyList) não
+        identificam o próprio conteúdo, então retornam None: a verificação não
+        usa o cache em vez de arriscar o resultado de outra lista.
+        """
+        blacklist_version = getattr(blacklisted_locations, "version", None)
+        if blacklist_version is None:
+            return None
+        return (
+            "fingerprint",
+            transaction.amount,
+            transaction.epoch_us,
+            transaction.location_id,
+            transaction.merchant_id,
+            transaction.device_id,
+            history_version,
+            blacklist_version,
+        )
+
+    def get(self, key: Hashable) -> FraudCheckResult | None:
+        """Retorna o resultado em cache, se existir e não tiver expirado."""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, result = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: Hashable, result: FraudCheckResult) -> None:
+        """Armazena o resultado, despejando o menos usado se o cache estiver cheio."""
+        expires_at = self.clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Retorna os contadores do cache."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        """Retorna uma representação legível do objeto."""
+        return (f"FraudResultCache(size={len(self._entries)}, "
+                f"hits={self.hits}, misses={self.misses})")
@@ -0,0 +1,267 @@
+from collections.abc import Callable, Container
+from datetime import timedelta
+from src.fraud.AmountSketch import AmountSketch
+from src.fraud.BlacklistIndex import BlacklistIndex
+from src.fraud.FraudCheckResult import FraudCheckResult
+from src.fraud.Gazetteer import Gazetteer
+from src.fraud.Transaction import Transaction
+
+# Janela e limite da regra de transações excessivas (regra 2)
+VELOCITY_WINDOW = timedelta(minutes=60)
+VELOCITY_LIMIT = 10
+VELOCITY_WINDOW_US = VELOCITY_WINDOW // timedelta(microseconds=1)
+
+# Janela da regra de mudança de localização (regra 3)
+LOCATION_CHANGE_WINDOW_US = timedelta(minutes=30) // timedelta(microseconds=1)
+
+MICROSECONDS_PER_HOUR = 3_600_000_000
+
+# Efeitos que uma regra pode declarar sobre o resultado
+FLAGS = ("is_fraudulent", "is_blocked", "verification_required")
+
+
+class FraudContext:
+    """
+    Dados disponíveis para as regras durante uma verificação.
+
+    A contagem da última hora pode ser fornecida como uma função que recebe o
+    contexto, e então só é calculada se alguma regra realmente precisar dela. A
+    função pode somar a history_scanned quantos elementos do histórico examinou.
+    No modo com estado, account_state é a janela da conta (AccountWindow), onde
+    regras com estado próprio guardam seus dados.
+    """
+    def __init__(
+        self,
+        current_transaction: Transaction,
+        recent_transaction_count: int | Callable[["FraudContext"], int],
+        last_transaction: Transaction | None,
+        blacklisted_locations: Container[str],
+        account_state=None,
+    ):
+        self.current_transaction = current_transaction
+        self.last_transaction = last_transaction
+        self.blacklisted_locations = blacklisted_locations
+        self.account_state = account_state
+        self._recent_transaction_count = recent_transaction_count
+        self.history_scanned = 0
+
+    @property
+    def recent_transaction_count(self) -> int:
+        count = self._recent_transaction_count
+        if callable(count):
+            count = self._recent_transaction_count = count(self)
+        return count
+
+
+class RuleOutcome:
+    """Acumula os efeitos das regras disparadas em uma verificação."""
+    def __init__(self):
+        self.is_fraudulent = False
+        self.is_blocked = False
+        self.verification_required = False
+        self.risk_score = 0
+        # Quando definido, substitui a soma das pontuações (ex.: blacklist)
+        self.score_override: int | None = None
+
+    def can_change(self, rule: "FraudRule") -> bool:
+        """Indica se disparar a regra ainda alteraria o resultado final."""
+        for flag in rule.flags:
+            if not getattr(self, flag):
+                return True
+        if rule.score_override is not None:
+            return self.score_override is None or rule.score_override > self.score_override
+        return rule.score != 0 and self.score_override is None
+
+    def to_result(self) -> FraudCheckResult:
+        risk_score = self.risk_score if self.score_override is None else self.score_override
+        return FraudCheckResult(
+            self.is_fraudulent, self.is_blocked, self.verification_required, risk_score
+        )
+
+
+class FraudRule:
+    """
+    Regra de fraude registrável em um RuleEngine.
+
+    Cada regra declara seu custo relativo e seus efeitos (flags ligadas e
+    pontuação somada ou imposta), o que permite ao motor ordená-las e pular as
+    que não podem mais alterar o resultado. Regras com stateful = True
+    recebem cada transação processada em modo com estado por meio de observe.
+    """
+    name = "rule"
+    cost = 1
+    flags: tuple[str, ...] = ()
+    score = 0
+    score_override: int | None = None
+    stateful = False
+
+    def matches(self, context: FraudContext) -> bool:
+        raise NotImplementedError
+
+    def observe(self, account_state, transaction: Transaction) -> None:
+        """Atualiza o estado da regra na janela da conta após a verificação."""
+
+    def apply(self, outcome: RuleOutcome) -> None:
+        for flag in self.flags:
+            setattr(outcome, flag, True)
+        if self.score_override is not None:
+            if outcome.score_override is None or self.score_override > outcome.score_override:
+                outcome.score_override = self.score_override
+        else:
+            outcome.risk_score += self.score
+
+    def __repr__(self) -> str:
+        """Retorna uma representação legível do objeto."""
+        return f"{type(self).__name__}(cost={self.cost})"
+
+
+class HighAmountRule(FraudRule):
+    """1. Valor da transação acima de 10000."""
+    name = "high_amount"
+    cost = 1
+    flags = ("is_fraudulent", "verification_required")
+    score = 50
+
+    def matches(self, context: FraudContext) -> bool:
+        return context.current_transaction.amount > 10000
+
+
+class VelocityRule(FraudRule):
+    """2. Mais de 10 transações na última hora (exige percorrer o histórico)."""
+    name = "velocity"
+    cost = 10
+    flags = ("is_blocked",)
+    score = 30
+
+    def matches(self, context: FraudContext) -> bool:
+        return context.recent_transaction_count > VELOCITY_LIMIT
+
+
+class LocationChangeRule(FraudRule):
+    """3. Mudança de localização em menos de 30 minutos."""
+    name = "location_change"
+    cost = 2
+    flags = ("is_fraudulent", "verification_required")
+    score = 20
+
+    def matches(self, context: FraudContext) -> bool:
+        last_transaction = context.last_transaction
+        if last_transaction is None:
+            return False
+        current_transaction = context.current_transaction
+        return (
+            current_transaction.epoch_us - last_transaction.epoch_us < LOCATION_CHANGE_WINDOW_US
+            and last_transaction.location_id != current_transaction.location_id
+        )
+
+
+class AmountAnomalyRule(FraudRule):
+    """
+    Valor acima do percentil configurado do histórico da própria conta.
+
+    Cada conta mantém um AmountSketch de tamanho fixo, atualizado em O(1) a
+    cada transação. Só atua no modo com estado (FraudDetectionStream) e depois
+    de min_observations transações da conta.
+    """
+    name = "amount_anomaly"
+    cost = 3
+    flags = ("verification_required",)
+    score = 25
+    stateful = True
+
+    def __init__(
+        self,
+        percentile: float = 0.99,
+        min_observations: int = 30,
+        relative_accuracy: float = 0.05,
+        max_bins: int = 128,
+    ):
+        self.percentile = percentile
+        self.min_observations = min_observations
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+
+    def matches(self, context: FraudContext) -> bool:
+        account_state = context.account_state
+        if account_state is None or not account_state.rule_state:
+            return False
+        sketch = account_state.rule_state.get(self.name)
+        if sketch is None or sketch.count < self.min_observations:
+            return False
+        # Compara com o limite do balde para que valores do próprio balde não disparem
+        return context.current_transaction.amount > sketch.upper_bound(self.percentile)
+
+    def observe(self, account_state, transaction: Transaction) -> None:
+        if account_state.rule_state is None:
+            account_state.rule_state = {}
+        sketch = account_state.rule_state.get(self.name)
+        if sketch is None:
+            sketch = account_state.rule_state[self.name] = AmountSketch(
+                self.relative_accuracy, self.max_bins
+            )
+        sketch.add(transaction.amount)
+
+
+class ImpossibleTravelRule(FraudRule):
+    """
+    Deslocamento entre a transação anterior e a atual que exigiria velocidade
+    acima de max_speed_kmh. As distâncias vêm da matriz pré-calculada do
+    Gazetteer; localizações desconhecidas não disparam a regra.
+    """
+    name = "impossible_travel"
+    cost = 2
+    flags = ("is_fraudulent", "verification_required")
+    score = 40
+
+    def __init__(self, gazetteer: Gazetteer, max_speed_kmh: float = 1000.0):
+        self.gazetteer = gazetteer
+        self.max_speed_kmh = max_speed_kmh
+
+    def matches(self, context: FraudContext) -> bool:
+        last_transaction = context.last_transaction
+        if last_transaction is None:
+            return False
+        current_transaction = context.current_transaction
+        if last_transaction.location_id == current_transaction.location_id:
+            return False
+        distance = self.gazetteer.distance_km(
+            last_transaction.location_id, current_transaction.location_id
+        )
+        if distance is None:
+            return False
+        # Sem divisão: distância maior do que a percorrível no tempo decorrido
+        elapsed_us = current_transaction.epoch_us - last_transaction.epoch_us
+        return distance * MICROSECONDS_PER_HOUR > self.max_speed_kmh * elapsed_us
+
+
+class DenyListRule(FraudRule):
+    """
+    Bloqueia quando um atributo da transação (ex.: merchant_id, device_id) está
+    em uma lista de negação, como um TieredDenyList. Mesmo efeito da blacklist.
+    """
+    cost = 3
+    flags = ("is_blocked",)
+    score_override = 100
+
+    def __init__(self, attribute: str, deny_list: Container[str]):
+        self.attribute = attribute
+        self.deny_list = deny_list
+        self.name = f"deny_{attribute}"
+
+    def matches(self, context: FraudContext) -> bool:
+        value = getattr(context.current_transaction, self.attribute)
+        return value is not None and value in self.deny_list
+
+
+class BlacklistRule(FraudRule):
+    """4. Localização na lista de bloqueio: bloqueia e impõe pontuação 100."""
+    name = "blacklist"
+    cost = 1
+    flags = ("is_blocked",)
+    score_override = 100
+
+    def matches(self, context: FraudContext) -> bool:
+        blacklisted_locations = context.blacklisted_locations
+        if isinstance(blacklisted_locations, BlacklistIndex):
+            return blacklisted_locations.contains_id(context.current_transaction.location_id)
+        return context.current_transaction.location in blacklisted_locations
@@ -0,0 +1,153 @@
+import argparse
+import asyncio
+import json
+from src.fraud.BlacklistIndex import BlacklistIndex
+from src.fraud.FraudDetectionStream import FraudDetectionStream
+from src.fraud.TransactionCodec import parse_transaction, result_to_dict
+from src.metrics.LatencyRecorder import LatencyRecorder
+
+
+class FraudScoringServer:
+    """
+    Serviço TCP assíncrono que recebe transações em linhas JSON.
+
+    Requisições concorrentes são agrupadas em micro-lotes: o lote é fechado ao
+    atingir max_batch_size ou quando a primeira requisição espera max_batch_delay
+    segundos, e então é avaliado de uma vez, agrupado por conta (uma consulta
+    e uma contabilização de estado por conta do lote). Cada linha recebe uma
+    resposta, na ordem em que foi enviada pela conexão. A linha
+    {"op": "metrics"} retorna as métricas de latência e de fila.
+    """
+    def __init__(
+        self,
+        blacklisted_locations: BlacklistIndex | list[str],
+        max_batch_size: int = 256,
+        max_batch_delay: float = 0.002,
+    ):
+        self.stream = FraudDetectionStream(blacklisted_locations)
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.latency = LatencyRecorder()
+        self.batch_sizes = LatencyRecorder(minimum=1.0)
+        self.max_queue_depth = 0
+        self._queue: asyncio.Queue | None = None
+        self._batcher: asyncio.Task | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.Server:
+        """Inicia o agrupador de lotes e o servidor TCP."""
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._run_batcher())
+        return await asyncio.start_server(self._handle_client, host, port)
+
+    async def stop(self) -> None:
+        """Interrompe o agrupador de lotes."""
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+
+    def metrics(self) -> dict:
+        """Retorna latência (p50/p99, em segundos), tamanho dos lotes e profundidade da fila."""
+        return {
+            "latency": self.latency.snapshot(),
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        replies: asyncio.Queue = asyncio.Queue()
+        responder = asyncio.create_task(self._write_replies(replies, writer))
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                reply = loop.create_future()
+                await replies.put(reply)
+                try:
+                    payload = json.loads(line)
+                    if payload.get("op") == "metrics":
+                        reply.set_result(self.metrics())
+                        continue
+                    account_id, transaction = parse_transaction(payload)
+                except Exception as error:
+                    reply.set_result({"error": f"requisição inválida: {error}"})
+                    continue
+                await self._queue.put((reply, payload.get("id"), account_id, transaction, loop.time()))
+                self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        finally:
+            await replies.put(None)
+            await responder
+            writer.close()
+
+    async def _write_replies(self, replies: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        while (reply := await replies.get()) is not None:
+            writer.write(json.dumps(await reply).encode("utf-8") + b"\n")
+            await writer.drain()
+
+    async def _run_batcher(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_batch_delay
+            while len(batch) < self.max_batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self._score_batch(batch, loop.time)
+
+    def _score_batch(self, batch: list, clock) -> None:
+        """
+        Avalia o lote com FraudDetectionStream.process_batch, que agrupa as
+        transações por conta, e responde cada requisição. Nenhuma exceção
+        escapa: uma falha vira a resposta de erro da requisição (ou do lote),
+        para que o agrupador continue atendendo as demais conexões.
+        """
+        self.batch_sizes.record(len(batch))
+        try:
+            outcomes = self.stream.process_batch(
+                (account_id, transaction) for _, _, account_id, transaction, _ in batch
+            )
+        except Exception as error:
+            outcomes = [error] * len(batch)
+        for (reply, request_id, *_), outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                response = {"error": str(outcome)}
+            else:
+                response = result_to_dict(outcome)
+            response["id"] = request_id
+            if not reply.done():
+                reply.set_result(response)
+        finished = clock()
+        for *_, received in batch:
+            self.latency.record(finished - received)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    blacklist = BlacklistIndex.from_file(args.blacklist) if args.blacklist else BlacklistIndex()
+    service = FraudScoringServer(blacklist, args.max_batch_size, args.max_batch_delay_ms / 1000)
+    server = await service.start(args.host, args.port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fraud scoring service (JSON lines over TCP).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--blacklist", help="File with one blacklisted location per line.")
+    parser.add_argument("--max-batch-size", type=int, default=256)
+    parser.add_argument("--max-batch-delay-ms", type=float, default=2.0)
+    asyncio.run(_serve(parser.parse_args()))
@@ -0,0 +1,63 @@
+import csv
+from collections.abc import Iterable
+from os import PathLike
+import numpy as np
+from src.fraud.LocationTable import LOCATIONS
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+class Gazetteer:
+    """
+    Coordenadas das localizações conhecidas e a matriz de distâncias entre elas.
+
+    A matriz (haversine, em km) é calculada uma vez na construção, de forma
+    vetorizada; cada consulta depois é só uma busca de índice por id de
+    localização (LOCATIONS), com custo constante.
+    """
+    def __init__(self, coordinates: Iterable[tuple[str, float, float]]):
+        names, latitudes, longitudes = [], [], []
+        for name, latitude, longitude in coordinates:
+            names.append(name)
+            latitudes.append(float(latitude))
+            longitudes.append(float(longitude))
+        self.names = names
+        self._index = {LOCATIONS.intern(name): position for position, name in enumerate(names)}
+        self._size = len(names)
+        self._distances: list[float] = self._distance_matrix(
+            np.radians(latitudes), np.radians(longitudes)
+        ).ravel().tolist()
+
+    @staticmethod
+    def _distance_matrix(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        delta_latitude = latitudes[:, None] - latitudes[None, :]
+        delta_longitude = longitudes[:, None] - longitudes[None, :]
+        a = (
+            np.sin(delta_latitude / 2) ** 2
+            + np.cos(latitudes[:, None]) * np.cos(latitudes[None, :]) * np.sin(delta_longitude / 2) ** 2
+        )
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    @classmethod
+    def from_file(cls, path: str | PathLike, encoding: str = "utf-8") -> "Gazetteer":
+        """Lê um CSV com as colunas location, latitude e longitude."""
+        with open(path, newline="", encoding=encoding) as file:
+            return cls(
+                (row["location"], row["latitude"], row["longitude"])
+                for row in csv.DictReader(file)
+            )
+
+    def distance_km(self, first_location_id: int, second_location_id: int) -> float | None:
+        """Distância entre duas localizações; None se alguma não estiver no gazetteer."""
+        first = self._index.get(first_location_id)
+        second = self._index.get(second_location_id)
+        if first is None or second is None:
+            return None
+        return self._distances[first * self._size + second]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        """Retorna uma representação legível do objeto."""
+        return f"Gazetteer(locations={self._size})"
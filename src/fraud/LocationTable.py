@@ -0,0 +1,45 @@
+import threading
+
+
+class LocationTable:
+    """
+    Dicionário de localizações internadas em ids inteiros pequenos.
+
+    Cada nome distinto é armazenado uma única vez; transações, históricos e a
+    lista de bloqueio passam a comparar e guardar apenas o id.
+    """
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._names: list[str] = []
+        self._lock = threading.Lock()
+
+    def intern(self, location: str) -> int:
+        """Retorna o id da localização, registrando-a se ainda não existir."""
+        location_id = self._ids.get(location)
+        if location_id is None:
+            with self._lock:
+                location_id = self._ids.get(location)
+                if location_id is None:
+                    location_id = len(self._names)
+                    self._names.append(location)
+                    self._ids[location] = location_id
+        return location_id
+
+    def lookup(self, location: str) -> int | None:
+        """Retorna o id da localização sem registrá-la."""
+        return self._ids.get(location)
+
+    def name(self, location_id: int) -> str:
+        """Retorna o nome associado ao id."""
+        return self._names[location_id]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        """Retorna uma representação legível do objeto."""
+        return f"LocationTable(size={len(self._names)})"
+
+
+# Tabela compartilhada por todas as transações do processo
+LOCATIONS = LocationTable()
@@ -0,0 +1,174 @@
+import mmap
+import struct
+from collections.abc import Container, Iterable, Iterator
+from itertools import repeat
+from os import PathLike
+import numpy as np
+from src.fraud.LocationTable import LOCATIONS
+from src.fraud.Transaction import Transaction
+from src.fraud.TransactionLog import TransactionRecord
+
+# Layout (little-endian):
+#   cabeçalho de 32 bytes: magic, número de registros, offset das tabelas, flags
+#   registros de 24 bytes: valor (f8), timestamp em µs (i8), id da localização (u4), id da conta (u4)
+#   tabelas de strings: localizações e contas, cada uma com u4 de contagem seguido
+#   de entradas u4 (tamanho) + bytes UTF-8
+MAGIC = b"TXHIST01"
+HEADER = struct.Struct("<8sQQI4x")
+RECORD_DTYPE = np.dtype([
+    ("amount", "<f8"),
+    ("timestamp", "<i8"),
+    ("location_id", "<u4"),
+    ("account_id", "<u4"),
+])
+FLAG_SORTED = 1
+_U32 = struct.Struct("<I")
+
+
+def _write_table(file, names: list[str]) -> None:
+    file.write(_U32.pack(len(names)))
+    for name in names:
+        encoded = name.encode("utf-8")
+        file.write(_U32.pack(len(encoded)))
+        file.write(encoded)
+
+
+def _read_table(buffer, offset: int) -> tuple[list[str], int]:
+    (count,) = _U32.unpack_from(buffer, offset)
+    offset += _U32.size
+    names = []
+    for _ in range(count):
+        (length,) = _U32.unpack_from(buffer, offset)
+        offset += _U32.size
+        names.append(bytes(buffer[offset:offset + length]).decode("utf-8"))
+        offset += length
+    return names, offset
+
+
+class MappedTransactionHistory:
+    """
+    Histórico de transações em formato binário, lido via mmap.
+
+    Os registros têm largura fixa e são expostos como vistas NumPy sobre o
+    mapeamento (sem cópia), de modo que abrir um arquivo grande é praticamente
+    instantâneo e vários processos compartilham as mesmas páginas em cache.
+    Pode ser passado a check_for_fraud como histórico e suas colunas
+    alimentam check_for_fraud_batch com timestamp_unit="us". A coluna
+    location_ids usa os ids locais do arquivo (índices de locations). A tabela
+    de contas só é decodificada no primeiro acesso a accounts.
+    """
+    def __init__(self, path: str | PathLike):
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, tables_offset, flags = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} não é um histórico de transações válido")
+        self.is_sorted = bool(flags & FLAG_SORTED)
+        self.records = np.frombuffer(self._mmap, dtype=RECORD_DTYPE, count=count, offset=HEADER.size)
+        self.amounts = self.records["amount"]
+        self.timestamps = self.records["timestamp"]
+        self.location_ids = self.records["location_id"]
+        self.account_ids = self.records["account_id"]
+        self.locations, self._accounts_offset = _read_table(self._mmap, tables_offset)
+        self._accounts: list[str] | None = None
+        # Traduz os ids locais do arquivo para os ids da tabela global
+        self._global_location_ids = [LOCATIONS.intern(location) for location in self.locations]
+
+    @property
+    def accounts(self) -> list[str]:
+        """Nomes das contas, indexados pela coluna account_ids."""
+        if self._accounts is None:
+            self._accounts, _ = _read_table(self._mmap, self._accounts_offset)
+        return self._accounts
+
+    @staticmethod
+    def write(
+        path: str | PathLike,
+        transactions: Iterable[Transaction],
+        account_ids: Iterable[str] | None = None,
+    ) -> int:
+        """
+        Grava as transações no formato binário, em streaming, e retorna quantos
+        registros foram escritos. Sem account_ids, todas pertencem à conta "".
+        """
+        if account_ids is None:
+            account_ids = repeat("")
+        locations: dict[str, int] = {}
+        accounts: dict[str, int] = {}
+        record = struct.Struct("<dqII")
+        count = 0
+        is_sorted = True
+        previous = None
+        with open(path, "wb") as file:
+            file.write(b"\0" * HEADER.size)
+            for transaction, account_id in zip(transactions, account_ids):
+                epoch_us = transaction.epoch_us
+                if previous is not None and epoch_us < previous:
+                    is_sorted = False
+                previous = epoch_us
+                location_id = locations.setdefault(transaction.location, len(locations))
+                account = accounts.setdefault(account_id, len(accounts))
+                file.write(record.pack(transaction.amount, epoch_us, location_id, account))
+                count += 1
+            tables_offset = file.tell()
+            _write_table(file, list(locations))
+            _write_table(file, list(accounts))
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, count, tables_offset, FLAG_SORTED if is_sorted else 0))
+        return count
+
+    def count_since(self, cutoff_us: int) -> int:
+        """
+        Conta os registros com timestamp >= cutoff_us: O(log n) por busca
+        binária se o arquivo está ordenado, senão uma varredura vetorizada.
+        """
+        if not self.is_sorted:
+            return int(np.count_nonzero(self.timestamps >= cutoff_us))
+        return len(self.timestamps) - int(np.searchsorted(self.timestamps, cutoff_us, side="left"))
+
+    def location_ids_in(self, blacklisted_locations: Container[str]) -> set[int]:
+        """Ids das localizações bloqueadas, para uso com as colunas de ids."""
+        return {
+            location_id
+            for location_id, location in enumerate(self.locations)
+            if location in blacklisted_locations
+        }
+
+    def _record(self, position: int) -> TransactionRecord:
+        amount, timestamp, location_id, _ = self.records[position].item()
+        return TransactionRecord(amount, timestamp, self._global_location_ids[location_id])
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index: int) -> TransactionRecord:
+        if index < 0:
+            index += len(self.records)
+        if not 0 <= index < len(self.records):
+            raise IndexError("Índice fora do histórico")
+        return self._record(index)
+
+    def __iter__(self) -> Iterator[TransactionRecord]:
+        for position in range(len(self.records)):
+            yield self._record(position)
+
+    def close(self) -> None:
+        """Libera o mapeamento; vistas obtidas fora do objeto devem ter sido descartadas."""
+        self.records = self.amounts = self.timestamps = None
+        self.location_ids = self.account_ids = None
+        self._mmap.close()
+
+    def __reduce__(self):
+        # Outros processos reabrem o arquivo e compartilham o page cache
+        return (MappedTransactionHistory, (self.path,))
+
+    def __enter__(self) -> "MappedTransactionHistory":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        """Retorna uma representação legível do objeto."""
+        return f"MappedTransactionHistory(path='{self.path}', size={len(self)})"
@@ -0,0 +1,85 @@
+from collections.abc import Iterable
+from src.fraud.FraudCheckResult import FraudCheckResult
+from src.fraud.FraudRule import (
+    BlacklistRule,
+    FraudContext,
+    FraudRule,
+    HighAmountRule,
+    LocationChangeRule,
+    RuleOutcome,
+    VelocityRule,
+)
+from src.fraud.RuleMetrics import RuleMetrics
+
+
+def default_rules() -> list[FraudRule]:
+    """As quatro regras originais do FraudDetectionSystem."""
+    return [HighAmountRule(), VelocityRule(), LocationChangeRule(), BlacklistRule()]
+
+
+class RuleEngine:
+    """
+    Avalia um conjunto de regras em ordem de custo, com curto-circuito.
+
+    Como os efeitos das regras são comutativos (flags só são ligadas, pontuações
+    somadas e a pontuação imposta é a maior), a ordem de avaliação não altera o
+    resultado. O plano executa primeiro as regras baratas e as que impõem
+    pontuação, e pula as que não podem mais mudar o resultado; por exemplo, em
+    uma localização bloqueada a varredura da regra de velocidade é evitada.
+    Com metrics definido, cada avaliação é instrumentada por regra.
+    """
+    def __init__(
+        self,
+        rules: Iterable[FraudRule] | None = None,
+        metrics: RuleMetrics | None = None,
+    ):
+        self._rules: list[FraudRule] = list(default_rules() if rules is None else rules)
+        self._plan: list[FraudRule] | None = None
+        self._observers: list[FraudRule] | None = None
+        self.metrics = metrics
+
+    def register(self, rule: FraudRule) -> None:
+        """Adiciona uma regra ao motor."""
+        self._rules.append(rule)
+        self._plan = None
+        self._observers = None
+
+    @property
+    def rules(self) -> list[FraudRule]:
+        return list(self._rules)
+
+    def plan(self) -> list[FraudRule]:
+        """Ordem de execução: menor custo primeiro; em empate, regras decisivas antes."""
+        if self._plan is None:
+            self._plan = sorted(
+                self._rules, key=lambda rule: (rule.cost, rule.score_override is None)
+            )
+        return self._plan
+
+    def observers(self) -> list[FraudRule]:
+        """Regras que mantêm estado por conta."""
+        if self._observers is None:
+            self._observers = [rule for rule in self._rules if rule.stateful]
+        return self._observers
+
+    def observe(self, account_state, transaction) -> None:
+        """Repassa a transação processada às regras com estado."""
+        for rule in self.observers():
+            rule.observe(account_state, transaction)
+
+    def evaluate(self, context: FraudContext) -> FraudCheckResult:
+        outcome = RuleOutcome()
+        metrics = self.metrics
+        if metrics is None:
+            for rule in self.plan():
+                if outcome.can_change(rule) and rule.matches(context):
+                    rule.apply(outcome)
+            return outcome.to_result()
+
+        metrics.record_check()
+        for rule in self.plan():
+            if not outcome.can_change(rule):
+                metrics.record_skip(rule)
+            elif metrics.measure(rule, context):
+                rule.apply(outcome)
+        return outcome.to_result()
@@ -0,0 +1,94 @@
+import threading
+import time
+from src.fraud.FraudRule import FraudContext, FraudRule
+
+
+class RuleStats:
+    """Contadores acumulados de uma regra."""
+    __slots__ = ("wall_time", "invocations", "hits", "skipped", "history_scanned")
+
+    def __init__(self):
+        self.wall_time = 0.0
+        self.invocations = 0
+        self.hits = 0
+        self.skipped = 0
+        self.history_scanned = 0
+
+    def as_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class RuleMetrics:
+    """
+    Instrumentação por regra de um RuleEngine: tempo de parede, invocações,
+    disparos, avaliações evitadas por curto-circuito e elementos do histórico
+    examinados. Só tem custo quando associada a um motor.
+    """
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.checks = 0
+        self._rules: dict[str, RuleStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, rule: FraudRule) -> RuleStats:
+        stats = self._rules.get(rule.name)
+        if stats is None:
+            stats = self._rules.setdefault(rule.name, RuleStats())
+        return stats
+
+    def measure(self, rule: FraudRule, context: FraudContext) -> bool:
+        """Avalia a regra registrando tempo, disparo e varredura do histórico."""
+        scanned_before = context.history_scanned
+        started = self.clock()
+        hit = rule.matches(context)
+        elapsed = self.clock() - started
+        with self._lock:
+            stats = self._stats(rule)
+            stats.wall_time += elapsed
+            stats.invocations += 1
+            stats.hits += hit
+            stats.history_scanned += context.history_scanned - scanned_before
+        return hit
+
+    def record_skip(self, rule: FraudRule) -> None:
+        with self._lock:
+            self._stats(rule).skipped += 1
+
+    def record_check(self) -> None:
+        with self._lock:
+            self.checks += 1
+
+    def snapshot(self) -> dict:
+        """Retorna uma cópia dos contadores em um dicionário."""
+        with self._lock:
+            return {
+                "checks": self.checks,
+                "rules": {name: stats.as_dict() for name, stats in self._rules.items()},
+            }
+
+    def to_prometheus(self, prefix: str = "fraud") -> str:
+        """Exporta os contadores no formato de texto do Prometheus."""
+        snapshot = self.snapshot()
+        series = (
+            ("rule_seconds_total", "wall_time", "Tempo gasto avaliando a regra, em segundos."),
+            ("rule_invocations_total", "invocations", "Avaliações da regra."),
+            ("rule_hits_total", "hits", "Avaliações em que a regra disparou."),
+            ("rule_skipped_total", "skipped", "Avaliações evitadas por curto-circuito."),
+            ("rule_history_scanned_total", "history_scanned", "Elementos do histórico examinados."),
+        )
+        lines = [
+            f"# HELP {prefix}_checks_total Verificações de fraude avaliadas.",
+            f"# TYPE {prefix}_checks_total counter",
+            f"{prefix}_checks_total {snapshot['checks']}",
+        ]
+        for metric, field, description in series:
+            lines.append(f"# HELP {prefix}_{metric} {description}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for name, stats in sorted(snapshot["rules"].items()):
+                lines.append(f'{prefix}_{metric}{{rule="{name}"}} {stats[field]}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checks = 0
+            self._rules.clear()
@@ -0,0 +1,249 @@
+import multiprocessing
+import queue
+from collections.abc import Hashable, Iterable
+import numpy as np
+from src.fraud.BlacklistIndex import BlacklistIndex
+from src.fraud.FraudBatchResult import FraudBatchResult
+from src.fraud.FraudDetectionStream import FraudDetectionStream
+from src.fraud.Transaction import Transaction
+
+# Bits do array de flags devolvido pelos trabalhadores
+FRAUDULENT, BLOCKED, VERIFICATION = 1, 2, 4
+
+
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def _mix(hashes: np.ndarray) -> np.ndarray:
+    """Finalizador do splitmix64: espalha os bits antes do módulo."""
+    hashes = (hashes ^ (hashes >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    hashes = (hashes ^ (hashes >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return hashes ^ (hashes >> np.uint64(31))
+
+
+def account_hashes(account_ids: np.ndarray) -> np.ndarray:
+    """
+    Hash estável (entre execuções e processos) de um array de contas, vetorizado.
+
+    Inteiros usam o próprio valor; textos usam FNV-1a sobre os code points,
+    ignorando o preenchimento de zeros do dtype, de modo que a mesma conta tem
+    o mesmo hash qualquer que seja a largura do array. Outros tipos são
+    convertidos em texto.
+    """
+    if account_ids.dtype.kind in "iu":
+        return _mix(account_ids.astype(np.int64).view(np.uint64))
+    if account_ids.dtype.kind == "O":
+        return np.fromiter((_account_hash(account) for account in account_ids.tolist()),
+                           dtype=np.uint64, count=len(account_ids))
+    if account_ids.dtype.kind != "U":
+        account_ids = account_ids.astype(str)
+    width = account_ids.dtype.itemsize // 4
+    code_points = np.ascontiguousarray(account_ids).view(np.uint32).reshape(len(account_ids), width)
+    hashes = np.full(len(account_ids), _FNV_OFFSET, dtype=np.uint64)
+    for column in code_points.T:
+        hashes = np.where(column != 0, (hashes ^ column) * _FNV_PRIME, hashes)
+    return _mix(hashes)
+
+
+def _account_hash(account_id: Hashable) -> np.uint64:
+    if isinstance(account_id, (int, np.integer)) and not isinstance(account_id, bool) \
+            and _INT64_MIN <= account_id <= _INT64_MAX:
+        return account_hashes(np.array([account_id], dtype=np.int64))[0]
+    return account_hashes(np.array([str(account_id)]))[0]
+
+
+def _run_shard(blacklisted_locations, inbox, outbox) -> None:
+    """
+    Laço de um processo trabalhador: mantém as janelas das contas do seu shard.
+
+    Cada mensagem é um bloco em colunas (posições, contas, valores, epoch_us e
+    localizações) avaliado com process_batch, e a resposta são dois arrays,
+    flags (bits FRAUDULENT/BLOCKED/VERIFICATION) e score, mais as exceções das
+    linhas que falharam, por posição. Uma linha com erro não altera o estado
+    da conta nem impede as demais linhas do bloco.
+    """
+    stream = FraudDetectionStream(blacklisted_locations)
+    while (message := inbox.get()) is not None:
+        positions, account_ids, amounts, epoch_us, locations = message
+        try:
+            flags = np.zeros(len(positions), dtype=np.uint8)
+            scores = np.zeros(len(positions), dtype=np.int32)
+            errors = {}
+            rows, events = [], []
+            for row, (account_id, amount, timestamp, location) in enumerate(zip(
+                account_ids.tolist(), amounts.tolist(), epoch_us.tolist(), locations.tolist()
+            )):
+                try:
+                    events.append((account_id, Transaction.from_epoch(amount, timestamp, location)))
+                    rows.append(row)
+                except Exception as error:
+                    errors[row] = error
+            for row, result in zip(rows, stream.process_batch(events)):
+                if isinstance(result, Exception):
+                    errors[row] = result
+                    continue
+                flags[row] = (
+                    result.is_fraudulent * FRAUDULENT
+                    | result.is_blocked * BLOCKED
+                    | result.verification_required * VERIFICATION
+                )
+                scores[row] = result.risk_score
+        except Exception as error:  # falha do bloco inteiro, devolvida ao processo principal
+            outbox.put((positions, error))
+        else:
+            errors = {int(positions[row]): error for row, error in errors.items()}
+            outbox.put((positions, (flags, scores, errors)))
+
+
+class ShardedFraudDetectionSystem:
+    """
+    Distribui a verificação de fraudes entre processos, particionando por conta.
+
+    Cada conta é sempre atribuída ao mesmo trabalhador, que mantém sua própria
+    janela com estado (FraudDetectionStream); como cada fila é FIFO, a ordem das
+    transações de uma conta é preservada. O processo principal só faz trabalho
+    vetorizado: calcula o shard de cada linha com account_hashes, particiona
+    blocos em colunas e espalha os resultados compactados na ordem de entrada.
+    A lista de bloqueio é copiada para os trabalhadores na criação do pool.
+    """
+    def __init__(
+        self,
+        blacklisted_locations: BlacklistIndex | list[str],
+        workers: int | None = None,
+        chunk_size: int = 16384,
+        max_pending_chunks: int = 64,
+        poll_interval: float = 1.0,
+    ):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self.max_pending_chunks = max_pending_chunks
+        self.poll_interval = poll_interval
+        context = multiprocessing.get_context()
+        self._inboxes = [context.Queue() for _ in range(self.workers)]
+        self._outbox = context.Queue()
+        self._processes = [
+            context.Process(
+                target=_run_shard,
+                args=(blacklisted_locations, inbox, self._outbox),
+                daemon=True,
+            )
+            for inbox in self._inboxes
+        ]
+        for process in self._processes:
+            process.start()
+
+    def shard_of(self, account_id: Hashable) -> int:
+        """Retorna o trabalhador responsável pela conta (estável entre execuções)."""
+        return int(_account_hash(account_id) % np.uint64(self.workers))
+
+    def score(self, events: Iterable[tuple[Hashable, Transaction]]) -> FraudBatchResult:
+        """
+        Avalia pares (conta, transação) e retorna os resultados na ordem de
+        entrada; as transações com erro ficam em FraudBatchResult.errors.
+        """
+        accounts, amounts, epoch_us, locations = [], [], [], []
+        for account_id, transaction in events:
+            accounts.append(account_id)
+            amounts.append(transaction.amount)
+            epoch_us.append(transaction.epoch_us)
+            locations.append(transaction.location)
+        return self.score_columns(accounts, amounts, epoch_us, locations)
+
+    def score_columns(
+        self,
+        account_ids: Iterable[Hashable],
+        amounts: Iterable[float],
+        epoch_us: Iterable[int],
+        locations: Iterable[str],
+    ) -> FraudBatchResult:
+        """
+        Avalia transações em colunas (conta, valor, instante em µs e nome da
+        localização) e retorna os resultados na ordem de entrada.
+
+        Uma transação inválida (fora de ordem, localização inválida) não
+        interrompe o lote nem altera o estado da conta: sua exceção fica em
+        FraudBatchResult.errors, na posição dela. Só uma falha do trabalhador
+        fora da avaliação das linhas é lançada.
+        """
+        account_ids = np.asarray(account_ids)
+        amounts = np.asarray(amounts, dtype=np.float64)
+        epoch_us = np.asarray(epoch_us, dtype=np.int64)
+        locations = np.asarray(locations, dtype=str)
+        size = len(account_ids)
+        if not (len(amounts) == len(epoch_us) == len(locations) == size):
+            raise ValueError("Todas as colunas devem ter o mesmo tamanho")
+
+        flags = np.zeros(size, dtype=np.uint8)
+        scores = np.zeros(size, dtype=np.int32)
+        errors: dict[int, Exception] = {}
+        pending = 0
+        error: Exception | None = None
+        for start in range(0, size, self.chunk_size):
+            stop = min(start + self.chunk_size, size)
+            for shard, message in self._split(
+                account_ids[start:stop], amounts[start:stop], epoch_us[start:stop],
+                locations[start:stop], start,
+            ):
+                self._inboxes[shard].put(message)
+                pending += 1
+            # Limita o volume em trânsito para manter a memória constante
+            while pending > self.max_pending_chunks:
+                error = self._collect(flags, scores, errors) or error
+                pending -= 1
+
+        while pending:
+            error = self._collect(flags, scores, errors) or error
+            pending -= 1
+
+        if error is not None:
+            raise error
+        return FraudBatchResult(
+            (flags & FRAUDULENT).astype(bool),
+            (flags & BLOCKED).astype(bool),
+            (flags & VERIFICATION).astype(bool),
+            scores.astype(np.int64),
+            dict(sorted(errors.items())),
+        )
+
+    def _split(self, account_ids, amounts, epoch_us, locations, offset: int):
+        """Particiona um bloco por shard, gerando (shard, mensagem) para cada shard não vazio."""
+        row_shards = (account_hashes(account_ids) % np.uint64(self.workers)).astype(np.int64)
+        order = np.argsort(row_shards, kind="stable")
+        bounds = np.searchsorted(row_shards[order], np.arange(self.workers + 1))
+        for shard in range(self.workers):
+            rows = order[bounds[shard]:bounds[shard + 1]]
+            if len(rows):
+                yield shard, (rows + offset, account_ids[rows], amounts[rows], epoch_us[rows], locations[rows])
+
+    def _collect(self, flags: np.ndarray, scores: np.ndarray, errors: dict[int, Exception]) -> Exception | None:
+        while True:
+            try:
+                positions, outcome = self._outbox.get(timeout=self.poll_interval)
+                break
+            except queue.Empty:
+                for shard, process in enumerate(self._processes):
+                    if not process.is_alive():
+                        raise RuntimeError(
+                            f"O trabalhador {shard} terminou inesperadamente (código {process.exitcode})"
+                        )
+        if isinstance(outcome, Exception):
+            return outcome
+        flags[positions], scores[positions], row_errors = outcome
+        errors.update(row_errors)
+        return None
+
+    def close(self) -> None:
+        """Encerra os processos trabalhadores."""
+        for inbox, process in zip(self._inboxes, self._processes):
+            if process.is_alive():
+                inbox.put(None)
+        for process in self._processes:
+            process.join()
+
+    def __enter__(self) -> "ShardedFraudDetectionSystem":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,62 @@
+import mmap
+from collections.abc import Iterable
+from os import PathLike
+
+
+class SortedKeyFile:
+    """
+    Conjunto exato de chaves em um arquivo de texto ordenado (uma por linha),
+    consultado por busca binária sobre um mmap, sem carregar o arquivo.
+    """
+    def __init__(self, path: str | PathLike):
+        self.path = path
+        self._mmap: mmap.mmap | None = None
+        with open(path, "rb") as file:
+            # Arquivos vazios não podem ser mapeados
+            if file.seek(0, 2):
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def write(path: str | PathLike, keys: Iterable[str]) -> int:
+        """Grava as chaves distintas, ordenadas pelos bytes UTF-8, e retorna quantas foram gravadas."""
+        encoded = sorted({key.encode("utf-8") for key in keys})
+        with open(path, "wb") as file:
+            for key in encoded:
+                file.write(key + b"\n")
+        return len(encoded)
+
+    def _line_at(self, offset: int) -> tuple[int, bytes]:
+        """Retorna o início e o conteúdo da primeira linha que começa em offset ou depois."""
+        mapped = self._mmap
+        if offset > 0:
+            offset = mapped.find(b"\n", offset - 1) + 1
+            if offset == 0:
+                return len(mapped), b""
+        end = mapped.find(b"\n", offset)
+        if end < 0:
+            end = len(mapped)
+        return offset, mapped[offset:end]
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str) or self._mmap is None:
+            return False
+        target = key.encode("utf-8")
+        low, high = 0, len(self._mmap)
+        # Invariante: a chave, se existir, começa em uma linha com início em [low, high)
+        while low < high:
+            middle = (low + high) // 2
+            start, line = self._line_at(middle)
+            if start >= high:
+                high = middle
+                continue
+            if line == target:
+                return True
+            if line < target:
+                low = start + len(line) + 1
+            else:
+                high = middle
+        return False
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
@@ -0,0 +1,75 @@
+import threading
+from collections.abc import Container, Iterable
+from os import PathLike
+from src.fraud.BloomFilter import BloomFilter
+from src.fraud.SortedKeyFile import SortedKeyFile
+
+
+class TieredDenyList:
+    """
+    Lista de bloqueio em dois níveis para listas muito grandes.
+
+    Um BloomFilter compacto responde a maioria das consultas (toda resposta
+    negativa é definitiva); apenas as respostas positivas são confirmadas no
+    armazenamento exato, que pode ser um SortedKeyFile em disco ou qualquer
+    contêiner. Os contadores permitem comparar a taxa de falsos positivos
+    observada com a configurada.
+    """
+    def __init__(self, bloom: BloomFilter, exact: Container[str]):
+        self.bloom = bloom
+        self.exact = exact
+        self.lookups = 0
+        self.bloom_positives = 0
+        self.false_positives = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(
+        cls,
+        keys: Iterable[str],
+        bloom_path: str | PathLike,
+        exact_path: str | PathLike,
+        false_positive_rate: float = 0.001,
+    ) -> "TieredDenyList":
+        """Grava o filtro e o arquivo exato a partir das chaves e abre os dois via mmap."""
+        count = SortedKeyFile.write(exact_path, keys)
+        bloom = BloomFilter(count, false_positive_rate)
+        with open(exact_path, encoding="utf-8") as file:
+            bloom.update(line.rstrip("\n") for line in file)
+        bloom.save(bloom_path)
+        return cls.open(bloom_path, exact_path)
+
+    @classmethod
+    def open(cls, bloom_path: str | PathLike, exact_path: str | PathLike) -> "TieredDenyList":
+        return cls(BloomFilter.load(bloom_path), SortedKeyFile(exact_path))
+
+    def __contains__(self, key: object) -> bool:
+        if key not in self.bloom:
+            with self._lock:
+                self.lookups += 1
+            return False
+        confirmed = key in self.exact
+        with self._lock:
+            self.lookups += 1
+            self.bloom_positives += 1
+            self.false_positives += not confirmed
+        return confirmed
+
+    def stats(self) -> dict:
+        """Contadores de consulta e taxas de falsos positivos (configurada e observada)."""
+        with self._lock:
+            negatives = self.lookups - (self.bloom_positives - self.false_positives)
+            return {
+                "lookups": self.lookups,
+                "bloom_positives": self.bloom_positives,
+                "false_positives": self.false_positives,
+                "configured_false_positive_rate": self.bloom.false_positive_rate,
+                "expected_false_positive_rate": self.bloom.expected_false_positive_rate(),
+                "observed_false_positive_rate": self.false_positives / negatives if negatives else 0.0,
+            }
+
+    def close(self) -> None:
+        self.bloom.close()
+        close = getattr(self.exact, "close", None)
+        if close is not None:
+            close()
@@ -1,12 +1,106 @@
 from datetime import datetime
+from src.common.Epoch import from_epoch_us, to_epoch_us
+from src.fraud.LocationTable import LOCATIONS
+
 
 class Transaction:
-    """Representa uma única transação financeira."""
-    def __init__(self, amount: float, timestamp: datetime, location: str):
+    """
+    Representa uma única transação financeira.
+
+    O instante é guardado também em microssegundos desde a época (epoch_us,
+    normalizado para UTC), usado em toda a aritmética de janelas. Os
+    identificadores de estabelecimento e de dispositivo são opcionais.
+    """
+    # Sem __dict__; a localização é guardada como id da tabela global
+    __slots__ = ("amount", "epoch_us", "location_id", "_timestamp", "merchant_id", "device_id")
+
+    def __init__(
+        self,
+        amount: float,
+        timestamp: datetime,
+        location: str,
+        merchant_id: str | None = None,
+        device_id: str | None = None,
+    ):
         self.amount = amount
         self.timestamp = timestamp
-        self.location = location
+        self.location_id = LOCATIONS.intern(location)
+        self.merchant_id = merchant_id
+        self.device_id = device_id
+
+    @classmethod
+    def from_epoch(
+        cls,
+        amount: float,
+        epoch_us: int,
+        location: str,
+        merchant_id: str | None = None,
+        device_id: str | None = None,
+    ) -> "Transaction":
+        """
+        Cria uma transação a partir de microssegundos desde a época, sem criar
+        um datetime (gerado só se timestamp for lido).
+        """
+        if not isinstance(location, str):
+            raise TypeError(f"A localização deve ser o nome (str), recebido {type(location).__name__}")
+        return cls.from_epoch_id(amount, epoch_us, LOCATIONS.intern(location), merchant_id, device_id)
+
+    @classmethod
+    def from_epoch_id(
+        cls,
+        amount: float,
+        epoch_us: int,
+        location_id: int,
+        merchant_id: str | None = None,
+        device_id: str | None = None,
+    ) -> "Transaction":
+        """
+        Como from_epoch, mas com a localização já internada em LOCATIONS. Para
+        uso interno; ids fora da tabela são rejeitados.
+        """
+        if not 0 <= location_id < len(LOCATIONS):
+            raise ValueError(f"Id de localização desconhecido: {location_id}")
+        transaction = cls.__new__(cls)
+        transaction.amount = amount
+        transaction.epoch_us = epoch_us
+        transaction.location_id = location_id
+        transaction._timestamp = None
+        transaction.merchant_id = merchant_id
+        transaction.device_id = device_id
+        return transaction
+
+    @property
+    def timestamp(self) -> datetime:
+        if self._timestamp is None:
+            self._timestamp = from_epoch_us(self.epoch_us)
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, timestamp: datetime) -> None:
+        self._timestamp = timestamp
+        self.epoch_us = to_epoch_us(timestamp)
+
+    @property
+    def location(self) -> str:
+        return LOCATIONS.name(self.location_id)
+
+    @location.setter
+    def location(self, location: str) -> None:
+        self.location_id = LOCATIONS.intern(location)
+
+    def __reduce__(self):
+        # A localização viaja pelo nome: os ids de LOCATIONS só valem no processo
+        return (_restore_transaction, (
+            self.amount, self.epoch_us, self.location,
+            self.merchant_id, self.device_id, self._timestamp,
+        ))
 
     def __repr__(self) -> str:
         """Retorna uma representação legível do objeto."""
-        return f"Transaction(amount={self.amount}, timestamp='{self.timestamp}', location='{self.location}')"
\ No newline at end of file
+        return f"Transaction(amount={self.amount}, timestamp='{self.timestamp}', location='{self.location}')"
+
+
+def _restore_transaction(amount, epoch_us, location, merchant_id, device_id, timestamp):
+    transaction = Transaction.from_epoch(amount, epoch_us, location, merchant_id, device_id)
+    transaction._timestamp = timestamp
+    return transaction
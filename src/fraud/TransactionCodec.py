@@ -0,0 +1,41 @@
+from collections.abc import Hashable
+from datetime import datetime
+from src.fraud.FraudCheckResult import FraudCheckResult
+from src.fraud.Transaction import Transaction
+
+# Campos de um FraudCheckResult, na ordem usada pelas saídas tabulares
+RESULT_FIELDS = ("is_fraudulent", "is_blocked", "verification_required", "risk_score")
+
+
+def parse_transaction(payload: dict) -> tuple[Hashable, Transaction]:
+    """
+    Converte um objeto JSON ou linha CSV em (conta, transação). O instante vem
+    em "timestamp" (ISO 8601) ou em "epoch_us" (inteiro), que evita criar datetime.
+    A localização é sempre tratada como nome, nunca como id de LOCATIONS.
+    """
+    location = str(payload["location"])
+    epoch_us = payload.get("epoch_us")
+    merchant_id = payload.get("merchant_id") or None
+    device_id = payload.get("device_id") or None
+    if epoch_us not in (None, ""):
+        transaction = Transaction.from_epoch(
+            float(payload["amount"]), int(epoch_us), location, merchant_id, device_id
+        )
+    else:
+        transaction = Transaction(
+            amount=float(payload["amount"]),
+            timestamp=datetime.fromisoformat(payload["timestamp"]),
+            location=location,
+            merchant_id=merchant_id,
+            device_id=device_id,
+        )
+    account_id = payload.get("account_id")
+    # A conta vira chave de dicionário e de particionamento: só texto ou inteiro
+    if isinstance(account_id, bool) or not isinstance(account_id, (str, int)):
+        raise TypeError(f"account_id deve ser texto ou inteiro, recebido {type(account_id).__name__}")
+    return account_id, transaction
+
+
+def result_to_dict(result: FraudCheckResult) -> dict:
+    """Converte um FraudCheckResult em um objeto serializável em JSON."""
+    return {field: getattr(result, field) for field in RESULT_FIELDS}
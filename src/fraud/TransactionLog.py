@@ -0,0 +1,133 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import NamedTuple
+from src.common.Epoch import from_epoch_us, to_epoch_us
+from src.fraud.LocationTable import LOCATIONS
+from src.fraud.Transaction import Transaction
+
+
+class TransactionRecord(NamedTuple):
+    """Registro leve de uma transação lida de um TransactionLog."""
+    amount: float
+    epoch_us: int
+    location_id: int
+
+    @property
+    def timestamp(self) -> datetime:
+        return from_epoch_us(self.epoch_us)
+
+    @property
+    def location(self) -> str:
+        return LOCATIONS.name(self.location_id)
+
+
+class TransactionLog:
+    """
+    Histórico compacto de transações armazenado em arrays tipados.
+
+    Cada transação ocupa 20 bytes (valor, timestamp em microssegundos e id da
+    localização na tabela global LOCATIONS), em vez de um objeto Transaction com datetime e str
+    próprios. As transações devem ser anexadas em ordem cronológica, o que
+    permite fatiar por intervalo de tempo e contar a janela da última hora por
+    busca binária. Fatias são vistas somente leitura que compartilham os arrays.
+    """
+    def __init__(self, transactions: Iterable[Transaction] = ()):
+        self._amounts = array("d")
+        self._timestamps = array("q")
+        self._location_ids = array("I")
+        # Limites da vista; _stop None acompanha o final do log
+        self._start = 0
+        self._stop: int | None = None
+        for transaction in transactions:
+            self.append(transaction)
+
+    def _bounds(self) -> tuple[int, int]:
+        stop = len(self._timestamps) if self._stop is None else self._stop
+        return self._start, stop
+
+    def _view(self, start: int, stop: int) -> "TransactionLog":
+        view = TransactionLog.__new__(TransactionLog)
+        view.__dict__.update(self.__dict__)
+        view._start = start
+        view._stop = stop
+        return view
+
+    def append(self, transaction: Transaction) -> None:
+        """Anexa uma transação ao final do log."""
+        self.append_values(
+            transaction.amount, transaction.epoch_us, transaction.location_id
+        )
+
+    def append_values(self, amount: float, epoch_us: int, location: str | int) -> None:
+        """
+        Anexa uma transação a partir de valores brutos, sem criar objetos. A
+        localização pode ser o nome ou o id já internado em LOCATIONS; ids
+        fora da tabela são rejeitados, como em Transaction.from_epoch_id.
+        """
+        if self._stop is not None:
+            raise ValueError("Vistas de um TransactionLog são somente leitura")
+        timestamps = self._timestamps
+        if timestamps and epoch_us < timestamps[-1]:
+            raise ValueError("Transações devem ser anexadas em ordem cronológica")
+
+        if isinstance(location, str):
+            location_id = LOCATIONS.intern(location)
+        elif isinstance(location, int) and not isinstance(location, bool):
+            if not 0 <= location < len(LOCATIONS):
+                raise ValueError(f"Id de localização desconhecido: {location}")
+            location_id = location
+        else:
+            raise TypeError(
+                f"A localização deve ser um nome ou um id de LOCATIONS, não {type(location).__name__}"
+            )
+
+        self._amounts.append(amount)
+        timestamps.append(epoch_us)
+        self._location_ids.append(location_id)
+
+    def between(self, start: datetime, end: datetime) -> "TransactionLog":
+        """Retorna uma vista das transações com start <= timestamp < end."""
+        lo, hi = self._bounds()
+        first = bisect_left(self._timestamps, to_epoch_us(start), lo, hi)
+        last = bisect_left(self._timestamps, to_epoch_us(end), first, hi)
+        return self._view(first, last)
+
+    def count_since(self, cutoff_us: int) -> int:
+        """Conta as transações com timestamp >= cutoff_us em O(log n)."""
+        lo, hi = self._bounds()
+        return hi - bisect_left(self._timestamps, cutoff_us, lo, hi)
+
+    def _record(self, position: int) -> TransactionRecord:
+        return TransactionRecord(
+            self._amounts[position],
+            self._timestamps[position],
+            self._location_ids[position],
+        )
+
+    def __len__(self) -> int:
+        lo, hi = self._bounds()
+        return hi - lo
+
+    def __getitem__(self, index: int | slice) -> "TransactionRecord | TransactionLog":
+        lo, hi = self._bounds()
+        if isinstance(index, slice):
+            start, stop, step = index.indices(hi - lo)
+            if step != 1:
+                raise ValueError("Fatias de um TransactionLog não aceitam passo")
+            return self._view(lo + start, lo + max(start, stop))
+        if index < 0:
+            index += hi - lo
+        if not 0 <= index < hi - lo:
+            raise IndexError("Índice fora do TransactionLog")
+        return self._record(lo + index)
+
+    def __iter__(self) -> Iterator[TransactionRecord]:
+        lo, hi = self._bounds()
+        for position in range(lo, hi):
+            yield self._record(position)
+
+    def __repr__(self) -> str:
+        """Retorna uma representação legível do objeto."""
+        return f"TransactionLog(size={len(self)})"
@@ -0,0 +1,122 @@
+import csv
+import json
+import time
+from collections.abc import Iterable, Iterator
+from typing import IO, Callable
+from src.fraud.AccountStateManager import AccountStateManager
+from src.fraud.AccountWindow import STATE_TTL_US
+from src.fraud.BlacklistIndex import BlacklistIndex
+from src.fraud.FraudDetectionStream import FraudDetectionStream
+from src.fraud.TransactionCodec import RESULT_FIELDS, parse_transaction, result_to_dict
+from src.metrics.LatencyRecorder import LatencyRecorder
+
+OUTPUT_FIELDS = ("id", "account_id", "timestamp") + RESULT_FIELDS + ("error",)
+
+
+def read_rows(file: IO[str], file_format: str) -> Iterator[dict | str]:
+    """
+    Lê linhas de um arquivo CSV (com cabeçalho) ou JSONL, uma por vez. As
+    linhas JSONL são entregues como texto e decodificadas em
+    TransactionReplay.run, onde uma linha corrompida vira uma linha de erro.
+    """
+    if file_format == "csv":
+        yield from csv.DictReader(file)
+    elif file_format == "jsonl":
+        for line in file:
+            if line.strip():
+                yield line
+    else:
+        raise ValueError(f"Formato desconhecido: {file_format}")
+
+
+def row_writer(file: IO[str], file_format: str) -> Callable[[dict], None]:
+    """Retorna uma função que grava um resultado por vez no formato pedido."""
+    if file_format == "csv":
+        writer = csv.DictWriter(file, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        return writer.writerow
+    if file_format == "jsonl":
+        return lambda row: file.write(json.dumps(row, ensure_ascii=False) + "\n")
+    raise ValueError(f"Formato desconhecido: {file_format}")
+
+
+class TransactionReplay:
+    """
+    Reprocessa um fluxo de transações com o FraudDetectionStream.
+
+    As linhas são lidas e os resultados gravados um a um, e o único estado
+    mantido são as janelas por conta. O relógio do replay é o maior instante
+    já lido; a marca d'água fica max_lateness_us atrás dele, e as contas
+    inativas em relação a ela são descartadas à medida que ele avança, de
+    modo que só as contas ativas ocupam memória. Uma transação anterior à
+    marca d'água vira linha de erro. Com memory_budget, as janelas que não
+    cabem no orçamento vão para o disco (AccountStateManager).
+    """
+    def __init__(
+        self,
+        blacklisted_locations: BlacklistIndex | list[str],
+        memory_budget: int | None = None,
+        max_lateness_us: int = STATE_TTL_US,
+    ):
+        self.state = AccountStateManager(memory_budget)
+        self.stream = FraudDetectionStream(blacklisted_locations, state=self.state)
+        self.max_lateness_us = max_lateness_us
+        self.clock_us: int | None = None
+        self.latency = LatencyRecorder()
+        self.processed = 0
+        self.errors = 0
+
+    def run(self, rows: Iterable[dict | str], write: Callable[[dict], None]) -> dict:
+        """
+        Avalia cada linha (objeto ou texto JSON), grava o resultado e retorna as
+        estatísticas da execução. Qualquer falha numa linha é contada em errors
+        e gravada como linha de erro, sem interromper o processamento.
+        """
+        clock = time.perf_counter
+        started = clock()
+        for row in rows:
+            output = {}
+            before = clock()
+            try:
+                if isinstance(row, str):
+                    row = json.loads(row)
+                output.update(id=row.get("id"), account_id=row.get("account_id"),
+                              timestamp=row.get("timestamp"))
+                account_id, transaction = parse_transaction(row)
+                self._advance(transaction.epoch_us)
+                output.update(result_to_dict(self.stream.process(account_id, transaction)))
+            except Exception as error:
+                output["error"] = str(error)
+                self.errors += 1
+            self.latency.record(clock() - before)
+            self.processed += 1
+            write(output)
+        return self.stats(clock() - started)
+
+    def _advance(self, epoch_us: int) -> None:
+        """Avança o relógio do replay e descarta as contas inativas a cada STATE_TTL_US."""
+        watermark = self.state.watermark_us
+        if watermark is not None and epoch_us < watermark:
+            raise ValueError(
+                "Transação anterior à marca d'água do replay; aumente a tolerância de atraso"
+            )
+        if self.clock_us is None or epoch_us > self.clock_us:
+            self.clock_us = epoch_us
+        advanced = self.clock_us - self.max_lateness_us
+        if watermark is None or advanced - watermark >= STATE_TTL_US:
+            self.state.prune(advanced)
+
+    def close(self) -> None:
+        """Remove o armazenamento em disco das janelas despejadas."""
+        self.state.close()
+
+    def stats(self, elapsed: float) -> dict:
+        """Resume a execução: volume, vazão (tx/s) e percentis de latência."""
+        return {
+            "processed": self.processed,
+            "errors": self.errors,
+            "elapsed": elapsed,
+            "throughput": self.processed / elapsed if elapsed > 0 else 0.0,
+            "latency": self.latency.snapshot(),
+            "state": self.state.stats(),
+        }
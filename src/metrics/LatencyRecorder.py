@@ -0,0 +1,60 @@
+import math
+
+
+class LatencyRecorder:
+    """
+    Histograma de latências com baldes logarítmicos.
+
+    Cada balde cobre um intervalo de largura relativa fixa (precision), então
+    os percentis têm erro relativo limitado e a memória não cresce com o número
+    de amostras. Os valores são registrados em segundos.
+    """
+    def __init__(self, precision: float = 0.01, minimum: float = 1e-7):
+        self.precision = precision
+        self.minimum = minimum
+        self._log_gamma = math.log1p(2 * precision)
+        self._buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Registra uma amostra de latência."""
+        bucket = math.ceil(math.log(max(seconds, self.minimum) / self.minimum) / self._log_gamma)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """Retorna o percentil (fraction entre 0 e 1) das amostras registradas."""
+        if not self.count:
+            return 0.0
+        rank = fraction * (self.count - 1)
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen > rank:
+                # Ponto médio do balde, em escala logarítmica
+                value = self.minimum * math.exp((bucket - 0.5) * self._log_gamma)
+                return min(value, self.max)
+        return self.max
+
+    def snapshot(self) -> dict[str, float]:
+        """Retorna um resumo das latências registradas."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.50),
+            "p90": self.percentile(0.90),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+    def reset(self) -> None:
+        """Descarta todas as amostras."""
+        self._buckets.clear()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
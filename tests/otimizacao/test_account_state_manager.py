@@ -0,0 +1,79 @@
+import pickle
+from datetime import datetime, timedelta
+from src.common.Epoch import to_epoch_us
+from src.fraud.AccountStateManager import AccountStateManager
+from src.fraud.FraudDetectionStream import FraudDetectionStream
+from src.fraud.Transaction import Transaction
+
+START = datetime(2025, 10, 1, 8, 0, 0)
+
+
+def build_traffic(accounts, count):
+    locations = ["Brasil", "Chile"]
+    return [
+        (f"conta-{i % accounts}", Transaction(100, START + timedelta(minutes=i), locations[(i // accounts) % 2]))
+        for i in range(count)
+    ]
+
+
+def as_tuple(result):
+    return (result.is_fraudulent, result.is_blocked, result.verification_required, result.risk_score)
+
+
+def test_CT01_orcamento_despeja_e_recarrega_sem_alterar_resultados():
+    traffic = build_traffic(accounts=20, count=600)
+    unlimited = FraudDetectionStream([])
+    state = AccountStateManager(memory_budget=5_000)
+    limited = FraudDetectionStream([], state=state)
+    for account, transaction in traffic:
+        assert as_tuple(limited.process(account, transaction)) == as_tuple(unlimited.process(account, transaction))
+
+    stats = state.stats()
+    assert stats["memory_used"] <= 5_000 + 2_000
+    assert stats["spills"] > 0 and stats["reloads"] > 0
+    assert stats["evictions"] >= stats["spills"]
+    assert len(limited) == 20
+    state.close()
+
+
+def test_CT02_contas_inativas_sao_descartadas():
+    state = AccountStateManager(memory_budget=3_000)
+    stream = FraudDetectionStream([], state=state)
+    for i in range(5):
+        stream.process(f"fria-{i}", Transaction(1, START, "Brasil"))
+    later = START + timedelta(hours=2)
+    stream.process("ativa", Transaction(1, later, "Brasil"))
+    state.prune(to_epoch_us(later))
+    assert state.stats()["pruned"] == 5
+    assert len(stream) == 1
+    state.close()
+
+
+def test_CT03_transacao_serializada_pelo_nome_da_localizacao():
+    transaction = Transaction(10, START, "Lugar Raro", merchant_id="m-1")
+    restored = pickle.loads(pickle.dumps(transaction))
+    assert restored.location == "Lugar Raro"
+    assert restored.epoch_us == transaction.epoch_us
+    assert restored.merchant_id == "m-1"
+
+
+def test_CT04_ordem_so_por_conta_nao_descarta_janelas():
+    # Cronológico dentro de cada conta, mas não entre contas
+    traffic = [
+        ("a", Transaction(100, START, "Brasil")),
+        ("b", Transaction(100, START + timedelta(days=1), "Brasil")),
+        ("a", Transaction(100, START + timedelta(minutes=5), "Chile")),
+    ]
+    state = AccountStateManager(memory_budget=1_500)
+    limited = FraudDetectionStream([], state=state)
+    unlimited = FraudDetectionStream([])
+    results = [(as_tuple(limited.process(account, transaction)), as_tuple(unlimited.process(account, transaction)))
+               for account, transaction in traffic]
+    assert all(got == expected for got, expected in results)
+    assert results[-1][0][3] == 20
+    assert state.stats()["pruned"] == 0 and state.stats()["spills"] > 0
+
+    # Com a marca d'água informada, o despejo descarta o que ficou inativo antes dela
+    state.prune(to_epoch_us(START + timedelta(days=1)))
+    assert len(limited) == 1
+    state.close()
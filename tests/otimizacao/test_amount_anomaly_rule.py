@@ -0,0 +1,56 @@
+import pickle
+import random
+from datetime import datetime, timedelta
+from src.fraud.AmountSketch import AmountSketch
+from src.fraud.FraudDetectionStream import FraudDetectionStream
+from src.fraud.FraudDetectionSystem import FraudDetectionSystem
+from src.fraud.FraudRule import AmountAnomalyRule
+from src.fraud.RuleEngine import RuleEngine
+from src.fraud.Transaction import Transaction
+
+START = datetime(2025, 10, 1, 0, 0, 0)
+
+
+def test_CT01_sketch_tem_erro_relativo_limitado():
+    rng = random.Random(3)
+    values = sorted(rng.lognormvariate(5, 1) for _ in range(20000))
+    sketch = AmountSketch(relative_accuracy=0.02)
+    for value in values:
+        sketch.add(value)
+    for fraction in (0.5, 0.9, 0.99):
+        exact = values[int(fraction * (len(values) - 1))]
+        assert abs(sketch.quantile(fraction) - exact) / exact < 0.05
+
+
+def test_CT02_memoria_do_sketch_e_limitada():
+    sketch = AmountSketch(max_bins=32)
+    for value in (0.01, 1, 1e3, 1e6, 1e9, 1e12, 0):
+        sketch.add(value)
+    assert sketch.estimated_size() <= 200 + 4 * 32
+    assert sketch.quantile(1.0) > 1e11
+    restored = pickle.loads(pickle.dumps(sketch))
+    assert restored.count == sketch.count
+
+
+def test_CT03_regra_usa_o_historico_da_propria_conta():
+    engine = RuleEngine()
+    engine.register(AmountAnomalyRule(percentile=0.95, min_observations=20))
+    stream = FraudDetectionStream([], FraudDetectionSystem(engine))
+    for i in range(40):
+        small = stream.process("pequena", Transaction(50 + i % 5, START + timedelta(hours=i), "Brasil"))
+        stream.process("grande", Transaction(8000 + i % 5, START + timedelta(hours=i), "Brasil"))
+    assert small.risk_score == 0
+
+    late = START + timedelta(hours=50)
+    unusual = stream.process("pequena", Transaction(900, late, "Brasil"))
+    assert unusual.verification_required is True
+    assert unusual.risk_score == 25
+    usual = stream.process("grande", Transaction(8002, late, "Brasil"))
+    assert usual.risk_score == 0
+
+
+def test_CT04_regra_inativa_sem_estado_de_conta():
+    engine = RuleEngine()
+    engine.register(AmountAnomalyRule(min_observations=0))
+    result = FraudDetectionSystem(engine).check_for_fraud(Transaction(900, START, "Brasil"), [], [])
+    assert result.risk_score == 0
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from src.flight.BatchBookingProcessor import BatchBookingProcessor
+from src.flight.FlightBookingSystem import FlightBookingSystem
+from src.flight.SeatInventory import SeatInventory
+
+BOOKING = datetime(2025, 10, 1, 10, 0, 0)
+
+
+def build_batch(size, seed=3):
+    rng = np.random.default_rng(seed)
+    flights = rng.choice(["AZ1", "AZ2", "AZ3", "LA9", "??"], size)
+    passengers = rng.integers(1, 7, size)
+    departures = [BOOKING + timedelta(hours=int(h)) for h in rng.integers(1, 100, size)]
+    prices = rng.uniform(100, 900, size).round(2)
+    sales = rng.integers(0, 150, size)
+    points = rng.choice([0, 2000], size)
+    return flights, passengers, prices, sales, departures, points
+
+
+def new_system():
+    inventory = SeatInventory()
+    for flight in ("AZ1", "AZ2", "AZ3", "LA9"):
+        inventory.add_flight(flight, 120)
+    return FlightBookingSystem(inventory)
+
+
+def test_CT01_lote_equivale_a_reservas_sequenciais():
+    flights, passengers, prices, sales, departures, points = build_batch(400)
+    batch = BatchBookingProcessor(new_system(), workers=4).process(
+        flights, passengers, BOOKING, prices, sales, departures, points)
+
+    sequential = new_system()
+    for i in range(len(flights)):
+        flight = str(flights[i])
+        if flight not in sequential.inventory:
+            assert not batch.confirmation[i] and batch.seats_remaining[i] == -1
+            continue
+        expected = sequential.reserve_flight(flight, int(passengers[i]), BOOKING, float(prices[i]),
+                                             int(sales[i]), departures[i], int(points[i]))
+        result = batch[i]
+        assert result.confirmation == expected.confirmation
+        assert result.total_price == expected.total_price
+        assert result.points_used == expected.points_used
+        assert result.seats_remaining == expected.seats_remaining
+        assert (result.reservation_id is None) == (expected.reservation_id is None)
+
+
+def test_CT02_estatisticas_do_lote():
+    flights, passengers, prices, sales, departures, points = build_batch(1000)
+    system = new_system()
+    batch = BatchBookingProcessor(system).process(
+        flights, passengers, BOOKING, prices, sales, departures, points)
+    assert batch.stats["requests"] == 1000
+    assert batch.stats["flights"] == 5
+    assert batch.stats["confirmed"] == int(batch.confirmation.sum())
+    assert batch.stats["throughput"] > 0
+    for flight in ("AZ1", "AZ2", "AZ3", "LA9"):
+        sold = int(passengers[(flights == flight) & batch.confirmation].sum())
+        assert sold + system.inventory.remaining(flight) == 120
+    # As reservas do lote podem ser canceladas pelo identificador
+    reservation_id = int(batch.reservation_ids[batch.confirmation][0])
+    flight, seats = system.inventory.reservation(reservation_id)
+    remaining = system.inventory.remaining(flight)
+    assert system.inventory.cancel(reservation_id) == (flight, seats, remaining + seats)
+
+
+def test_CT03_lote_invalido_nao_toca_o_inventario():
+    system = new_system()
+    processor = BatchBookingProcessor(system)
+    with pytest.raises(ValueError):
+        processor.process(["AZ1", "AZ1", "AZ2"], [3, 4, -1], BOOKING, 500.0, 25, BOOKING + timedelta(days=3), 0)
+    with pytest.raises(TypeError):
+        processor.process(["AZ1"], [1.5], BOOKING, 500.0, 25, BOOKING + timedelta(days=3), 0)
+    with pytest.raises(ValueError):
+        processor.process(["AZ1", "AZ2"], [1, 1], BOOKING, [500.0, 1.0, 2.0], 25, BOOKING, 0)
+    assert system.inventory.remaining("AZ1") == 120
+    assert system.inventory.remaining("AZ2") == 120
+
+
+class FailingFlightBookingSystem(FlightBookingSystem):
+    def quote_grid(self, passengers, *args):
+        if (passengers == 7).any():
+            raise RuntimeError("falha de precificação")
+        return super().quote_grid(passengers, *args)
+
+
+def test_CT04_falha_durante_o_lote_devolve_os_assentos():
+    system = FailingFlightBookingSystem(new_system().inventory)
+    with pytest.raises(RuntimeError):
+        BatchBookingProcessor(system, workers=2).process(
+            ["AZ1", "AZ1", "AZ2", "LA9"], [3, 4, 7, 2], BOOKING, 500.0, 25, BOOKING + timedelta(days=3), 0)
+    for flight in ("AZ1", "AZ2", "AZ3", "LA9"):
+        assert system.inventory.remaining(flight) == 120
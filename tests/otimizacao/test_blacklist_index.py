@@ -0,0 +1,34 @@
+from datetime import datetime
+from src.fraud.BlacklistIndex import BlacklistIndex
+from src.fraud.FraudDetectionSystem import FraudDetectionSystem
+from src.fraud.Transaction import Transaction
+
+
+def test_CT01_normaliza_maiusculas_e_espacos():
+    index = BlacklistIndex(["Coreia do  Norte", "  IRÃ "])
+    assert "coreia do norte" in index
+    assert " Coreia   do Norte" in index
+    assert "irã" in index
+    assert "Brasil" not in index
+    assert len(index) == 2
+
+
+def test_CT02_carrega_e_recarrega_de_arquivo(tmp_path):
+    path = tmp_path / "blacklist.txt"
+    path.write_text("# sanções\nIrã\n\nCoreia do Norte\n", encoding="utf-8")
+    index = BlacklistIndex.from_file(path)
+    assert len(index) == 2
+    assert "Irã" in index
+
+    path.write_text("Síria\n", encoding="utf-8")
+    index.reload_from_file(path)
+    assert "Irã" not in index
+    assert "síria" in index
+
+
+def test_CT03_sistema_aceita_indice():
+    fds = FraudDetectionSystem()
+    current = Transaction(100, datetime(2025, 10, 1, 12, 0, 0), "irã")
+    result = fds.check_for_fraud(current, [], BlacklistIndex(["Irã"]))
+    assert result.is_blocked is True
+    assert result.risk_score == 100
@@ -0,0 +1,131 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import pytest
+from src.flight.BookingLedger import BOOKING as BOOKED, BookingLedger, LOG_FILE
+from src.flight.FlightBookingSystem import FlightBookingSystem
+from src.flight.SeatInventory import SeatInventory
+
+BOOKING = datetime(2025, 10, 1, 10, 0, 0)
+DEPARTURE = datetime(2025, 10, 10, 14, 0, 0)
+
+
+def book(ledger, fbs, flight, passengers=1):
+    return reserve(ledger, fbs, flight, passengers)[1]
+
+
+def reserve(ledger, fbs, flight, passengers=1):
+    result = fbs.reserve_flight(flight, passengers, BOOKING, 500.0, 25, DEPARTURE, 0)
+    return result, ledger.record(result, passengers, BOOKING, DEPARTURE)
+
+
+def new_system():
+    inventory = SeatInventory()
+    inventory.add_flight("AZ1", 1000)
+    inventory.add_flight("LA9", 1000)
+    return FlightBookingSystem(inventory)
+
+
+def test_CT01_group_commit_e_recuperacao(tmp_path):
+    fbs = new_system()
+    with BookingLedger(tmp_path) as ledger:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            reserved = list(pool.map(lambda i: reserve(ledger, fbs, "AZ1" if i % 2 else "LA9"), range(400)))
+        sequences = sorted(future.result() for _, future in reserved)
+        assert sequences == list(range(1, 401))
+        assert ledger.stats()["batches"] < 400
+
+        booked, future = reserved[1]
+        cancelled = fbs.cancel_reservation("AZ1", booked.reservation_id, BOOKING, 500.0, 25, DEPARTURE, 0)
+        ledger.record(cancelled, 1, BOOKING, DEPARTURE, booking_id=future.result()).result()
+
+    with BookingLedger(tmp_path) as recovered:
+        assert recovered.stats()["recovered_events"] == 401
+        assert len(recovered.bookings()) == 399
+        assert len(recovered.bookings("AZ1")) + len(recovered.bookings("LA9")) == 399
+        kinds = [event.kind for event in recovered.events()]
+        assert len(kinds) == 401
+        assert book(recovered, fbs, "AZ1").result() == 402
+
+
+def test_CT02_cauda_corrompida_e_truncada(tmp_path):
+    fbs = new_system()
+    with BookingLedger(tmp_path) as ledger:
+        for _ in range(10):
+            book(ledger, fbs, "AZ1")
+        ledger.flush()
+    log_path = os.path.join(tmp_path, LOG_FILE)
+    size = os.path.getsize(log_path)
+    with open(log_path, "r+b") as log:
+        # Simula uma gravação interrompida no meio do último evento
+        log.truncate(size - 5)
+        log.seek(0, os.SEEK_END)
+        log.write(b"\x00garbage")
+
+    with BookingLedger(tmp_path) as recovered:
+        assert recovered.stats()["recovered_events"] == 9
+        assert recovered.stats()["truncated_bytes"] > 0
+        assert book(recovered, fbs, "AZ1").result() == 10
+    with BookingLedger(tmp_path) as reopened:
+        assert len(reopened.bookings()) == 10
+        assert reopened.stats()["truncated_bytes"] == 0
+
+
+def test_CT03_snapshot_limita_a_recuperacao(tmp_path):
+    fbs = new_system()
+    with BookingLedger(tmp_path, snapshot_every=50) as ledger:
+        futures = [book(ledger, fbs, "AZ1") for _ in range(120)]
+        futures[-1].result()
+        ledger.flush()
+        snapshot_sequence = ledger.stats()["snapshot_sequence"]
+        assert snapshot_sequence >= 50
+
+    with BookingLedger(tmp_path) as recovered:
+        assert len(recovered.bookings()) == 120
+        assert recovered.stats()["recovered_events"] == 120 - snapshot_sequence
+        assert book(recovered, fbs, "AZ1").result() == 121
+
+
+def test_CT04_evento_invalido_falha_no_append(tmp_path):
+    fbs = new_system()
+    with BookingLedger(tmp_path) as ledger:
+        book(ledger, fbs, "AZ1").result()
+        for flight, passengers in (("AZ1", -1), ("AZ1", 1 << 32), ("X" * 70000, 1)):
+            with pytest.raises(ValueError):
+                ledger.append(BOOKED, flight, passengers, 500.0, 0.0, False, BOOKING, DEPARTURE)
+        assert book(ledger, fbs, "AZ1").result() == 2
+        assert [event.sequence for event in ledger.events(block_size=16)] == [1, 2]
+
+    with BookingLedger(tmp_path) as recovered:
+        assert recovered.stats()["recovered_events"] == 2
+        assert recovered.stats()["truncated_bytes"] == 0
+
+
+def test_CT05_corrupcao_no_meio_do_log_nao_apaga_eventos(tmp_path):
+    fbs = new_system()
+    with BookingLedger(tmp_path) as ledger:
+        for _ in range(10):
+            book(ledger, fbs, "AZ1")
+        ledger.flush()
+    log_path = os.path.join(tmp_path, LOG_FILE)
+    with open(log_path, "rb") as log:
+        original = log.read()
+    frame_size = len(original) // 10
+    with open(log_path, "r+b") as log:
+        # Inverte um byte do payload do terceiro evento
+        log.seek(2 * frame_size + 20)
+        byte = log.read(1)
+        log.seek(2 * frame_size + 20)
+        log.write(bytes([byte[0] ^ 0xFF]))
+
+    with pytest.raises(RuntimeError, match="corrompido"):
+        BookingLedger(tmp_path)
+    assert os.path.getsize(log_path) == len(original)
+
+    with open(log_path, "r+b") as log:
+        log.write(original)
+        # Quadros zerados no fim (blocos pré-alocados) são tratados como gravação interrompida
+        log.write(bytes(3 * frame_size))
+    with BookingLedger(tmp_path) as recovered:
+        assert recovered.stats()["recovered_events"] == 10
+        assert recovered.stats()["truncated_bytes"] == 3 * frame_size
@@ -0,0 +1,65 @@
+import pytest
+from datetime import datetime, timedelta
+from src.flight.FareQuoteCache import FareQuoteCache
+from src.flight.FlightBookingSystem import FlightBookingSystem
+
+DEPARTURE = datetime(2025, 12, 20, 8, 0, 0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def fbs(clock):
+    return FlightBookingSystem(quote_cache=FareQuoteCache(max_entries=100, ttl=10.0, clock=clock))
+
+
+@pytest.mark.parametrize("hours_before", [0.5, 23.99, 24, 24.01, 47.99, 48, 48.01, 300])
+@pytest.mark.parametrize("is_cancellation", [False, True])
+def test_CT01_cache_nunca_atravessa_fronteiras(fbs, hours_before, is_cancellation):
+    # Aquece o cache com cotações de todas as faixas antes de consultar
+    for warm in (1, 30, 100):
+        fbs.quote_flight("AZ1", 2, DEPARTURE - timedelta(hours=warm), 10, 500.0, 80,
+                         is_cancellation, DEPARTURE, 0)
+    booking_time = DEPARTURE - timedelta(hours=hours_before)
+    expected = fbs.book_flight(2, booking_time, 10, 500.0, 80, is_cancellation, DEPARTURE, 0)
+    result = fbs.quote_flight("AZ1", 2, booking_time, 10, 500.0, 80, is_cancellation, DEPARTURE, 0)
+    assert (result.confirmation, result.total_price, result.refund_amount, result.points_used) == \
+        (expected.confirmation, expected.total_price, expected.refund_amount, expected.points_used)
+    assert fbs.quote_cache.hits >= 1
+
+
+def test_CT02_assentos_verificados_fora_do_cache(fbs):
+    booking_time = DEPARTURE - timedelta(days=5)
+    assert fbs.quote_flight("AZ1", 3, booking_time, 10, 500.0, 80, False, DEPARTURE, 0).confirmation
+    denied = fbs.quote_flight("AZ1", 3, booking_time, 2, 500.0, 80, False, DEPARTURE, 0)
+    assert denied.confirmation is False
+    assert denied.total_price == 0.0
+
+
+def test_CT03_mudanca_de_tarifa_invalida_e_ttl_expira(fbs, clock):
+    booking_time = DEPARTURE - timedelta(days=5)
+    cache = fbs.quote_cache
+    fbs.quote_flight("AZ1", 1, booking_time, 10, 500.0, 80, False, DEPARTURE, 0)
+    fbs.quote_flight("AZ1", 2, booking_time, 10, 500.0, 80, False, DEPARTURE, 0)
+    fbs.quote_flight("LA9", 1, booking_time, 10, 300.0, 10, False, DEPARTURE, 0)
+    assert len(cache) == 3
+
+    repriced = fbs.quote_flight("AZ1", 1, booking_time, 10, 550.0, 80, False, DEPARTURE, 0)
+    assert repriced.total_price == fbs.book_flight(1, booking_time, 10, 550.0, 80, False, DEPARTURE, 0).total_price
+    assert cache.stats()["invalidations"] == 2
+    assert len(cache) == 2
+
+    clock.now = 11.0
+    fbs.quote_flight("LA9", 1, booking_time, 10, 300.0, 10, False, DEPARTURE, 0)
+    assert cache.stats()["expirations"] == 1
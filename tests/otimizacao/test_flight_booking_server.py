@@ -0,0 +1,156 @@
+import asyncio
+import json
+import time
+from datetime import datetime
+from src.flight.FlightBookingServer import FlightBookingServer
+from src.flight.FlightBookingSystem import FlightBookingSystem
+from src.flight.SeatInventory import SeatInventory
+
+BOOKING = "2025-10-01T10:00:00"
+DEPARTURE = "2025-10-10T14:00:00"
+
+
+class SlowFlightBookingSystem(FlightBookingSystem):
+    """Mantém cada cálculo em andamento por tempo suficiente para haver concorrência."""
+    def quote_flight(self, *args):
+        time.sleep(0.05)
+        return super().quote_flight(*args)
+
+    def reserve_flight(self, *args):
+        time.sleep(0.05)
+        return super().reserve_flight(*args)
+
+
+def request(op, request_id, flight_id="AZ1", passengers=2, **extra):
+    return {"op": op, "id": request_id, "flight_id": flight_id, "passengers": passengers,
+            "booking_time": BOOKING, "departure_time": DEPARTURE,
+            "current_price": 500.0, "previous_sales": 25, **extra}
+
+
+async def exchange(service, connections):
+    server = await service.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    async def send(lines):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for line in lines:
+            writer.write(json.dumps(line).encode("utf-8") + b"\n")
+        await writer.drain()
+        replies = [json.loads(await reader.readline()) for _ in lines]
+        writer.close()
+        await writer.wait_closed()
+        return replies
+
+    replies = await asyncio.gather(*(send(lines) for lines in connections))
+    server.close()
+    await server.wait_closed()
+    await service.stop()
+    return replies
+
+
+def new_system(system_class=FlightBookingSystem):
+    inventory = SeatInventory()
+    inventory.add_flight("AZ1", 10)
+    inventory.add_flight("LA9", 10)
+    return system_class(inventory)
+
+
+def test_CT01_cotacoes_identicas_compartilham_calculo():
+    service = FlightBookingServer(new_system(SlowFlightBookingSystem))
+    connections = [[request("quote", c * 100 + i) for i in range(20)] for c in range(5)]
+    replies = asyncio.run(exchange(service, connections))
+
+    expected = FlightBookingSystem().book_flight(
+        2, datetime.fromisoformat(BOOKING), 10, 500.0, 25, False, datetime.fromisoformat(DEPARTURE), 0)
+    for c, connection in enumerate(replies):
+        assert [reply["id"] for reply in connection] == [c * 100 + i for i in range(20)]
+        assert all(reply["total_price"] == expected.total_price for reply in connection)
+    metrics = service.metrics()
+    assert metrics["coalesced"] >= 90
+    assert metrics["latency"]["quote"]["count"] == 100
+
+
+def test_CT02_reservas_metricas_e_sobrecarga():
+    service = FlightBookingServer(new_system(SlowFlightBookingSystem), max_in_flight=3)
+    lines = [request("book", i, flight_id="LA9", passengers=1) for i in range(5)]
+    lines.append({"op": "metrics"})
+    lines.append({"op": "refund", "id": 99})
+    (replies,) = asyncio.run(exchange(service, [lines]))
+
+    assert [reply["confirmation"] for reply in replies[:3]] == [True, True, True]
+    assert replies[3] == {"id": 3, "error": "busy"}
+    assert replies[4] == {"id": 4, "error": "busy"}
+    assert sorted(reply["seats_remaining"] for reply in replies[:3]) == [7, 8, 9]
+    assert replies[5]["in_flight"] == 3 and replies[5]["rejected"] == 2
+    assert "error" in replies[6]
+    assert service.metrics()["latency"]["book"]["count"] == 3
+
+
+def test_CT03_requisicao_invalida_nao_derruba_a_conexao():
+    service = FlightBookingServer(new_system())
+    lines = [
+        request("quote", 1, flight_id=["AZ1"]),
+        request("book", 2, flight_id={"id": "AZ1"}),
+        request("book", 3, flight_id="XX0"),
+        request("quote", 4, available_seats=[10]),
+        request("book", 5, passengers=1),
+    ]
+    (replies,) = asyncio.run(exchange(service, [lines]))
+
+    assert "error" in replies[0] and "error" in replies[1]
+    assert replies[2]["id"] == 3 and "error" in replies[2]
+    # Falha dentro do cálculo (TypeError) também vira resposta de erro
+    assert replies[3]["id"] == 4 and "error" in replies[3]
+    assert replies[4]["id"] == 5 and replies[4]["confirmation"] is True
+    assert service.metrics()["in_flight"] == 0
+
+
+def test_CT04_cancelamento_exige_reserva_emitida_pelo_servidor():
+    inventory = SeatInventory()
+    inventory.add_flight("AZ1", 1)
+    service = FlightBookingServer(FlightBookingSystem(inventory))
+    (booked,) = asyncio.run(exchange(service, [[request("book", 1, passengers=1)]]))[0]
+    assert booked["confirmation"] is True and booked["reservation_id"] is not None
+
+    forged = [
+        request("cancel", 2, passengers=1),
+        request("cancel", 3, reservation_id=booked["reservation_id"] + 1),
+        request("cancel", 4, flight_id="LA9", reservation_id=booked["reservation_id"]),
+        request("cancel", 5, reservation_id=str(booked["reservation_id"])),
+        request("book", 6, passengers=1),
+    ]
+    (replies,) = asyncio.run(exchange(service, [forged]))
+    assert all("error" in reply for reply in replies[:4])
+    assert replies[4]["confirmation"] is False
+    assert inventory.remaining("AZ1") == 0
+
+    lines = [request("cancel", 7, reservation_id=booked["reservation_id"]),
+             request("cancel", 8, reservation_id=booked["reservation_id"])]
+    (replies,) = asyncio.run(exchange(service, [lines]))
+    assert replies[0]["seats_remaining"] == 1 and replies[0]["refund_amount"] > 0
+    assert "error" in replies[1]
+    assert inventory.remaining("AZ1") == 1
+
+
+def test_CT05_cliente_que_aborta_nao_deixa_a_conexao_presa():
+    async def scenario():
+        service = FlightBookingServer(new_system(SlowFlightBookingSystem), max_pipeline=2)
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for i in range(20):
+            writer.write(json.dumps(request("quote", i)).encode("utf-8") + b"\n")
+        await writer.drain()
+        await asyncio.sleep(0.1)
+        # Encerra a conexão sem ler as respostas
+        writer.transport.abort()
+        await asyncio.sleep(1.0)
+        stuck = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        server.close()
+        await server.wait_closed()
+        await service.stop()
+        return stuck, service.in_flight
+
+    stuck, in_flight = asyncio.run(scenario())
+    assert stuck == []
+    assert in_flight == 0
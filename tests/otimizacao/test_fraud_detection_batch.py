@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from src.fraud.BlacklistIndex import BlacklistIndex
+from src.fraud.FraudDetectionSystem import FraudDetectionSystem
+from src.fraud.Transaction import Transaction
+
+EPOCH = datetime(1970, 1, 1)
+
+
+@pytest.fixture
+def fds():
+    return FraudDetectionSystem()
+
+
+def build_columns(size, seed=7):
+    rng = np.random.default_rng(seed)
+    accounts = rng.integers(0, 5, size)
+    gaps = rng.integers(0, 15 * 60, size)
+    timestamps = int((datetime(2025, 10, 1) - EPOCH).total_seconds()) + np.cumsum(gaps)
+    amounts = rng.choice([100.0, 9999.0, 10000.0, 10001.0, 25000.0], size)
+    locations = rng.choice(["Brasil", "Chile", "Irã"], size, p=[0.7, 0.25, 0.05])
+    return amounts, timestamps, accounts, locations
+
+
+def test_CT01_lote_equivale_ao_modo_escalar(fds):
+    amounts, timestamps, accounts, locations = build_columns(600)
+    blacklist = ["Irã"]
+    batch = fds.check_for_fraud_batch(amounts, timestamps, accounts, locations, blacklist)
+
+    history = {}
+    for i in range(len(amounts)):
+        current = Transaction(
+            float(amounts[i]), EPOCH + timedelta(seconds=int(timestamps[i])), str(locations[i])
+        )
+        previous = history.setdefault(int(accounts[i]), [])
+        expected = fds.check_for_fraud(current, previous, blacklist)
+        result = batch[i]
+        assert result.is_fraudulent == expected.is_fraudulent
+        assert result.is_blocked == expected.is_blocked
+        assert result.verification_required == expected.verification_required
+        assert result.risk_score == expected.risk_score
+        previous.append(current)
+
+
+def test_CT02_limites_de_janela_em_milissegundos(fds):
+    base = 1_700_000_000_000
+    timestamps = np.array([base - 60 * 60 * 1000] * 11 + [base], dtype=np.int64)
+    result = fds.check_for_fraud_batch(
+        np.full(12, 100.0), timestamps, np.zeros(12), np.array(["Brasil"] * 12),
+        BlacklistIndex(), timestamp_unit="ms",
+    )
+    assert bool(result.is_blocked[-1]) is True
+    assert int(result.risk_score[-1]) == 30
+
+
+def test_CT03_conta_fora_de_ordem_e_rejeitada(fds):
+    with pytest.raises(ValueError):
+        fds.check_for_fraud_batch(
+            np.array([1.0, 1.0]), np.array([10, 5]), np.array(["a", "a"]),
+            np.array(["Brasil", "Brasil"]), [],
+        )
@@ -0,0 +1,44 @@
+import pytest
+from datetime import datetime, timedelta
+from src.fraud.FraudDetectionSystem import FraudDetectionSystem
+from src.fraud.Transaction import Transaction
+
+
+@pytest.fixture
+def fds():
+    return FraudDetectionSystem()
+
+
+def make_history(count, end_time, interval_minutes):
+    return [
+        Transaction(100, end_time - timedelta(minutes=i * interval_minutes), "Brasil")
+        for i in reversed(range(count))
+    ]
+
+
+@pytest.mark.parametrize(
+    "count, interval_minutes", [(0, 5), (10, 5), (11, 6), (11, 5), (12, 7), (5000, 1)]
+)
+def test_CT01_historico_ordenado_equivale_a_varredura(fds, count, interval_minutes):
+    now = datetime(2025, 10, 1, 12, 0, 0)
+    current = Transaction(100, now, "Brasil")
+    previous = make_history(count, now, interval_minutes)
+    expected = fds.check_for_fraud(current, previous, [])
+    result = fds.check_for_fraud(current, previous, [], assume_sorted=True)
+    assert result.is_blocked == expected.is_blocked
+    assert result.risk_score == expected.risk_score
+
+
+def test_CT02_limite_exato_de_60_minutos(fds):
+    now = datetime(2025, 10, 1, 12, 0, 0)
+    previous = [Transaction(100, now - timedelta(minutes=60), "Brasil")] * 11
+    result = fds.check_for_fraud(Transaction(100, now, "Brasil"), previous, [], assume_sorted=True)
+    assert result.is_blocked is True
+
+
+def test_CT03_historico_desordenado_e_rejeitado(fds):
+    now = datetime(2025, 10, 1, 12, 0, 0)
+    previous = make_history(5, now, 5)
+    previous[-1], previous[-2] = previous[-2], previous[-1]
+    with pytest.raises(ValueError):
+        fds.check_for_fraud(Transaction(100, now, "Brasil"), previous, [], assume_sorted=True)
@@ -0,0 +1,70 @@
+import pytest
+from datetime import datetime, timedelta
+from src.fraud.FraudDetectionStream import FraudDetectionStream
+from src.fraud.FraudDetectionSystem import FraudDetectionSystem
+from src.fraud.Transaction import Transaction
+
+
+def as_tuple(result):
+    return (
+        result.is_fraudulent,
+        result.is_blocked,
+        result.verification_required,
+        result.risk_score,
+    )
+
+
+def build_traffic():
+    start = datetime(2025, 10, 1, 8, 0, 0)
+    locations = ["Brasil", "Brasil", "Chile", "Brasil", "Irã"]
+    traffic = []
+    for i in range(120):
+        account = f"conta-{i % 3}"
+        timestamp = start + timedelta(minutes=2 * i)
+        amount = 12000 if i % 17 == 0 else 100 + i
+        traffic.append(
+            (account, Transaction(amount, timestamp, locations[i % len(locations)]))
+        )
+    return traffic
+
+
+def test_CT01_stream_equivale_ao_modo_sem_estado():
+    blacklist = ["Irã"]
+    fds = FraudDetectionSystem()
+    stream = FraudDetectionStream(blacklist)
+    history = {}
+    for account, transaction in build_traffic():
+        previous = history.setdefault(account, [])
+        expected = fds.check_for_fraud(transaction, previous, blacklist)
+        assert as_tuple(stream.process(account, transaction)) == as_tuple(expected)
+        previous.append(transaction)
+
+
+def test_CT02_bloqueio_por_excesso_de_transacoes():
+    stream = FraudDetectionStream([])
+    base_time = datetime(2025, 10, 1, 12, 0, 0)
+    for i in range(11):
+        stream.process("a", Transaction(10, base_time + timedelta(minutes=i), "Brasil"))
+    result = stream.process("a", Transaction(10, base_time + timedelta(minutes=11), "Brasil"))
+    assert result.is_blocked is True
+    assert result.risk_score == 30
+    # Outra conta não é afetada pelo histórico da primeira
+    other = stream.process("b", Transaction(10, base_time + timedelta(minutes=11), "Brasil"))
+    assert other.is_blocked is False
+
+
+def test_CT03_seed_carrega_historico():
+    stream = FraudDetectionStream([])
+    base_time = datetime(2025, 10, 1, 12, 0, 0)
+    stream.seed("a", [Transaction(10, base_time, "Brasil")])
+    result = stream.process("a", Transaction(10, base_time + timedelta(minutes=5), "Chile"))
+    assert result.is_fraudulent is True
+    assert result.risk_score == 20
+
+
+def test_CT04_transacao_fora_de_ordem():
+    stream = FraudDetectionStream([])
+    base_time = datetime(2025, 10, 1, 12, 0, 0)
+    stream.process("a", Transaction(10, base_time, "Brasil"))
+    with pytest.raises(ValueError):
+        stream.process("a", Transaction(10, base_time - timedelta(minutes=1), "Brasil"))
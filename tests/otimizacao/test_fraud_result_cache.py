@@ -0,0 +1,72 @@
+from datetime import datetime
+from src.fraud.BlacklistIndex import BlacklistIndex
+from src.fraud.FraudDetectionSystem import FraudDetectionSystem
+from src.fraud.FraudResultCache import FraudResultCache
+from src.fraud.Transaction import Transaction
+
+NOW = datetime(2025, 10, 1, 12, 0, 0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_CT01_nova_tentativa_reaproveita_resultado():
+    cache = FraudResultCache()
+    fds = FraudDetectionSystem(result_cache=cache)
+    current = Transaction(20000, NOW, "Brasil")
+    first = fds.check_for_fraud(current, [], [], idempotency_key="pedido-1")
+    # Mesmo com outro histórico, a chave de idempotência devolve o resultado original
+    retry = fds.check_for_fraud(current, [Transaction(1, NOW, "Chile")], [], idempotency_key="pedido-1")
+    assert retry is first
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_CT02_impressao_digital_depende_da_versao():
+    cache = FraudResultCache()
+    fds = FraudDetectionSystem(result_cache=cache)
+    blacklist = BlacklistIndex(["Irã"])
+    current = Transaction(10, NOW, "Brasil")
+    fds.check_for_fraud(current, [], blacklist, history_version=1)
+    fds.check_for_fraud(current, [], blacklist, history_version=1)
+    fds.check_for_fraud(current, [], blacklist, history_version=2)
+    blacklist.reload(["Brasil"])
+    result = fds.check_for_fraud(current, [], blacklist, history_version=2)
+    assert result.risk_score == 100
+    assert cache.stats()["hits"] == 1
+    # Sem chave nem versão o cache não é consultado
+    fds.check_for_fraud(current, [], blacklist)
+    assert cache.stats()["misses"] == 3
+
+
+def test_CT03_lru_e_ttl():
+    clock = FakeClock()
+    cache = FraudResultCache(max_entries=2, ttl=10.0, clock=clock)
+    fds = FraudDetectionSystem(result_cache=cache)
+    for key in ("a", "b", "c"):
+        fds.check_for_fraud(Transaction(10, NOW, "Brasil"), [], [], idempotency_key=key)
+    assert cache.stats()["evictions"] == 1
+    assert cache.get(("idempotency", "a")) is None
+    clock.now = 11.0
+    assert cache.get(("idempotency", "c")) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_CT04_lista_sem_versao_nao_usa_impressao_digital():
+    cache = FraudResultCache()
+    fds = FraudDetectionSystem(result_cache=cache)
+    current = Transaction(10, NOW, "Irã")
+    assert fds.check_for_fraud(current, [], ["Irã"], history_version=1).is_blocked is True
+    assert fds.check_for_fraud(current, [], [], history_version=1).is_blocked is False
+    assert len(cache) == 0
+
+    # Índices diferentes nunca compartilham uma versão
+    blocked, empty = BlacklistIndex(["Irã"]), BlacklistIndex()
+    assert fds.check_for_fraud(current, [], blocked, history_version=1).is_blocked is True
+    assert fds.check_for_fraud(current, [], empty, history_version=1).is_blocked is False
+    assert cache.stats()["hits"] == 0
@@ -0,0 +1,61 @@
+import asyncio
+import json
+from src.fraud.FraudScoringServer import FraudScoringServer
+
+
+async def exchange(lines):
+    service = FraudScoringServer(["Irã"], max_batch_size=8, max_batch_delay=0.01)
+    server = await service.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for line in lines:
+        writer.write(json.dumps(line).encode("utf-8") + b"\n")
+    await writer.drain()
+    replies = [json.loads(await reader.readline()) for _ in lines]
+    writer.close()
+    await writer.wait_closed()
+    server.close()
+    await server.wait_closed()
+    await service.stop()
+    return replies
+
+
+def test_CT01_respostas_por_requisicao_e_metricas():
+    requests = [
+        {"id": i, "account_id": "a", "amount": 15000 if i == 0 else 100,
+         "timestamp": f"2025-10-01T12:{i:02d}:00", "location": "Brasil"}
+        for i in range(12)
+    ]
+    requests.append({"id": 12, "account_id": "b", "amount": 10,
+                     "timestamp": "2025-10-01T12:30:00", "location": "Irã"})
+    requests.append({"op": "metrics"})
+    requests.append({"id": 99, "amount": 1})
+    replies = asyncio.run(exchange(requests))
+
+    assert [r["id"] for r in replies[:13]] == list(range(13))
+    assert replies[0]["risk_score"] == 50
+    assert replies[11]["is_blocked"] is True
+    assert replies[12]["risk_score"] == 100
+    assert "latency" in replies[13] and "queue_depth" in replies[13]
+    assert "error" in replies[14]
+
+
+def test_CT02_requisicao_invalida_nao_interrompe_as_seguintes():
+    good = {"id": 2, "account_id": "c", "amount": 100,
+            "timestamp": "2025-10-01T12:00:00", "location": "Brasil"}
+    requests = [
+        {"id": 0, "account_id": ["x"], "amount": 1, "epoch_us": 1, "location": "Brasil"},
+        {"id": 1, "account_id": "c", "amount": 1, "epoch_us": 1, "location": 99999},
+        good,
+        {"id": 3, "account_id": "c", "amount": 1, "epoch_us": 1, "location": "Brasil"},
+        dict(good, id=4, timestamp="2025-10-01T12:05:00"),
+    ]
+    replies = asyncio.run(exchange(requests))
+
+    assert "error" in replies[0]
+    # Localização numérica é um nome como outro qualquer
+    assert replies[1]["id"] == 1 and "error" not in replies[1]
+    assert replies[2]["id"] == 2 and replies[2]["risk_score"] == 0
+    # Fora de ordem na conta: erro só para esta requisição do lote
+    assert replies[3]["id"] == 3 and "error" in replies[3]
+    assert replies[4]["id"] == 4 and "error" not in replies[4]
@@ -0,0 +1,56 @@
+import pytest
+from datetime import datetime, timedelta
+from src.fraud.FraudDetectionStream import FraudDetectionStream
+from src.fraud.FraudDetectionSystem import FraudDetectionSystem
+from src.fraud.FraudRule import ImpossibleTravelRule
+from src.fraud.Gazetteer import Gazetteer
+from src.fraud.LocationTable import LOCATIONS
+from src.fraud.RuleEngine import RuleEngine
+from src.fraud.Transaction import Transaction
+
+START = datetime(2025, 10, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    path = tmp_path / "gazetteer.csv"
+    path.write_text(
+        "location,latitude,longitude\n"
+        "São Paulo,-23.5505,-46.6333\n"
+        "Rio de Janeiro,-22.9068,-43.1729\n"
+        "Tóquio,35.6762,139.6503\n",
+        encoding="utf-8",
+    )
+    return Gazetteer.from_file(path)
+
+
+def test_CT01_matriz_de_distancias(gazetteer):
+    sao_paulo = LOCATIONS.lookup("São Paulo")
+    rio = LOCATIONS.lookup("Rio de Janeiro")
+    assert gazetteer.distance_km(sao_paulo, rio) == pytest.approx(361, abs=5)
+    assert gazetteer.distance_km(rio, sao_paulo) == gazetteer.distance_km(sao_paulo, rio)
+    assert gazetteer.distance_km(sao_paulo, sao_paulo) == 0
+    assert gazetteer.distance_km(sao_paulo, LOCATIONS.intern("Atlântida")) is None
+
+
+def test_CT02_viagem_impossivel_no_stream(gazetteer):
+    engine = RuleEngine()
+    engine.register(ImpossibleTravelRule(gazetteer, max_speed_kmh=900))
+    stream = FraudDetectionStream([], FraudDetectionSystem(engine))
+
+    stream.process("a", Transaction(10, START, "São Paulo"))
+    # 361 km em 1 hora é plausível; a regra de mudança de localização não se aplica (>30 min)
+    plausible = stream.process("a", Transaction(10, START + timedelta(hours=1), "Rio de Janeiro"))
+    assert plausible.risk_score == 0
+    impossible = stream.process("a", Transaction(10, START + timedelta(hours=3), "Tóquio"))
+    assert impossible.is_fraudulent is True
+    assert impossible.risk_score == 40
+
+
+def test_CT03_regra_no_modo_sem_estado(gazetteer):
+    engine = RuleEngine()
+    engine.register(ImpossibleTravelRule(gazetteer))
+    fds = FraudDetectionSystem(engine)
+    previous = [Transaction(10, START, "São Paulo")]
+    result = fds.check_for_fraud(Transaction(10, START + timedelta(minutes=10), "Tóquio"), previous, [])
+    assert result.risk_score == 60
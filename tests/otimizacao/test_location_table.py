@@ -0,0 +1,37 @@
+from datetime import datetime
+from src.fraud.BlacklistIndex import BlacklistIndex
+from src.fraud.LocationTable import LOCATIONS, LocationTable
+from src.fraud.Transaction import Transaction
+from src.fraud.TransactionLog import TransactionLog
+
+
+def test_CT01_internacao_retorna_ids_estaveis():
+    table = LocationTable()
+    assert table.intern("Brasil") == 0
+    assert table.intern("Chile") == 1
+    assert table.intern("Brasil") == 0
+    assert table.name(1) == "Chile"
+    assert table.lookup("Peru") is None
+    assert len(table) == 2
+
+
+def test_CT02_transacoes_compartilham_o_id():
+    now = datetime(2025, 10, 1, 12, 0, 0)
+    first = Transaction(1, now, "Brasil")
+    second = Transaction(2, now, "".join(["Bra", "sil"]))
+    assert first.location_id == second.location_id
+    assert first.location is second.location
+    assert not hasattr(first, "__dict__")
+    second.location = "Chile"
+    assert second.location_id == LOCATIONS.lookup("Chile")
+
+
+def test_CT03_log_e_blacklist_usam_ids_globais():
+    now = datetime(2025, 10, 1, 12, 0, 0)
+    log = TransactionLog([Transaction(1, now, "Irã")])
+    assert log[0].location_id == LOCATIONS.lookup("Irã")
+    index = BlacklistIndex([" irã "])
+    assert index.contains_id(log[0].location_id) is True
+    assert index.contains_id(LOCATIONS.intern("Brasil")) is False
+    index.reload(["Brasil"])
+    assert index.contains_id(log[0].location_id) is False
@@ -0,0 +1,82 @@
+import pickle
+import numpy as np
+from datetime import datetime, timedelta
+from src.fraud.FraudDetectionSystem import FraudDetectionSystem
+from src.fraud.MappedTransactionHistory import MappedTransactionHistory
+from src.fraud.Transaction import Transaction
+
+
+def make_transactions(count, start):
+    locations = ["Brasil", "Chile", "Irã"]
+    return [
+        Transaction(100.0 + i, start + timedelta(minutes=5 * i), locations[i % 3])
+        for i in range(count)
+    ]
+
+
+def test_CT01_grava_e_le_sem_copia(tmp_path):
+    path = tmp_path / "history.bin"
+    start = datetime(2025, 10, 1, 12, 0, 0)
+    transactions = make_transactions(20, start)
+    assert MappedTransactionHistory.write(path, transactions) == 20
+
+    with MappedTransactionHistory(path) as history:
+        assert len(history) == 20
+        assert history.is_sorted
+        assert history.amounts.base is not None
+        record = history[-1]
+        assert record.amount == 119.0
+        assert record.timestamp == transactions[-1].timestamp
+        assert record.location == transactions[-1].location
+        assert [r.amount for r in history] == [t.amount for t in transactions]
+        assert history.location_ids_in(["Irã"]) == {2}
+        reopened = pickle.loads(pickle.dumps(history))
+        assert len(reopened) == 20
+        reopened.close()
+
+
+def test_CT02_sistema_aceita_historico_mapeado(tmp_path):
+    path = tmp_path / "history.bin"
+    start = datetime(2025, 10, 1, 12, 0, 0)
+    transactions = make_transactions(30, start)
+    MappedTransactionHistory.write(path, transactions)
+    fds = FraudDetectionSystem()
+    current = Transaction(50, transactions[-1].timestamp + timedelta(minutes=10), "Brasil")
+    expected = fds.check_for_fraud(current, transactions, [])
+    with MappedTransactionHistory(path) as history:
+        result = fds.check_for_fraud(current, history, [])
+    assert result.is_blocked == expected.is_blocked
+    assert result.risk_score == expected.risk_score
+
+
+def test_CT03_colunas_alimentam_o_lote(tmp_path):
+    path = tmp_path / "history.bin"
+    transactions = make_transactions(50, datetime(2025, 10, 1, 12, 0, 0))
+    MappedTransactionHistory.write(path, transactions, ["a", "b"] * 25)
+    with MappedTransactionHistory(path) as history:
+        batch = FraudDetectionSystem().check_for_fraud_batch(
+            history.amounts, history.timestamps, history.account_ids,
+            history.location_ids, history.location_ids_in(["Irã"]), timestamp_unit="us",
+        )
+        assert np.array_equal(batch.risk_score == 100, history.location_ids == 2)
+        del batch
+
+
+def test_CT04_historico_desordenado_e_contas_sob_demanda(tmp_path):
+    path = tmp_path / "history.bin"
+    start = datetime(2025, 10, 1, 12, 0, 0)
+    transactions = make_transactions(30, start)
+    shuffled = transactions[::2] + transactions[1::2]
+    MappedTransactionHistory.write(path, shuffled, [f"conta-{i}" for i in range(30)])
+    fds = FraudDetectionSystem()
+    current = Transaction(50, transactions[-1].timestamp + timedelta(minutes=10), "Brasil")
+    expected = fds.check_for_fraud(current, shuffled, [])
+    with MappedTransactionHistory(path) as history:
+        assert not history.is_sorted
+        assert history._accounts is None
+        result = fds.check_for_fraud(current, history, [])
+        cutoff = current.epoch_us - 3_600_000_000
+        assert history.count_since(cutoff) == sum(t.epoch_us >= cutoff for t in shuffled)
+        assert history.accounts[history.account_ids[3]] == "conta-3"
+    assert result.risk_score == expected.risk_score
+    assert result.verification_required == expected.verification_required
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from src.flight.FlightBookingSystem import FlightBookingSystem
+
+DEPARTURE = datetime(2025, 12, 20, 8, 0, 0)
+
+
+@pytest.fixture
+def fbs():
+    return FlightBookingSystem()
+
+
+def test_CT01_grade_equivale_ao_modo_escalar(fbs):
+    rng = np.random.default_rng(11)
+    size = 2000
+    passengers = rng.integers(1, 9, size)
+    # Inclui as fronteiras exatas de 24h e 48h e frações de microssegundo
+    offsets = rng.choice([0, 24 * 3600 * 10**6, 48 * 3600 * 10**6, 48 * 3600 * 10**6 - 1, 1], size)
+    offsets = offsets + rng.integers(0, 4 * 86400 * 10**6, size) * rng.integers(0, 2, size)
+    booking_times = [DEPARTURE - timedelta(microseconds=int(offset)) for offset in offsets]
+    available = rng.integers(0, 10, size)
+    prices = rng.uniform(0, 2000, size).round(2)
+    sales = rng.integers(0, 200, size)
+    cancellation = rng.integers(0, 2, size).astype(bool)
+    points = rng.choice([0, 500, 10_000, 10**7], size)
+
+    grid = fbs.quote_grid(passengers, booking_times, available, prices, sales,
+                          cancellation, DEPARTURE, points)
+    for i in range(size):
+        expected = fbs.book_flight(int(passengers[i]), booking_times[i], int(available[i]),
+                                   float(prices[i]), int(sales[i]), bool(cancellation[i]),
+                                   DEPARTURE, int(points[i]))
+        result = grid[i]
+        assert result.confirmation == expected.confirmation
+        assert result.total_price == expected.total_price
+        assert result.refund_amount == expected.refund_amount
+        assert result.points_used == expected.points_used
+
+
+def test_CT02_broadcast_entre_eixos(fbs):
+    passengers = np.arange(1, 7)[:, None]
+    hours = np.array([12, 36, 72])[None, :]
+    booking_times = np.datetime64(DEPARTURE) - hours.astype("timedelta64[h]")
+    grid = fbs.quote_grid(passengers, booking_times, 100, 500.0, 50, False, DEPARTURE, 0)
+    assert grid.shape == (6, 3)
+    assert len(grid) == 18
+    expected = fbs.book_flight(5, DEPARTURE - timedelta(hours=12), 100, 500.0, 50, False, DEPARTURE, 0)
+    assert grid.total_price[4, 0] == expected.total_price
+    assert grid.confirmation.all()
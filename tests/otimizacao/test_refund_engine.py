@@ -0,0 +1,68 @@
+import csv
+import io
+from datetime import datetime, timedelta
+import pytest
+from src.flight.BookingLedger import BookingLedger
+from src.flight.FlightBookingSystem import FlightBookingSystem
+from src.flight.RefundEngine import REFUND_FIELDS, RefundEngine
+from src.flight.SeatInventory import SeatInventory
+
+CANCELLED_AT = datetime(2025, 10, 1, 10, 0, 0)
+
+
+def test_CT01_reembolsos_em_blocos_equivalem_ao_modo_escalar(tmp_path):
+    inventory = SeatInventory()
+    inventory.add_flight("AZ1", 1000)
+    inventory.add_flight("LA9", 500)
+    fbs = FlightBookingSystem(inventory)
+    expected = {}
+    with BookingLedger(tmp_path) as ledger:
+        for i in range(300):
+            # Partidas de 1h a 100h depois do cancelamento, incluindo a fronteira de 48h
+            departure = CANCELLED_AT + timedelta(hours=1 + i % 100)
+            arguments = ("AZ1", 1 + i % 3, CANCELLED_AT, 100.0 + i, 60, departure, 0)
+            booked = fbs.reserve_flight(*arguments)
+            sequence = ledger.record(booked, arguments[1], CANCELLED_AT, departure).result()
+            expected[sequence] = fbs.book_flight(arguments[1], CANCELLED_AT, arguments[1], 100.0 + i,
+                                                 60, True, departure, 0).refund_amount
+        ledger.record(fbs.reserve_flight("LA9", 1, CANCELLED_AT, 100.0, 60, CANCELLED_AT, 0),
+                      1, CANCELLED_AT, CANCELLED_AT).result()
+
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=REFUND_FIELDS)
+        stats = RefundEngine(chunk_size=64).cancel_flight(ledger, "AZ1", CANCELLED_AT, writer.writerow)
+
+        assert stats["bookings"] == 300
+        assert stats["persisted"] == 300
+        assert stats["full_refunds"] == 3 * 53
+        assert len(ledger.bookings("AZ1")) == 0
+        assert len(ledger.bookings("LA9")) == 1
+
+    rows = list(csv.DictReader(io.StringIO(output.getvalue()), fieldnames=REFUND_FIELDS))
+    assert len(rows) == 300
+    for row in rows:
+        assert float(row["refund_amount"]) == expected[int(row["booking_id"])]
+
+    with BookingLedger(tmp_path) as recovered:
+        refunds = [event.refund_amount for event in recovered.events() if event.kind == 2]
+        assert sorted(refunds) == sorted(expected.values())
+
+
+def test_CT02_falha_de_gravacao_do_cancelamento_e_reportada(tmp_path):
+    inventory = SeatInventory()
+    inventory.add_flight("AZ1", 100)
+    fbs = FlightBookingSystem(inventory)
+    departure = CANCELLED_AT + timedelta(hours=72)
+    with BookingLedger(tmp_path) as ledger:
+        for _ in range(10):
+            ledger.record(fbs.reserve_flight("AZ1", 1, CANCELLED_AT, 100.0, 60, departure, 0),
+                          1, CANCELLED_AT, departure).result()
+
+        def disk_full(data):
+            raise OSError("No space left on device")
+
+        ledger._write_durably = disk_full
+        with pytest.raises(RuntimeError, match="10 de 10") as failure:
+            RefundEngine(chunk_size=4).cancel_flight(ledger, "AZ1", CANCELLED_AT)
+        assert isinstance(failure.value.__cause__, OSError)
+        assert len(ledger.bookings("AZ1")) == 10
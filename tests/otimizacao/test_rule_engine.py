@@ -0,0 +1,87 @@
+import itertools
+import pytest
+from datetime import datetime, timedelta
+from src.fraud.FraudDetectionSystem import FraudDetectionSystem
+from src.fraud.FraudRule import (
+    BlacklistRule,
+    FraudContext,
+    FraudRule,
+    HighAmountRule,
+    LocationChangeRule,
+    VelocityRule,
+)
+from src.fraud.RuleEngine import RuleEngine
+from src.fraud.Transaction import Transaction
+
+NOW = datetime(2025, 10, 1, 12, 0, 0)
+
+
+def reference(amount, recent, last_location, minutes_since_last, location, blacklist):
+    """Implementação original das quatro regras, em sequência."""
+    is_fraudulent = is_blocked = verification_required = False
+    risk_score = 0
+    if amount > 10000:
+        is_fraudulent = verification_required = True
+        risk_score += 50
+    if recent > 10:
+        is_blocked = True
+        risk_score += 30
+    if last_location is not None and minutes_since_last < 30 and last_location != location:
+        is_fraudulent = verification_required = True
+        risk_score += 20
+    if location in blacklist:
+        is_blocked = True
+        risk_score = 100
+    return is_fraudulent, is_blocked, verification_required, risk_score
+
+
+@pytest.mark.parametrize(
+    "amount, recent, last_location, location",
+    list(itertools.product([100, 20000], [3, 11], [None, "Brasil", "Chile"], ["Brasil", "Irã"])),
+)
+def test_CT01_resultado_identico_ao_original(amount, recent, last_location, location):
+    last = None if last_location is None else Transaction(1, NOW - timedelta(minutes=5), last_location)
+    context = FraudContext(Transaction(amount, NOW, location), recent, last, ["Irã"])
+    result = RuleEngine().evaluate(context)
+    assert (
+        result.is_fraudulent, result.is_blocked, result.verification_required, result.risk_score
+    ) == reference(amount, recent, last_location, 5, location, ["Irã"])
+
+
+def test_CT02_blacklist_evita_varredura_do_historico():
+    calls = []
+
+    def count():
+        calls.append(1)
+        return 0
+
+    context = FraudContext(Transaction(100, NOW, "Irã"), count, None, ["Irã"])
+    result = RuleEngine().evaluate(context)
+    assert result.risk_score == 100
+    assert calls == []
+
+
+def test_CT03_plano_ordena_por_custo():
+    plan = RuleEngine().plan()
+    assert isinstance(plan[0], BlacklistRule)
+    assert isinstance(plan[-1], VelocityRule)
+    assert {type(rule) for rule in plan} == {
+        BlacklistRule, HighAmountRule, LocationChangeRule, VelocityRule
+    }
+
+
+def test_CT04_regra_registrada_pelo_usuario():
+    class RoundAmountRule(FraudRule):
+        name = "round_amount"
+        flags = ("verification_required",)
+        score = 5
+
+        def matches(self, context):
+            return context.current_transaction.amount % 1000 == 0
+
+    engine = RuleEngine()
+    engine.register(RoundAmountRule())
+    fds = FraudDetectionSystem(engine)
+    result = fds.check_for_fraud(Transaction(3000, NOW, "Brasil"), [], [])
+    assert result.verification_required is True
+    assert result.risk_score == 5
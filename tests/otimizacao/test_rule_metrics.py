@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+from src.fraud.FraudDetectionSystem import FraudDetectionSystem
+from src.fraud.RuleEngine import RuleEngine
+from src.fraud.RuleMetrics import RuleMetrics
+from src.fraud.Transaction import Transaction
+
+NOW = datetime(2025, 10, 1, 12, 0, 0)
+
+
+def make_history(count):
+    return [Transaction(10, NOW - timedelta(minutes=count - i), "Brasil") for i in range(count)]
+
+
+def test_CT01_contadores_por_regra():
+    metrics = RuleMetrics()
+    fds = FraudDetectionSystem(RuleEngine(metrics=metrics))
+    history = make_history(20)
+    fds.check_for_fraud(Transaction(20000, NOW, "Brasil"), history, ["Irã"])
+    fds.check_for_fraud(Transaction(10, NOW, "Irã"), history, ["Irã"])
+
+    snapshot = metrics.snapshot()
+    rules = snapshot["rules"]
+    assert snapshot["checks"] == 2
+    assert rules["velocity"]["invocations"] == 1
+    assert rules["velocity"]["hits"] == 1
+    assert rules["velocity"]["history_scanned"] == 20
+    assert rules["velocity"]["skipped"] == 1
+    assert rules["high_amount"]["hits"] == 1
+    assert rules["blacklist"]["hits"] == 1
+    assert all(stats["wall_time"] >= 0 for stats in rules.values())
+
+
+def test_CT02_exportacao_prometheus():
+    metrics = RuleMetrics()
+    fds = FraudDetectionSystem(RuleEngine(metrics=metrics))
+    fds.check_for_fraud(Transaction(10, NOW, "Brasil"), make_history(3), [])
+    text = metrics.to_prometheus()
+    assert "# TYPE fraud_checks_total counter" in text
+    assert "fraud_checks_total 1" in text
+    assert 'fraud_rule_history_scanned_total{rule="velocity"} 3' in text
+
+
+def test_CT03_desativado_por_padrao():
+    assert FraudDetectionSystem().rule_engine.metrics is None
@@ -0,0 +1,80 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from src.flight.FlightBookingSystem import FlightBookingSystem
+from src.flight.SeatInventory import SeatInventory
+
+BOOKING = datetime(2025, 10, 1, 10, 0, 0)
+DEPARTURE = datetime(2025, 10, 10, 14, 0, 0)
+
+
+@pytest.fixture
+def inventory():
+    inventory = SeatInventory(stripes=8)
+    for flight in range(20):
+        inventory.add_flight(f"AZ{flight}", 50)
+    return inventory
+
+
+def test_CT01_reservas_concorrentes_nunca_excedem_capacidade(inventory):
+    fbs = FlightBookingSystem(inventory)
+
+    def book(request):
+        flight, passengers = request
+        return fbs.reserve_flight(flight, passengers, BOOKING, 500.0, 25, DEPARTURE, 0)
+
+    requests = [(f"AZ{i % 20}", 1 + i % 3) for i in range(4000)]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(book, requests))
+
+    for flight in range(20):
+        flight_id = f"AZ{flight}"
+        sold = sum(passengers for (fid, passengers), result in zip(requests, results)
+                   if fid == flight_id and result.confirmation)
+        assert sold + inventory.remaining(flight_id) == 50
+        assert sold <= 50
+    assert all(result.flight_id is not None for result in results)
+
+
+def test_CT02_reserva_e_cancelamento_atualizam_inventario(inventory):
+    fbs = FlightBookingSystem(inventory)
+    booked = fbs.reserve_flight("AZ1", 2, BOOKING, 500.0, 25, DEPARTURE, 0)
+    expected = fbs.book_flight(2, BOOKING, 50, 500.0, 25, False, DEPARTURE, 0)
+    assert booked.confirmation is True
+    assert booked.total_price == expected.total_price
+    assert booked.seats_remaining == 48
+
+    denied = fbs.reserve_flight("AZ1", 49, BOOKING, 500.0, 25, DEPARTURE, 0)
+    assert denied.confirmation is False
+    assert denied.seats_remaining == 48
+
+    cancelled = fbs.cancel_reservation("AZ1", booked.reservation_id, BOOKING, 500.0, 25, DEPARTURE, 0)
+    assert cancelled.refund_amount == expected.total_price
+    assert cancelled.seats_remaining == 50
+    with pytest.raises(KeyError):
+        inventory.cancel(booked.reservation_id)
+    with pytest.raises(KeyError):
+        inventory.reserve("XX9", 1)
+
+
+def test_CT03_cancelamento_exige_reserva_ativa():
+    inventory = SeatInventory()
+    inventory.add_flight("AZ1", 1)
+    inventory.add_flight("LA9", 1)
+    fbs = FlightBookingSystem(inventory)
+    booked = fbs.reserve_flight("AZ1", 1, BOOKING, 500.0, 25, DEPARTURE, 0)
+    other = fbs.reserve_flight("LA9", 1, BOOKING, 500.0, 25, DEPARTURE, 0)
+
+    # Quem não reservou não consegue liberar o assento vendido
+    for reservation_id in (None, 0, booked.reservation_id + 100):
+        with pytest.raises(KeyError):
+            fbs.cancel_reservation("AZ1", reservation_id, BOOKING, 500.0, 25, DEPARTURE, 0)
+    with pytest.raises(KeyError):
+        fbs.cancel_reservation("AZ1", other.reservation_id, BOOKING, 500.0, 25, DEPARTURE, 0)
+    assert fbs.reserve_flight("AZ1", 1, BOOKING, 500.0, 25, DEPARTURE, 0).confirmation is False
+
+    cancelled = fbs.cancel_reservation("AZ1", booked.reservation_id, BOOKING, 500.0, 25, DEPARTURE, 0)
+    assert cancelled.seats_remaining == 1
+    with pytest.raises(KeyError):
+        fbs.cancel_reservation("AZ1", booked.reservation_id, BOOKING, 500.0, 25, DEPARTURE, 0)
+    assert inventory.remaining("AZ1") == 1 and inventory.remaining("LA9") == 0
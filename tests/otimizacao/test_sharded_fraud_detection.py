@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from src.fraud.FraudDetectionStream import FraudDetectionStream
+from src.fraud.ShardedFraudDetectionSystem import ShardedFraudDetectionSystem, account_hashes
+from src.fraud.Transaction import Transaction
+
+
+def build_events(count):
+    start = datetime(2025, 10, 1, 8, 0, 0)
+    locations = ["Brasil", "Chile", "Brasil", "Irã"]
+    return [
+        (
+            f"conta-{i % 7}",
+            Transaction(
+                15000 if i % 13 == 0 else 100,
+                start + timedelta(minutes=i),
+                locations[(i // 3) % len(locations)],
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+def as_tuple(result):
+    return (result.is_fraudulent, result.is_blocked, result.verification_required, result.risk_score)
+
+
+def test_CT01_resultados_na_ordem_de_entrada():
+    events = build_events(500)
+    stream = FraudDetectionStream(["Irã"])
+    expected = [as_tuple(stream.process(account, tx)) for account, tx in events]
+    with ShardedFraudDetectionSystem(["Irã"], workers=3, chunk_size=64, max_pending_chunks=2) as sharded:
+        results = sharded.score(events)
+    assert [as_tuple(r) for r in results] == expected
+
+
+def test_CT02_erro_por_linha_nao_altera_o_estado():
+    base = datetime(2025, 10, 1, 8, 0, 0)
+    events = [
+        ("a", Transaction(1, base, "Brasil")),
+        ("a", Transaction(1, base - timedelta(minutes=1), "Brasil")),
+        ("b", Transaction(1, base, "Brasil")),
+        ("a", Transaction(1, base + timedelta(minutes=5), "Chile")),
+    ]
+    stream = FraudDetectionStream([])
+    expected = [as_tuple(stream.process(account, tx)) for account, tx in events[:1] + events[2:]]
+    with ShardedFraudDetectionSystem([], workers=2) as sharded:
+        batch = sharded.score(events)
+        assert list(batch.errors) == [1] and isinstance(batch.errors[1], ValueError)
+        with pytest.raises(ValueError):
+            batch[1]
+        assert [as_tuple(batch[i]) for i in (0, 2, 3)] == expected
+
+        # Uma nova tentativa parte do estado sem a linha inválida
+        later = Transaction(1, base + timedelta(minutes=6), "Chile")
+        retry = sharded.score([("a", later)])
+        assert as_tuple(retry[0]) == as_tuple(stream.process("a", later))
+
+
+def test_CT03_colunas_e_hash_estavel():
+    events = build_events(300)
+    stream = FraudDetectionStream(["Irã"])
+    expected = [as_tuple(stream.process(account, tx)) for account, tx in events]
+    with ShardedFraudDetectionSystem(["Irã"], workers=4, chunk_size=50) as sharded:
+        batch = sharded.score_columns(
+            [account for account, _ in events],
+            [tx.amount for _, tx in events],
+            [tx.epoch_us for _, tx in events],
+            [tx.location for _, tx in events],
+        )
+        # O shard não depende da largura do array em que a conta aparece
+        accounts = np.array(["a", "conta-longa", "conta-muito-mais-longa"])
+        assert sharded.shard_of("a") == account_hashes(accounts)[0] % 4
+        assert account_hashes(accounts[:1])[0] == account_hashes(accounts)[0]
+        assert account_hashes(np.array([7, 8]))[0] == account_hashes(np.array([7], dtype=object))[0]
+    assert [as_tuple(batch[i]) for i in range(len(batch))] == expected
+
+
+def test_CT04_trabalhador_encerrado_nao_trava_a_coleta():
+    with ShardedFraudDetectionSystem([], workers=2, poll_interval=0.05) as sharded:
+        for process in sharded._processes:
+            process.terminate()
+            process.join()
+        with pytest.raises(RuntimeError):
+            sharded.score(build_events(10))
@@ -0,0 +1,62 @@
+from datetime import datetime
+from src.fraud.BloomFilter import BloomFilter
+from src.fraud.FraudDetectionSystem import FraudDetectionSystem
+from src.fraud.FraudRule import DenyListRule
+from src.fraud.RuleEngine import RuleEngine
+from src.fraud.SortedKeyFile import SortedKeyFile
+from src.fraud.TieredDenyList import TieredDenyList
+from src.fraud.Transaction import Transaction
+
+NOW = datetime(2025, 10, 1, 12, 0, 0)
+
+
+def test_CT01_filtro_sem_falsos_negativos_e_taxa_proxima_da_configurada():
+    bloom = BloomFilter(2000, false_positive_rate=0.01)
+    bloom.update(f"merchant-{i}" for i in range(2000))
+    assert all(f"merchant-{i}" in bloom for i in range(2000))
+    false_positives = sum(f"outro-{i}" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.03
+    assert 0.005 < bloom.expected_false_positive_rate() < 0.02
+
+
+def test_CT02_filtro_salvo_e_carregado_via_mmap(tmp_path):
+    bloom = BloomFilter(100, 0.01)
+    bloom.update(["a", "b"])
+    bloom.save(tmp_path / "deny.bloom")
+    loaded = BloomFilter.load(tmp_path / "deny.bloom")
+    assert "a" in loaded and "b" in loaded
+    assert loaded.hash_count == bloom.hash_count
+    loaded.close()
+
+
+def test_CT03_arquivo_ordenado_com_busca_binaria(tmp_path):
+    path = tmp_path / "exact.txt"
+    keys = [f"device-{i}" for i in range(500)]
+    SortedKeyFile.write(path, keys)
+    store = SortedKeyFile(path)
+    assert all(key in store for key in keys)
+    assert "device-500" not in store and "" not in store
+    store.close()
+
+
+def test_CT04_lista_em_dois_niveis_no_sistema(tmp_path):
+    deny = TieredDenyList.build(
+        [f"merchant-{i}" for i in range(1000)],
+        tmp_path / "merchants.bloom",
+        tmp_path / "merchants.txt",
+        false_positive_rate=0.01,
+    )
+    engine = RuleEngine()
+    engine.register(DenyListRule("merchant_id", deny))
+    fds = FraudDetectionSystem(engine)
+
+    blocked = fds.check_for_fraud(Transaction(10, NOW, "Brasil", merchant_id="merchant-7"), [], [])
+    assert blocked.is_blocked is True and blocked.risk_score == 100
+    allowed = fds.check_for_fraud(Transaction(10, NOW, "Brasil", merchant_id="loja-1"), [], [])
+    assert allowed.is_blocked is False
+    assert fds.check_for_fraud(Transaction(10, NOW, "Brasil"), [], []).risk_score == 0
+
+    stats = deny.stats()
+    assert stats["lookups"] == 2
+    assert stats["configured_false_positive_rate"] == 0.01
+    deny.close()
@@ -0,0 +1,49 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from src.common.Epoch import to_epoch_us
+from src.fraud.FraudDetectionSystem import FraudDetectionSystem
+from src.fraud.LocationTable import LOCATIONS
+from src.fraud.Transaction import Transaction
+from src.fraud.TransactionCodec import parse_transaction
+
+NOW = datetime(2025, 10, 1, 12, 0, 0)
+
+
+def test_CT01_epoch_normaliza_fuso_horario():
+    naive = Transaction(1, NOW, "Brasil")
+    aware = Transaction(1, NOW.replace(tzinfo=timezone(timedelta(hours=-3))) + timedelta(hours=-3), "Brasil")
+    assert naive.epoch_us == to_epoch_us(NOW)
+    assert aware.epoch_us == naive.epoch_us
+
+
+def test_CT02_construcao_a_partir_de_epoch():
+    epoch_us = to_epoch_us(NOW)
+    transaction = Transaction.from_epoch(100.0, epoch_us, "Brasil")
+    assert transaction.epoch_us == epoch_us
+    assert transaction.timestamp == NOW
+    transaction.timestamp = NOW + timedelta(seconds=1)
+    assert transaction.epoch_us == epoch_us + 1_000_000
+
+
+def test_CT03_historico_misto_de_fusos_e_epochs():
+    fds = FraudDetectionSystem()
+    utc = NOW.replace(tzinfo=timezone.utc)
+    previous = [Transaction.from_epoch(10, to_epoch_us(NOW) - i * 60_000_000, "Brasil") for i in range(11)]
+    previous.reverse()
+    current = Transaction(10, utc.astimezone(timezone(timedelta(hours=2))), "Chile")
+    result = fds.check_for_fraud(current, previous, [])
+    assert result.is_blocked is True
+    # A última transação é do mesmo instante, em outra localização
+    assert result.is_fraudulent is True
+    assert result.risk_score == 50
+
+
+def test_CT04_localizacao_numerica_nao_e_id_interno():
+    LOCATIONS.intern("Brasil")
+    _, transaction = parse_transaction({"account_id": "a", "amount": 1, "epoch_us": 1, "location": 0})
+    assert transaction.location == "0"
+    with pytest.raises(TypeError):
+        Transaction.from_epoch(1.0, 1, 0)
+    with pytest.raises(ValueError):
+        Transaction.from_epoch_id(1.0, 1, len(LOCATIONS) + 10)
+    assert Transaction.from_epoch_id(1.0, 1, LOCATIONS.lookup("Brasil")).location == "Brasil"
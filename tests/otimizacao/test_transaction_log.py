@@ -0,0 +1,66 @@
+import pytest
+from datetime import datetime, timedelta
+from src.fraud.FraudDetectionSystem import FraudDetectionSystem
+from src.fraud.LocationTable import LOCATIONS
+from src.fraud.Transaction import Transaction
+from src.fraud.TransactionLog import TransactionLog
+
+
+def make_transactions(count, start, interval_minutes, location="Brasil"):
+    return [
+        Transaction(100 + i, start + timedelta(minutes=i * interval_minutes), location)
+        for i in range(count)
+    ]
+
+
+def test_CT01_iteracao_preserva_valores():
+    start = datetime(2025, 10, 1, 12, 0, 0)
+    transactions = make_transactions(3, start, 10)
+    log = TransactionLog(transactions)
+    records = list(log)
+    assert len(log) == 3
+    assert [r.amount for r in records] == [100, 101, 102]
+    assert [r.timestamp for r in records] == [t.timestamp for t in transactions]
+    assert log[-1].location == "Brasil"
+
+
+def test_CT02_fatia_por_intervalo_de_tempo():
+    start = datetime(2025, 10, 1, 12, 0, 0)
+    log = TransactionLog(make_transactions(10, start, 10))
+    view = log.between(start + timedelta(minutes=20), start + timedelta(minutes=50))
+    assert [r.amount for r in view] == [102, 103, 104]
+    assert view[0].amount == 102
+    with pytest.raises(ValueError):
+        view.append(Transaction(1, start + timedelta(days=1), "Brasil"))
+
+
+def test_CT03_append_fora_de_ordem_e_rejeitado():
+    start = datetime(2025, 10, 1, 12, 0, 0)
+    log = TransactionLog(make_transactions(2, start, 10))
+    with pytest.raises(ValueError):
+        log.append(Transaction(1, start, "Brasil"))
+
+
+@pytest.mark.parametrize("count, interval_minutes", [(10, 5), (11, 6), (11, 5), (50, 2)])
+def test_CT04_sistema_aceita_log_diretamente(count, interval_minutes):
+    fds = FraudDetectionSystem()
+    now = datetime(2025, 10, 1, 12, 0, 0)
+    previous = make_transactions(count, now - timedelta(minutes=count * interval_minutes), interval_minutes)
+    current = Transaction(100, now, "Chile")
+    expected = fds.check_for_fraud(current, previous, [])
+    result = fds.check_for_fraud(current, TransactionLog(previous), [])
+    assert result.is_blocked == expected.is_blocked
+    assert result.is_fraudulent == expected.is_fraudulent
+    assert result.risk_score == expected.risk_score
+
+
+def test_CT05_append_values_rejeita_ids_desconhecidos():
+    start = Transaction(1, datetime(2025, 10, 1, 12, 0, 0), "Brasil")
+    log = TransactionLog()
+    log.append_values(1.0, start.epoch_us, start.location_id)
+    for location, error in ((len(LOCATIONS), ValueError), (-1, ValueError), (True, TypeError), (1.5, TypeError)):
+        with pytest.raises(error):
+            log.append_values(2.0, start.epoch_us, location)
+    log.append_values(3.0, start.epoch_us, "Chile")
+    assert [record.location for record in log] == ["Brasil", "Chile"]
+    assert [record.amount for record in log] == [1.0, 3.0]
@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from src.fraud.FraudDetectionStream import FraudDetectionStream
+from src.fraud.TransactionCodec import parse_transaction
+from src.fraud.TransactionReplay import TransactionReplay, read_rows, row_writer
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=["id", "account_id", "amount", "timestamp", "location"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_CT01_replay_em_memoria():
+    lines = io.StringIO(
+        '{"account_id": "a", "amount": 20000, "timestamp": "2025-10-01T12:00:00", "location": "Brasil"}\n'
+        '{"account_id": "a", "amount": 10, "timestamp": "2025-10-01T12:05:00", "location": "Chile"}\n'
+        '{"account_id": "a", "amount": 10}\n'
+        '{"account_id": "a", "amount": \n'
+        '["não é um objeto"]\n'
+        '{"account_id": "a", "amount": 10, "timestamp": "2025-10-01T12:06:00", "location": "Chile"}\n'
+    )
+    output = io.StringIO()
+    replay = TransactionReplay(["Irã"])
+    stats = replay.run(read_rows(lines, "jsonl"), row_writer(output, "jsonl"))
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert results[0]["risk_score"] == 50
+    assert results[1]["risk_score"] == 20
+    assert "error" in results[2]
+    # JSON corrompido e linhas que não são objetos não interrompem o replay
+    assert "error" in results[3] and "error" in results[4]
+    assert results[5]["risk_score"] == 0
+    assert stats["processed"] == 6 and stats["errors"] == 3
+    assert stats["latency"]["count"] == 6
+
+
+def test_CT02_linha_de_comando_csv(tmp_path):
+    source = tmp_path / "tx.csv"
+    write_csv(source, [
+        {"id": i, "account_id": "a", "amount": 100, "timestamp": f"2025-10-01T12:{i:02d}:00", "location": "Brasil"}
+        for i in range(12)
+    ])
+    target = tmp_path / "out.csv"
+    completed = subprocess.run(
+        [sys.executable, "replay.py", str(source), "-o", str(target), "--memory-budget", "4096"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    assert "tx/s" in completed.stderr
+    with open(target, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == 12
+    assert rows[-1]["is_blocked"] == "True"
+
+
+def test_CT03_contas_inativas_saem_da_memoria_sem_mudar_resultados():
+    start = datetime(2025, 10, 1, 8, 0, 0)
+    # Cada conta só aparece durante uma hora; o arquivo atravessa dez horas
+    rows = [
+        {"account_id": f"conta-{i // 40}-{i % 4}", "amount": 100 if i % 7 else 20000,
+         "timestamp": (start + timedelta(minutes=i // 4)).isoformat(),
+         "location": ["Brasil", "Chile"][i % 3 == 0]}
+        for i in range(2400)
+    ]
+    rows.append({"account_id": "atrasada", "amount": 10, "timestamp": start.isoformat(), "location": "Brasil"})
+    output = io.StringIO()
+    replay = TransactionReplay(["Irã"], memory_budget=20_000)
+    stats = replay.run(rows, row_writer(output, "jsonl"))
+    replay.close()
+
+    stream = FraudDetectionStream(["Irã"])
+    expected = [stream.process(*parse_transaction(row)).risk_score for row in rows[:-1]]
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [result["risk_score"] for result in results[:-1]] == expected
+    # Transação anterior à marca d'água não é avaliada contra estado já descartado
+    assert "error" in results[-1] and stats["errors"] == 1
+    assert stats["state"]["pruned"] > 0
+    assert stats["state"]["resident"] + stats["state"]["spilled"] < len(stream)